@@ -1,19 +1,40 @@
 """
 README:
-Run this file to start the game.
+Run this file to start the game. With the option --profile FILE, the game is
+instrumented and the counters are written to FILE when the window is closed:
+as JSON when FILE ends with .json, otherwise in the format of cProfile.
 
 ADDITIONAL PACKAGES:
-config:     A module made to create a GUI that allows the user to choose
-            game options
+argparse:   A python library used to read the command line options.
+session:    A module made to create the window in which the start screen and
+            the game are shown
+profiling:  A module made to count and time the calls of the game.
 """
 
-from src.config import StartScreen
+import argparse
 
+from src import profiling
+from src.session import Session
 
-def main():
-    app = StartScreen()
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Play Mine Sweeper.')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='write call counters and click latencies to FILE')
+    options = parser.parse_args(args)
+
+    if options.profile:
+        profiling.enable()
+
+    app = Session()
     app.mainloop()
 
+    if options.profile:
+        if options.profile.endswith('.json'):
+            profiling.dump_json(options.profile)
+        else:
+            profiling.dump_stats(options.profile)
+
 
 if __name__ == '__main__':
     main()
@@ -8,26 +8,32 @@ tkinter:    A python library used to create the GUI
 winsound:   A build in module on Windows that can be used to play sounds.
             (Imported in win OR loss function of the App class, only
             when OS is Windows, not for MacOS.)
-config:     A module made to create a GUI that allows the user to choose
-            game options
 engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine for large boards
+canvas:     A module made to draw the minesweeper board on one canvas
 """
 
 import tkinter as tk
 import src.engine as engine
-import src.config as cfg
+from src.canvas import BoardCanvas
+from src.packed import PackedMineSweeper
+
+# boards with more tiles than this are played on the PackedMineSweeper engine
+LARGE_BOARD = 10000
 
 
 ###########################################
 ################### App ###################
 ###########################################
-class App(tk.Tk):
+class App(tk.Frame):
     """
     DESCRIPTION:
-    The App creates a GUI
+    The App creates a GUI. It is a frame that is shown in the window of the
+    Session, which swaps it with the start screen.
 
     PARAMETERS:
     The parameters that are needed in the __init__ are:
+        master:         The Session that shows the App.
         rows:           The number of rows of the minesweeper board. Is
                         decided by the user in the config GUI.
         cols:           The number of columns of the minesweeper board. Is
@@ -40,9 +46,14 @@ class App(tk.Tk):
                         mines are placed.
         right_click:    Default is 3 (Windows). If the user selects that he/she
                         has an apple OS, the value is set to 2.
+        pool:           Optional BoardPool of the Session, from which the
+                        boards take pre-generated layouts, or the
+                        NoGuessGenerator of the Session.
 
     METHODS:
     __init__(self):     Initialises the class.
+    new_game(self, mines, safe_radius): Creates a new minesweeper board.
+    reset(self, mines, safe_radius): Starts a new game on the existing grid.
     update_clock(self): Makes sure that the clock at the top of the GUI keeps
                         working until the user wins, loses or ends the game.
     win(self):          Calls function show_popup with a winning message.
@@ -51,29 +62,30 @@ class App(tk.Tk):
                         message: "you won" or "you lost", and two buttons:
                         "restart" (calling the function restart) and "quit"
                         (calling the function quit).
-    restart(self, popup): Destroys the config screen and starts a new game.
-    quit (self, popup): Destroys the config screen.
-    create_button_grid(self, rows, cols): Creates a grid of buttons based on
-                        the number of rows and columns that are selected in
-                        the config GUI.
+    restart(self, popup): Shows the config screen so a new game can start.
+    quit (self, popup): Closes the window.
+    create_button_grid(self, rows, cols): Creates the canvas on which the
+                        tiles are drawn, based on the number of rows and
+                        columns that are selected in the config GUI.
     on_left_click(self, row, col): Reveals the tile on the board with the same
-                        coordinates (row/column) as the button and calls the
-                        function update_button_grid.
+                        coordinates (row/column) as the click.
     on_right_click(self, row, col): Flags the tile on the board with the same
-                        coordinates (row/column) as the button.
-    update_button_grid(self): Iterates over the board and changes text on the
-                        buttons to match the state of the minesweeper board.
-                        This is done after every mouse click.
+                        coordinates (row/column) as the click.
+    on_middle_click(self, row, col): Chords the tile on the board with the
+                        same coordinates (row/column) as the click.
+    update_button_grid(self, changes): Redraws the tiles that were changed by
+                        a move to match the state of the minesweeper board.
+                        The engine calls this after every move that changed
+                        tiles.
 
     LIMITATIONS:
-    1.  The GUI is slow. This can in part be attributed to Python (it being a
-        slow language compared to compiled languages). Another reason can be
-        that there are multiple nested for loops in multiple methods which are
-        called within each other adding complexity.
+    1.  The GUI is drawn by Python, which is slow compared to compiled
+        languages. Only the tiles changed by a move are redrawn, on a single
+        canvas, to keep the GUI responsive on large boards.
 
-    2.  Buttons can change size during the game. This happens when the text
-        within a button is changed. The buttons are always changed to the size
-        of the largest text within a column.
+    2.  Boards that do not fit in the window have to be scrolled (mouse wheel,
+        Shift + mouse wheel or the scrollbars) and can be zoomed (Control +
+        mouse wheel).
 
     3.  The sound effects are only working on Windows computers.
 
@@ -85,41 +97,38 @@ class App(tk.Tk):
     GUI on which the minesweeper game can be played.
     """
 
-    def __init__(self, rows, cols, mines, safe_radius, right_click=3):
+    def __init__(self, master, rows, cols, mines, safe_radius, right_click=3,
+                 pool=None):
         """
         This method initialises the attributes of the class:
-        self.title:     Gives the GUI a title.
-        self.resizable: To make sure that the user cannot change the size of
-                        the GUI.
-        self.board:     Minesweeper object.
+        self.board:     Minesweeper object, a PackedMineSweeper for boards of
+                        more than LARGE_BOARD tiles.
         self.rows:      Number of rows.
         self.cols:      Number of columns.
-        self.buttons:   List of lists with Nones. Has self.rows number of rows
-                        and self.columns number of columns.
+        self.canvas:    The BoardCanvas on which the tiles are drawn.
         self.OS:        Operating system (Windows or Apple). Value is equal to
                         the right_click variable and determined in the
                         Config GUI.
         self.timer:     A label that shows how long the user has been playing
                         the game.
         self.now:       Variable that ensures the timer restarts every new game.
+        self.clock:     The ID of the scheduled update of the timer.
         self.ticking:   Boolean variable, default = True. This variable is
                         changed when a game is won, lost or quit. This variable
                         was added to make sure the timer stops when a game is
                         finished.
         """
 
-        tk.Tk.__init__(self)
-        self.title('Minesweeper')
-        self.resizable(False, False)
-        self.board = engine.MineSweeper(rows, cols, mines, safe_radius)
+        tk.Frame.__init__(self, master)
         self.rows = rows
         self.cols = cols
-        self.buttons = [[None for _ in range(cols)] for _ in range(rows)]
         self.OS = right_click
+        self.pool = pool
+        self.new_game(mines, safe_radius)
 
         # label for timer
         self.timer = tk.Label(self, text=" ", font=('Arial', 40))
-        self.timer.grid(row=0, column=2, columnspan=self.cols)
+        self.timer.grid(row=0, column=2)
         self.now = 0
         self.ticking = True
         self.update_clock()
@@ -137,9 +146,62 @@ class App(tk.Tk):
         self.n_flags_lbl.grid(row=0, column=1)
 
         self.create_button_grid(rows, cols)
+
+    def new_game(self, mines, safe_radius):
+        """
+        DESCRIPTION:
+        Creates a new minesweeper board with the size of the App and connects
+        the event handlers of the App to it.
+
+        PARAMETERS:
+        mines:          The number of mines of the minesweeper board.
+        safe_radius:    The square radius around the first click where no
+                        mines are placed.
+
+        STRUCTURES:
+        If-statement:   Used to choose the engine based on the board size.
+
+        OUTPUT:
+        None. The board is stored in self.board.
+        """
+
+        if self.rows * self.cols > LARGE_BOARD:
+            self.board = PackedMineSweeper(self.rows, self.cols, mines,
+                                           safe_radius, pool=self.pool)
+        else:
+            self.board = engine.MineSweeper(self.rows, self.cols, mines,
+                                            safe_radius, pool=self.pool)
+
+        self.board.on_change += [self.update_button_grid]
         self.board.on_win += [self.win]
         self.board.on_loss += [self.loss]
 
+    def reset(self, mines, safe_radius):
+        """
+        DESCRIPTION:
+        Starts a new game with the same board size, reusing the widgets of the
+        App: only a new minesweeper board is created, and the canvas, the flag
+        counter and the timer are reset.
+
+        PARAMETERS:
+        mines:          The number of mines of the new game.
+        safe_radius:    The square radius around the first click where no
+                        mines are placed.
+
+        OUTPUT:
+        The App shows a new game.
+        """
+
+        self.new_game(mines, safe_radius)
+        self.canvas.set_board(self.board)
+        self.update_n_flags()
+
+        # restarts the timer
+        self.after_cancel(self.clock)
+        self.now = 0
+        self.ticking = True
+        self.update_clock()
+
     def update_n_flags(self):
         """
         DESCRIPTION:
@@ -150,20 +212,14 @@ class App(tk.Tk):
         No additional parameters aside from the App attributes itself.
 
         STRUCTURES:
-        A for-loop that iterates over all the tiles on the minesweeper board to
-        count the number of tiles that are flagged. An if-statement that
-        reduces the count (= number of mines on board) when a tile is flagged.
+        No structures are used: the engine keeps count of the placed flags.
 
         OUTPUT:
         A label that shows the number of flags that still need to be placed by
         the user to win the game.
         """
 
-        count = self.board.n_mines
-        for tile in self.board:
-            if tile.flagged:
-                count -= 1
-        self.n_flags_lbl['text'] = count
+        self.n_flags_lbl['text'] = self.board.flags_left
 
     def update_clock(self):
         """
@@ -185,13 +241,14 @@ class App(tk.Tk):
             self.now += 1
             now = '%02d : %02d' % (self.now // 60, self.now % 60)
             self.timer.configure(text=now)
-            self.timer.after(1000, self.update_clock)
+            self.clock = self.timer.after(1000, self.update_clock)
 
     def win(self):
         """
         DESCRIPTION:
         Function that sets ticking to False and calls the show_popup function
-        with the message: "You won!"
+        with the message: "You won!", the 3BV of the board and the 3BV per
+        second.
 
         PARAMETERS:
         No additional parameters aside from the App attributes itself.
@@ -203,7 +260,8 @@ class App(tk.Tk):
         """
 
         self.ticking = False
-        self.show_popup("You won!")
+        self.show_popup("You won!\n3BV: %d, %.2f 3BV/s"
+                        % (self.board.bbbv, self.board.efficiency(self.now)))
         if self.OS == 3:
             import winsound
             winsound.PlaySound('assets\\winning.wav',
@@ -271,26 +329,24 @@ class App(tk.Tk):
     def restart(self, popup):
         """
         DESCRIPTION:
-        A function that destroys the current config screen and restarts the
-        game.
+        A function that closes the pop-up and lets the Session show the config
+        screen, from which a new game is started in the same window.
 
         PARAMETERS:
         popup:  the pop-up that is shown to the user. It is needed by the \
                 function so it is able to destroy it.
 
         OUTPUT:
-        A new minesweeper game.
+        The config screen of a new minesweeper game.
         """
 
         popup.destroy()
-        self.destroy()
-        app = cfg.StartScreen()
-        app.mainloop()
+        self.master.show_start_screen()
 
     def quit(self, popup):
         """
         DESCRIPTION:
-        A function that destroys the current config screen.
+        A function that closes the window of the Session.
 
         PARAMETERS:
         popup:  the pop-up that is shown to the user. It is needed by the
@@ -301,110 +357,112 @@ class App(tk.Tk):
         """
 
         popup.destroy()
-        self.destroy()
+        self.master.destroy()
 
     def create_button_grid(self, rows, cols):
         """
         DESCRIPTION:
-        A function that creates the grid of buttons based on the number of
-        rows and columns that are selected in the config GUI.
+        A function that creates the canvas on which the tiles are drawn, based
+        on the number of rows and columns that are selected in the config GUI.
+        Clicks on the canvas are passed to on_left_click, on_right_click and
+        on_middle_click with the coordinates of the clicked tile. Scrollbars
+        are added for boards that do not fit in the window, and the canvas
+        grows when the window is resized.
 
         PARAMETERS:
-        rows:       the number of rows for which buttons should be created.
-        cols:       the number of columns for which buttons should be created.
-
-        STRUCTURES:
-        An embedded for-loop is used to go through all row/column coordinates
-        that have to be on the button grid. On every row/column coordinate a
-        button is created.
+        rows:       the number of rows of the board.
+        cols:       the number of columns of the board.
 
         OUTPUT:
-        A grid of buttons with rows number of rows and cols number of columns.
+        A canvas with rows number of rows and cols number of columns of tiles.
         """
 
-        for r in range(rows):
-            for c in range(cols):
-                button = tk.Button(self,
-                                   text=self.board.board[r][c].__repr__(),
-                                   width=4, height=2)
-                button.bind('<Button-1>',
-                            lambda event, row=r,
-                                   col=c: self.on_left_click(row, col))
-                button.bind('<Button-%d>' % self.OS,
-                            lambda event, row=r,
-                                   col=c: self.on_right_click(row, col))
-                button.grid(row=r + 1, column=c, padx=1, pady=1, sticky=tk.NSEW)
-                self.buttons[r][c] = button
+        self.canvas = BoardCanvas(self, self.board,
+                                  self.on_left_click,
+                                  self.on_right_click,
+                                  self.OS,
+                                  self.on_middle_click)
+        self.canvas.grid(row=1, column=0, columnspan=3, sticky=tk.NSEW)
+
+        x_scroll = tk.Scrollbar(self, orient=tk.HORIZONTAL,
+                                command=self.canvas.xview)
+        x_scroll.grid(row=2, column=0, columnspan=3, sticky=tk.EW)
+        y_scroll = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                command=self.canvas.yview)
+        y_scroll.grid(row=1, column=3, sticky=tk.NS)
+        self.canvas.configure(xscrollcommand=x_scroll.set,
+                              yscrollcommand=y_scroll.set)
+
+        self.grid_rowconfigure(1, weight=1)
+        self.grid_columnconfigure(2, weight=1)
 
     def on_left_click(self, row, col):
         """
         DESCRIPTION:
-        A function that is called when the user uses a left mouse click on the
-        button. It reveals the tile and calls the function update_button_grid.
+        A function that is called when the user uses a left mouse click on a
+        tile. It reveals the tile, the engine then calls the function
+        update_button_grid with the revealed tiles.
 
         PARAMETERS:
-        row(int):   The row coordinate of the button.
-        col(int):   The column coordinate of the button.
+        row(int):   The row coordinate of the tile.
+        col(int):   The column coordinate of the tile.
 
         OUTPUT:
-        An updated app with at least one extra revealed button.
+        An updated app with at least one extra revealed tile.
         """
 
         self.board.reveal(row, col)
-        self.update_button_grid()
 
     def on_right_click(self, row, col):
         """
         DESCRIPTION:
-        A function that is called when the user uses a right mouse click on the
-        button. It flags the tile, calls the function update_button_grid and
-        update_n_flags.
+        A function that is called when the user uses a right mouse click on a
+        tile. It flags the tile and calls the function update_n_flags, the
+        engine calls the function update_button_grid with the flagged tile.
 
         PARAMETERS:
-        row(int):   The row coordinate of the button
-        col(int):   The column coordinate of the button
+        row(int):   The row coordinate of the tile
+        col(int):   The column coordinate of the tile
 
         OUTPUT:
-        An updated App GUI with that shows a flag on the button that was
+        An updated App GUI with that shows a flag on the tile that was
         right-clicked and an updated label that shows how many flags the user
         still needs to place to win the game.
         """
 
         self.board.flag(row, col)
-        self.update_button_grid()
         self.update_n_flags()
 
-    def update_button_grid(self):
+    def on_middle_click(self, row, col):
         """
         DESCRIPTION:
-        Updates the button grid after the player performs an action. If it is
-        an empty tile, the button is removed, and if it is a numbered tile,
-        the button is transformed into a label, so that the player can't
-        interact with an already revealed tile.
+        A function that is called when the user uses a middle mouse click or a
+        left double click on a tile. When the tile is a revealed number with
+        as many flags around it as its number, all other tiles around it are
+        revealed in one move, so the engine calls update_button_grid and
+        checks for game over only once.
 
         PARAMETERS:
-        No additional parameters aside from the App attributes itself.
+        row(int):   The row coordinate of the tile.
+        col(int):   The column coordinate of the tile.
 
-        STRUCTURES:
-        2 for loops:        To go through each tile in the playing field.
-        2 if statements:    To check whether the tile is empty or numbered
-                            (a safe tile that shouldn't be interacted with
-                            anymore).
+        OUTPUT:
+        An updated app with the tiles around the number revealed.
+        """
+
+        self.board.chord(row, col)
+
+    def update_button_grid(self, changes):
+        """
+        DESCRIPTION:
+        Redraws the tiles that were changed by a move on the canvas.
+
+        PARAMETERS:
+        changes (list): The tiles that were changed by the move, as given by
+                        the engine.
 
         OUTPUT:
         None.
         """
 
-        for r in range(self.rows):
-            for c in range(self.cols):
-                self.buttons[r][c].config(
-                    text=self.board.board[r][c].__repr__())
-                if self.board.board[r][c].__repr__() == '$':
-                    self.buttons[r][c].grid_remove()
-                if self.board.board[r][c].__repr__().isdigit():
-                    label = tk.Label(self,
-                                     text=self.board.board[r][c].__repr__(),
-                                     width=4, height=2, borderwidth=1)
-                    label.grid(row=r + 1, column=c, padx=5, pady=5)
-                    self.buttons[r][c].grid_remove()
-                    self.buttons[r][c] = label
+        self.canvas.update_tiles(changes)
@@ -0,0 +1,339 @@
+"""
+README:
+This script benchmarks the operations of the Mine Sweeper engines on boards
+from 10 x 10 up to 2000 x 2000 tiles, at the mine densities of the Easy,
+Normal and Hard buttons of the StartScreen. The results are written to a JSON
+file, and two result files can be compared to find regressions.
+
+Run it from the Minesweeper folder, for example:
+    python -m src.benchmark run --out new.json
+    python -m src.benchmark compare old.json new.json --threshold 0.1
+
+ADDITIONAL PACKAGES:
+argparse:       A python library used to read the command line options.
+gc:             A python library, the garbage collector is switched off
+                during the timed runs, like timeit does.
+json:           A python library used to write and read the results.
+platform:       A python library used to describe the machine in the results.
+random:         A python library used to choose the tiles that are flagged.
+sys:            A python library used to set the exit code of a comparison.
+time:           A python library used to time the operations.
+tracemalloc:    A python library used to measure the peak memory.
+engine:         A module made to run the minesweeper game
+packed:         A module with the memory efficient engine
+"""
+
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from src.engine import MineSweeper
+from src.packed import PackedMineSweeper
+
+ENGINES = {'tile': MineSweeper, 'packed': PackedMineSweeper}
+
+# mines per tile and safe radius of the StartScreen difficulties
+DENSITIES = {'easy': (6, 2), 'normal': (4, 2), 'hard': (2, 1)}
+
+SIZES = (10, 100, 1000, 2000)
+
+OPERATIONS = ('create_board', 'lay_mines', 'assign_numbers', 'reveal',
+              'reveal_opening', 'flag', 'game_over', 'iteration', '__str__')
+
+# amount of calls of the operations that are too fast to time once
+N_CALLS = 1000
+
+SEED = 0
+
+# the smallest time and peak memory that compare takes as a baseline: below
+# them, the differences between two runs are mostly noise
+MIN_SECONDS = 1e-3
+MIN_BYTES = 4096
+
+
+###########################################
+############### Operations ################
+###########################################
+# runs all operations on one board and yields their durations
+def run_operations(engine_class, size, density):
+    """
+    DESCRIPTION:
+    Runs the operations of OPERATIONS in order on one board, so that every
+    operation starts from the board the previous one left behind. flag and
+    game_over are called N_CALLS times and their time is divided by N_CALLS.
+    reveal_opening reveals the center of a board without mines, whose mines
+    and numbers are prepared before the operation is handed out.
+
+    PARAMETERS:
+    engine_class:   MineSweeper or PackedMineSweeper.
+    size (int):     The amount of rows and columns of the board.
+    density (str):  A key of DENSITIES.
+
+    STRUCTURES:
+    Generator:      Used to hand each operation to the caller, which times
+                    it or measures its memory.
+
+    OUTPUTS:
+    Yields (name, function) pairs; calling the function runs the operation.
+    """
+
+    per_mine, safe_radius = DENSITIES[density]
+    mines = size * size // per_mine
+    center = size // 2
+    rng = random.Random(SEED)
+    game = None
+
+    def create_board():
+        nonlocal game
+        game = engine_class(size, size, mines, safe_radius, seed=SEED)
+
+    def reveal():
+        game.pristine = False
+        game.reveal(center, center)
+
+    def reveal_opening():
+        empty.reveal(center, center)
+
+    def flag():
+        for _ in range(N_CALLS):
+            game.flag(rng.randrange(size), rng.randrange(size))
+
+    def game_over():
+        for _ in range(N_CALLS):
+            game.game_over()
+
+    def iteration():
+        for _ in game:
+            pass
+
+    yield 'create_board', create_board
+    yield 'lay_mines', lambda: game.lay_mines(center, center)
+    yield 'assign_numbers', lambda: game.assign_numbers()
+    yield 'reveal', reveal
+
+    # the board without mines is made before the operation, so only the
+    # opening is timed
+    empty = engine_class(size, size, 0, safe_radius, seed=SEED)
+    empty.prepare_board(center, center)
+    yield 'reveal_opening', reveal_opening
+    yield 'flag', flag
+    yield 'game_over', game_over
+    yield 'iteration', iteration
+    yield '__str__', lambda: str(game)
+
+
+# benchmarks one board
+def benchmark_case(engine_name, size, density, repeat):
+    """
+    DESCRIPTION:
+    Times the operations of one board, repeat times, and measures their peak
+    memory in one more run with tracemalloc, which would slow down the timed
+    runs. The garbage collector is switched off during the timed runs, so
+    that a collection does not land in a random operation.
+
+    PARAMETERS:
+    engine_name (str):  A key of ENGINES.
+    size (int):         The amount of rows and columns of the board.
+    density (str):      A key of DENSITIES.
+    repeat (int):       The amount of timed runs; the fastest is kept.
+
+    STRUCTURES:
+    For-loop:   Used to repeat the timed runs.
+    For-loop:   Used to measure the peak memory of each operation.
+
+    OUTPUTS:
+    A list with a result dictionary per operation.
+    """
+
+    engine_class = ENGINES[engine_name]
+    seconds = {}
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for name, operation in run_operations(engine_class, size, density):
+                start = time.perf_counter()
+                operation()
+                duration = time.perf_counter() - start
+                if name in ('flag', 'game_over'):
+                    duration /= N_CALLS
+                seconds[name] = min(seconds.get(name, duration), duration)
+            gc.collect()
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    peaks = {}
+    tracemalloc.start()
+    for name, operation in run_operations(engine_class, size, density):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        operation()
+        peaks[name] = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return [{'engine': engine_name, 'size': size, 'density': density,
+             'operation': name, 'seconds': seconds[name],
+             'peak_bytes': peaks[name]}
+            for name in OPERATIONS]
+
+
+# benchmarks all combinations of engines, sizes and densities
+def run(engines, sizes, densities, repeat=5):
+    """
+    DESCRIPTION:
+    Benchmarks every combination of the given engines, sizes and densities.
+
+    PARAMETERS:
+    engines (list):     Keys of ENGINES.
+    sizes (list):       Amounts of rows and columns.
+    densities (list):   Keys of DENSITIES.
+    repeat (int):       The amount of timed runs per board.
+
+    STRUCTURES:
+    Embedded for-loop:  Used to go through all combinations.
+
+    OUTPUTS:
+    A dictionary with a description of the machine and the list of results.
+    """
+
+    results = []
+    for engine_name in engines:
+        for size in sizes:
+            for density in densities:
+                print('%s %dx%d %s' % (engine_name, size, size, density),
+                      file=sys.stderr)
+                results += benchmark_case(engine_name, size, density, repeat)
+
+    return {'python': platform.python_version(),
+            'machine': platform.platform(),
+            'seed': SEED,
+            'results': results}
+
+
+###########################################
+############### Comparison ################
+###########################################
+# compares two result files
+def compare(old, new, threshold=0.1, min_seconds=MIN_SECONDS,
+            min_bytes=MIN_BYTES):
+    """
+    DESCRIPTION:
+    Compares the results of two runs. An operation is a regression when its
+    time or peak memory in the new run is more than threshold (a fraction)
+    higher than in the old run. Old values below min_seconds or min_bytes
+    are raised to them first, so that the noise of operations that take
+    microseconds, or an old peak memory of 0 bytes, is not reported.
+
+    PARAMETERS:
+    old (dict):         The results of the old run, as made by run.
+    new (dict):         The results of the new run.
+    threshold (float):  The allowed increase; default: 0.1 (10 %).
+    min_seconds (float): The smallest time that is compared; default:
+                        MIN_SECONDS.
+    min_bytes (int):    The smallest peak memory that is compared; default:
+                        MIN_BYTES.
+
+    STRUCTURES:
+    For-loop:       Used to go through the results of the new run.
+    For-loop:       Used to compare the time and the peak memory.
+
+    OUTPUTS:
+    A list of (case, measure, old value, new value) tuples of the regressions.
+    Results that are in only one of the runs are skipped.
+    """
+
+    def key(result):
+        return (result['engine'], result['size'], result['density'],
+                result['operation'])
+
+    old_results = {key(result): result for result in old['results']}
+    floors = {'seconds': min_seconds, 'peak_bytes': min_bytes}
+    regressions = []
+
+    for result in new['results']:
+        if key(result) not in old_results:
+            continue
+
+        for measure, floor in floors.items():
+            before = old_results[key(result)][measure]
+            after = result[measure]
+            if after > max(before, floor) * (1 + threshold):
+                regressions += [(key(result), measure, before, after)]
+
+    return regressions
+
+
+def main(args=None):
+    """
+    DESCRIPTION:
+    The command line entry point, with a 'run' and a 'compare' command.
+
+    PARAMETERS:
+    args (list):    The command line arguments; default: sys.argv.
+
+    OUTPUTS:
+    The exit code: 1 when a comparison found regressions, otherwise 0.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Mine Sweeper engines.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('--out', required=True,
+                            help='JSON file to write the results to')
+    run_parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES),
+                            default=sorted(ENGINES))
+    run_parser.add_argument('--sizes', nargs='+', type=int, default=SIZES)
+    run_parser.add_argument('--densities', nargs='+',
+                            choices=list(DENSITIES), default=list(DENSITIES))
+    run_parser.add_argument('--repeat', type=int, default=5)
+
+    compare_parser = commands.add_parser('compare',
+                                         help='compare two result files')
+    compare_parser.add_argument('old')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    compare_parser.add_argument('--min-seconds', type=float,
+                                default=MIN_SECONDS,
+                                help='times below this are not compared')
+    compare_parser.add_argument('--min-bytes', type=int, default=MIN_BYTES,
+                                help='peak memory below this is not compared')
+
+    options = parser.parse_args(args)
+
+    if options.command == 'run':
+        report = run(options.engines, options.sizes, options.densities,
+                     options.repeat)
+        with open(options.out, 'w') as file:
+            json.dump(report, file, indent=2)
+        return 0
+
+    with open(options.old) as file:
+        old = json.load(file)
+    with open(options.new) as file:
+        new = json.load(file)
+
+    regressions = compare(old, new, options.threshold, options.min_seconds,
+                          options.min_bytes)
+    for (engine, size, density, operation), measure, before, after \
+            in regressions:
+        print('%s %dx%d %s %s: %s %.4g -> %.4g (+%.0f %%)'
+              % (engine, size, size, density, operation, measure, before,
+                 after, 100 * (after / before - 1) if before else 100))
+
+    if not regressions:
+        print('no regressions above %.0f %%' % (100 * options.threshold))
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,475 @@
+"""
+README:
+This script contains ONE class definition, BoardCanvas, which draws the
+minesweeper board on a single tkinter Canvas instead of one button per tile.
+Only the tiles in the visible part of the canvas are drawn, so that the board
+can be much larger than the window.
+
+ADDITIONAL PACKAGES:
+tkinter:    A python library used to create the GUI
+"""
+
+import tkinter as tk
+
+# colours of the tiles and of the numbers
+HIDDEN_COLOUR = '#c0c0c0'
+REVEALED_COLOUR = '#e8e8e8'
+MINE_COLOUR = '#ff4040'
+NUMBER_COLOURS = ['black', 'blue', 'green', 'red', 'navy', 'maroon',
+                  'teal', 'black', 'grey', 'black']
+
+# sizes of a tile in pixels
+MIN_SIZE = 8
+MAX_SIZE = 64
+DEFAULT_SIZE = 32
+
+# largest size of the canvas in pixels when it is created
+MAX_VIEW = 800
+
+# amount of tiles drawn outside of the visible part, so that short scrolls
+# show tiles that are drawn already
+MARGIN = 2
+
+
+###########################################
+############### BoardCanvas ###############
+###########################################
+class BoardCanvas(tk.Canvas):
+    """
+    DESCRIPTION:
+    The BoardCanvas draws the tiles of a minesweeper board as a rectangle and
+    a text item each, on one canvas. Only the tiles in the visible part of the
+    canvas (the viewport) and a small margin around it are drawn. When the
+    canvas is scrolled, zoomed or resized, the items of tiles that are no
+    longer visible are moved to the tiles that came into view, so the amount
+    of items depends on the size of the window and not on the size of the
+    board. A click is turned into row/column coordinates by dividing its
+    position by the size of a tile, so only one event binding per mouse
+    button is needed.
+
+    PARAMETERS:
+    master:         The tkinter widget that contains the canvas.
+    board:          The MineSweeper object that is drawn.
+    on_left_click:  Function that is called with (row, col) on a left click.
+    on_right_click: Function that is called with (row, col) on a right click.
+    right_click:    The number of the right mouse button, 3 for Windows and 2
+                    for MacOS. The middle mouse button is the other one.
+    on_middle_click: Optional function that is called with (row, col) on a
+                    middle click or a left double click.
+
+    METHODS:
+    __init__(self, ...):    Initialises the class.
+    set_scrollregion(self): Makes the whole board scrollable.
+    schedule_redraw(self):  Redraws the viewport when tkinter is idle.
+    redraw(self):           Draws the tiles in the viewport.
+    draw_tile(self, tile):  Sets the colour and text of the items of a tile.
+    update_tiles(self, tiles): Redraws the given tiles if they are drawn.
+    xview(self, *args):     Scrolls horizontally and redraws the viewport.
+    yview(self, *args):     Scrolls vertically and redraws the viewport.
+    scroll(self, event):    Scrolls with the mouse wheel.
+    zoom(self, event):      Zooms with the mouse wheel while Control is held.
+    set_size(self, size):   Changes the size of the tiles.
+    set_board(self, board): Draws another board of the same size.
+    tile_at(self, event):   Returns the row/column coordinates of a click.
+    left_button(self, event): Calls on_left_click for the clicked tile.
+    right_button(self, event): Calls on_right_click for the clicked tile.
+    middle_button(self, event): Calls on_middle_click for the clicked tile.
+
+    LIMITATIONS:
+    1.  Tiles that come into view while scrolling fast are drawn when tkinter
+        is idle, so they can appear a moment later.
+
+    OUTPUT:
+    A canvas on which the minesweeper board is drawn.
+    """
+
+    def __init__(self, master, board, on_left_click, on_right_click,
+                 right_click=3, on_middle_click=None):
+        """
+        This method initialises the attributes of the class:
+        self.board:     The MineSweeper object that is drawn.
+        self.size:      The width and height of a tile in pixels.
+        self.drawn:     Dictionary with the (rectangle, text) item IDs of each
+                        drawn tile, by index (row * n_cols + col).
+        self.free:      List of (rectangle, text) item IDs that are hidden and
+                        can be used for tiles that come into view.
+        self.pending:   True when a redraw has been scheduled.
+        """
+
+        self.board = board
+        self.size = DEFAULT_SIZE
+        self.on_left_click = on_left_click
+        self.on_right_click = on_right_click
+        self.on_middle_click = on_middle_click
+        self.drawn = {}
+        self.free = []
+        self.pending = False
+
+        tk.Canvas.__init__(self, master,
+                           width=min(board.n_cols * self.size, MAX_VIEW),
+                           height=min(board.n_rows * self.size, MAX_VIEW),
+                           highlightthickness=0)
+        self.set_scrollregion()
+
+        self.bind('<Configure>', lambda event: self.schedule_redraw())
+        self.bind('<Button-1>', self.left_button)
+        self.bind('<Button-%d>' % right_click, self.right_button)
+
+        # the middle button is 2 on Windows and 3 on MacOS
+        if on_middle_click is not None:
+            self.bind('<Button-%d>' % (5 - right_click), self.middle_button)
+            self.bind('<Double-Button-1>', self.middle_button)
+
+        # mouse wheel on Windows/MacOS and on Linux
+        self.bind('<MouseWheel>', self.scroll)
+        self.bind('<Shift-MouseWheel>', self.scroll)
+        self.bind('<Control-MouseWheel>', self.zoom)
+        for button in (4, 5):
+            self.bind('<Button-%d>' % button, self.scroll)
+            self.bind('<Shift-Button-%d>' % button, self.scroll)
+            self.bind('<Control-Button-%d>' % button, self.zoom)
+
+    def set_scrollregion(self):
+        """
+        DESCRIPTION:
+        Sets the scrollable area of the canvas to the size of the whole board.
+
+        PARAMETERS:
+        No additional parameters aside from the BoardCanvas attributes itself.
+
+        OUTPUT:
+        None.
+        """
+
+        self.configure(scrollregion=(0, 0,
+                                     self.board.n_cols * self.size,
+                                     self.board.n_rows * self.size))
+
+    def schedule_redraw(self):
+        """
+        DESCRIPTION:
+        Schedules a redraw of the viewport for when tkinter is idle, so that
+        many scroll events in a row lead to one redraw.
+
+        PARAMETERS:
+        No additional parameters aside from the BoardCanvas attributes itself.
+
+        OUTPUT:
+        None.
+        """
+
+        if not self.pending:
+            self.pending = True
+            self.after_idle(self.redraw)
+
+    def redraw(self):
+        """
+        DESCRIPTION:
+        Draws the tiles in the viewport. The items of tiles that left the
+        viewport are hidden and kept in self.free, and are moved to tiles that
+        came into view before new items are created.
+
+        PARAMETERS:
+        No additional parameters aside from the BoardCanvas attributes itself.
+
+        STRUCTURES:
+        Set comprehension:  Used to find the indices of the visible tiles.
+        For-loop:           Used to free the items of tiles out of view.
+        For-loop:           Used to draw the tiles that came into view.
+
+        OUTPUT:
+        The tiles in the viewport are drawn on the canvas.
+        """
+
+        self.pending = False
+        size = self.size
+        n_rows, n_cols = self.board.n_rows, self.board.n_cols
+
+        # rows and columns in the viewport and its margin
+        top = max(int(self.canvasy(0)) // size - MARGIN, 0)
+        left = max(int(self.canvasx(0)) // size - MARGIN, 0)
+        bottom = min(int(self.canvasy(self.winfo_height())) // size
+                     + MARGIN + 1, n_rows)
+        right = min(int(self.canvasx(self.winfo_width())) // size
+                    + MARGIN + 1, n_cols)
+
+        visible = {r * n_cols + c
+                   for r in range(top, bottom)
+                   for c in range(left, right)}
+
+        # frees the items of tiles that are out of view
+        for index in [index for index in self.drawn if index not in visible]:
+            items = self.drawn.pop(index)
+            self.itemconfig(items[0], state='hidden')
+            self.itemconfig(items[1], state='hidden')
+            self.free += [items]
+
+        # draws the tiles that came into view
+        font = ('Arial', size // 2)
+        for index in visible:
+            if index in self.drawn:
+                continue
+
+            r, c = divmod(index, n_cols)
+            x, y = c * size, r * size
+
+            if self.free:
+                rect, text = self.free.pop()
+                self.coords(rect, x, y, x + size, y + size)
+                self.coords(text, x + size // 2, y + size // 2)
+                self.itemconfig(rect, state='normal')
+                self.itemconfig(text, state='normal', font=font)
+            else:
+                rect = self.create_rectangle(x, y, x + size, y + size,
+                                             outline='white')
+                text = self.create_text(x + size // 2, y + size // 2,
+                                        font=font)
+
+            self.drawn[index] = (rect, text)
+            self.draw_tile(self.board.tiles[index])
+
+    def draw_tile(self, tile):
+        """
+        DESCRIPTION:
+        Sets the colour of the rectangle and the text of a drawn tile, which
+        depend on whether the tile is hidden, flagged, a mine or a number.
+
+        PARAMETERS:
+        tile:       The tile that is drawn.
+
+        STRUCTURES:
+        If-statements:  Used to choose the colour of the tile.
+
+        OUTPUT:
+        The redrawn tile on the canvas.
+        """
+
+        rect, text = self.drawn[tile.row * self.board.n_cols + tile.col]
+        symbol = repr(tile)
+
+        if not tile.revealed:
+            fill = HIDDEN_COLOUR
+        elif tile.is_mine:
+            fill = MINE_COLOUR
+        else:
+            fill = REVEALED_COLOUR
+
+        if symbol == '$':
+            symbol = ''
+
+        self.itemconfig(rect, fill=fill)
+        self.itemconfig(text, text=symbol, fill=NUMBER_COLOURS[tile.number])
+
+    def update_tiles(self, tiles):
+        """
+        DESCRIPTION:
+        Redraws the given tiles. Tiles that are not drawn are skipped, they are
+        drawn with their new state when they come into view.
+
+        PARAMETERS:
+        tiles:      The tiles that need to be redrawn, for example the changes
+                    of a move as given by the engine.
+
+        STRUCTURES:
+        For-loop:       Used to go through the tiles.
+        If-statement:   Used to check if the tile is drawn.
+
+        OUTPUT:
+        The redrawn tiles on the canvas.
+        """
+
+        n_cols = self.board.n_cols
+        for tile in tiles:
+            if tile.row * n_cols + tile.col in self.drawn:
+                self.draw_tile(tile)
+
+    def xview(self, *args):
+        """
+        DESCRIPTION:
+        Scrolls horizontally like tk.Canvas.xview (for example when the
+        scrollbar is used) and schedules a redraw of the viewport.
+
+        PARAMETERS:
+        *args:      The arguments of tk.Canvas.xview.
+
+        OUTPUT:
+        The output of tk.Canvas.xview.
+        """
+
+        result = tk.Canvas.xview(self, *args)
+        if args:
+            self.schedule_redraw()
+        return result
+
+    def yview(self, *args):
+        """
+        DESCRIPTION:
+        Scrolls vertically like tk.Canvas.yview (for example when the
+        scrollbar is used) and schedules a redraw of the viewport.
+
+        PARAMETERS:
+        *args:      The arguments of tk.Canvas.yview.
+
+        OUTPUT:
+        The output of tk.Canvas.yview.
+        """
+
+        result = tk.Canvas.yview(self, *args)
+        if args:
+            self.schedule_redraw()
+        return result
+
+    def scroll(self, event):
+        """
+        DESCRIPTION:
+        Scrolls the canvas with the mouse wheel; vertically, or horizontally
+        while Shift is held.
+
+        PARAMETERS:
+        event:      The tkinter mouse wheel event.
+
+        OUTPUT:
+        None.
+        """
+
+        steps = -3 if event.num == 4 or event.delta > 0 else 3
+        if event.state & 0x0001:
+            self.xview('scroll', steps, 'units')
+        else:
+            self.yview('scroll', steps, 'units')
+
+    def zoom(self, event):
+        """
+        DESCRIPTION:
+        Zooms in or out with the mouse wheel while Control is held. The tile
+        under the mouse stays under the mouse.
+
+        PARAMETERS:
+        event:      The tkinter mouse wheel event.
+
+        OUTPUT:
+        None.
+        """
+
+        zoom_in = event.num == 4 or event.delta > 0
+        size = self.size * 5 // 4 if zoom_in else self.size * 4 // 5
+
+        # position on the board under the mouse, in tiles
+        x = self.canvasx(event.x) / self.size
+        y = self.canvasy(event.y) / self.size
+
+        self.set_size(max(MIN_SIZE, min(MAX_SIZE, size)))
+
+        width = self.board.n_cols * self.size
+        height = self.board.n_rows * self.size
+        tk.Canvas.xview_moveto(self, (x * self.size - event.x) / width)
+        tk.Canvas.yview_moveto(self, (y * self.size - event.y) / height)
+
+    def set_size(self, size):
+        """
+        DESCRIPTION:
+        Changes the size of the tiles. All items are deleted, the viewport is
+        drawn again with the new size.
+
+        PARAMETERS:
+        size (int):     The new width and height of a tile in pixels.
+
+        OUTPUT:
+        None.
+        """
+
+        self.size = size
+        self.delete('all')
+        self.drawn = {}
+        self.free = []
+        self.set_scrollregion()
+        self.schedule_redraw()
+
+    def set_board(self, board):
+        """
+        DESCRIPTION:
+        Draws another board of the same size, for example when a new game is
+        started. The items of the drawn tiles are reused.
+
+        PARAMETERS:
+        board:      The MineSweeper object that is drawn from now on.
+
+        STRUCTURES:
+        For-loop:   Used to redraw the drawn tiles.
+
+        OUTPUT:
+        None.
+        """
+
+        self.board = board
+        for index in self.drawn:
+            self.draw_tile(board.tiles[index])
+
+    def tile_at(self, event):
+        """
+        DESCRIPTION:
+        Calculates the row/column coordinates of the tile under a click.
+
+        PARAMETERS:
+        event:      The tkinter mouse event.
+
+        OUTPUT:
+        The (row, col) coordinates, or None when the click is outside of the
+        board.
+        """
+
+        row = int(self.canvasy(event.y)) // self.size
+        col = int(self.canvasx(event.x)) // self.size
+
+        if self.board.valid_pos(row, col):
+            return row, col
+
+        return None
+
+    def left_button(self, event):
+        """
+        DESCRIPTION:
+        Calls on_left_click with the coordinates of the clicked tile.
+
+        PARAMETERS:
+        event:      The tkinter mouse event.
+
+        OUTPUT:
+        None.
+        """
+
+        position = self.tile_at(event)
+        if position is not None:
+            self.on_left_click(*position)
+
+    def right_button(self, event):
+        """
+        DESCRIPTION:
+        Calls on_right_click with the coordinates of the clicked tile.
+
+        PARAMETERS:
+        event:      The tkinter mouse event.
+
+        OUTPUT:
+        None.
+        """
+
+        position = self.tile_at(event)
+        if position is not None:
+            self.on_right_click(*position)
+
+    def middle_button(self, event):
+        """
+        DESCRIPTION:
+        Calls on_middle_click with the coordinates of the clicked tile.
+
+        PARAMETERS:
+        event:      The tkinter mouse event.
+
+        OUTPUT:
+        None.
+        """
+
+        position = self.tile_at(event)
+        if position is not None:
+            self.on_middle_click(*position)
@@ -3,37 +3,38 @@ README:
 This script creates a graphical user interface for the game setup starting
 screen:
 
-It contains ONE class which generates a pop-up at the start of the game, that
-allows the player to adjust the OS version, the size of the playing field,
-and the difficulty of the game. The settings are used for the final creation
-of the board.
+It contains ONE class which generates the screen at the start of the game,
+that allows the player to adjust the OS version, the size of the playing field,
+whether the board may need guessing, and the difficulty of the game. The
+settings are used for the final creation of the board.
 
 ADDITIONAL PACKAGES:
 tkinter:    A python library used to create the GUI.
-app:        A module made to create the GUI for the minesweeper game.
 """
 
 import tkinter as tk
-from src.app import App
 
 
 ###########################################
 ############### StartScreen ###############
 ###########################################
-class StartScreen(tk.Tk):
+class StartScreen(tk.Frame):
     """
     DESCRIPTION:
-    The StartScreen creates the popup at the start of the game in which
+    The StartScreen creates the screen at the start of the game in which
     the player can adjust the OS version, the size of the playing field, and
-    the difficulty of the game.
+    the difficulty of the game. It is a frame that is shown in the window of
+    the Session, which swaps it with the game.
 
     PARAMETERS:
-    The class does not have parameters.
+    master:     The Session that shows the StartScreen.
 
     METHODS:
     __init__(self):                 Initialises the class.
     choose_OS(self):                Let the player choose MacOS or Windows OS.
     set_playfield(self):            Let the player choose the size of the field.
+    set_no_guess(self):             Let the player choose boards that can be
+                                    solved without guessing.
     set_difficulty(self):  Let the player set difficulty level.
     easy(self):                     Initialises a game in easy mode.
     normal(self):                   Initialises a game in normal mode.
@@ -51,19 +52,15 @@ class StartScreen(tk.Tk):
     No structures are used in this class.
 
     OUTPUT:
-    A window in which the user can choose the preferred OS version, the size of
-    the playing field, and the difficulty of the game. The window is closed when
-    the player has made her/his selection.
+    A screen in which the user can choose the preferred OS version, the size of
+    the playing field, and the difficulty of the game. The Session shows the
+    game when the player has made her/his selection.
     """
 
-    def __init__(self):
+    def __init__(self, master):
         """
         DESCRIPTION:
         This method initialises the class attributes:
-        self.title:     Gives the GUI a title.
-        self.resizable: Makes sure the user cannot change the window size of the
-                        GUI start-screen.
-        self.geometry:  Sets the size of the window.
         self.ROWS:      The number of rows on the board
         self.COLUMNS:   The number of columns on the board.
         self.OS:        Contains the value for the OS version. This value is
@@ -78,16 +75,15 @@ class StartScreen(tk.Tk):
         self.set_playfield():   Initiates the function that creates the radio
                         buttons on the start-screen which lets the player choose
                         the preferred size of the playing field; S/M/L.
+        self.no_guess:  Contains True when the board has to be solvable without
+                        guessing. The initial value is False.
         self.set_difficulty(): Initiates the function that creates the buttons
                         on the start-screen which lets te player choose the
                         game mode; easy, normal, or hard. Clicking the button
                         of the preferred difficulty starts the game.
         """
 
-        tk.Tk.__init__(self)
-        self.title('Minesweeper')
-        self.resizable(False, False)
-        self.geometry("300x225")
+        tk.Frame.__init__(self, master)
         self.ROWS = tk.IntVar()
         self.COLUMNS = tk.IntVar()
 
@@ -97,6 +93,9 @@ class StartScreen(tk.Tk):
         self.playfield = tk.IntVar(value=13)
         self.set_playfield()
 
+        self.no_guess = tk.BooleanVar(value=False)
+        self.set_no_guess()
+
         self.set_difficulty()
 
     def choose_OS(self):
@@ -167,6 +166,25 @@ class StartScreen(tk.Tk):
                                  value=16)
         rad_mac.grid(row=1, column=2)
 
+    def set_no_guess(self):
+        """
+        DESCRIPTION:
+        Makes a check button which allows the player to choose boards that can
+        be solved from the first click without guessing. The selection changes
+        the self.no_guess attribute of the class.
+
+        PARAMETERS:
+        No additional parameters aside from the StartScreen attributes itself.
+
+        OUTPUT:
+        A check button on the start-screen window.
+        """
+
+        check_no_guess = tk.Checkbutton(self,
+                                        text="No guessing",
+                                        variable=self.no_guess)
+        check_no_guess.pack(pady=(10, 0))
+
     def set_difficulty(self):
         """
         DESCRIPTION:
@@ -202,8 +220,8 @@ class StartScreen(tk.Tk):
         """
         DESCRIPTION:
         Initialised when the player presses the easy button generated in the
-        new_difficulty_level_window function. The starting screen is killed and
-        a new minesweeper GUI is generated on easy settings (low mine count,
+        new_difficulty_level_window function. The starting screen is hidden and
+        a new minesweeper GUI is shown on easy settings (low mine count,
         large safe radius).
 
         PARAMETERS:
@@ -214,20 +232,19 @@ class StartScreen(tk.Tk):
         easy mode settings, as well as the other settings chosen by the player.
         """
 
-        app = App(self.playfield.get(),
-                  self.playfield.get(),
-                  self.playfield.get() ** 2 // 6,
-                  2,
-                  self.OS.get())
-        self.destroy()
-        app.mainloop()
+        self.master.start_game(self.playfield.get(),
+                               self.playfield.get(),
+                               self.playfield.get() ** 2 // 6,
+                               2,
+                               self.OS.get(),
+                               self.no_guess.get())
 
     def normal(self):
         """
         DESCRIPTION:
         Initialised when the player presses the normal button generated in the
-        new_difficulty_level_window function. The starting screen is killed and
-        a new minesweeper GUI is generated on normal settings (medium mine
+        new_difficulty_level_window function. The starting screen is hidden and
+        a new minesweeper GUI is shown on normal settings (medium mine
         count, large safe radius).
 
         PARAMETERS:
@@ -239,20 +256,19 @@ class StartScreen(tk.Tk):
         player.
         """
 
-        app = App(self.playfield.get(),
-                  self.playfield.get(),
-                  self.playfield.get() ** 2 // 4,
-                  2,
-                  self.OS.get())
-        self.destroy()
-        app.mainloop()
+        self.master.start_game(self.playfield.get(),
+                               self.playfield.get(),
+                               self.playfield.get() ** 2 // 4,
+                               2,
+                               self.OS.get(),
+                               self.no_guess.get())
 
     def hard(self):
         """
         DESCRIPTION:
         Initialised when the player presses the hard button generated in the
-        new_difficulty_level_window function. The starting screen is killed and
-        a new minesweeper GUI is generated on hard settings (high mine count,
+        new_difficulty_level_window function. The starting screen is hidden and
+        a new minesweeper GUI is shown on hard settings (high mine count,
         small safe radius).
 
         PARAMETERS:
@@ -263,10 +279,9 @@ class StartScreen(tk.Tk):
         hard mode settings, as well as the other settings chosen by the player.
         """
 
-        app = App(self.playfield.get(),
-                  self.playfield.get(),
-                  self.playfield.get() ** 2 // 2,
-                  1,
-                  self.OS.get())
-        self.destroy()
-        app.mainloop()
+        self.master.start_game(self.playfield.get(),
+                               self.playfield.get(),
+                               self.playfield.get() ** 2 // 2,
+                               1,
+                               self.OS.get(),
+                               self.no_guess.get())
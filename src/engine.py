@@ -2,13 +2,52 @@
 README:
 This script contains TWO object class definitions for playing the Mine Sweeper
 game. The two classes are MineSweeper (which is the whole game) and
-Tile (which makes up the board of the game).
+Tile (which makes up the board of the game). It also contains the function
+count_adjacent_mines, which counts the adjacent mines of all tiles at once,
+the function neighbour_table, which precomputes where the neighbours of
+each tile are, the function label_openings, which finds the openings and the
+3BV of a board, the function find_opening, which finds the opening of one
+empty tile, and the functions sample_mines and make_rng, which choose the
+positions of the mines.
 
 ADDITIONAL PACKAGES:
-random:     A python library used to randomly distribute the mines.
+array:          A python library, its arrays hold the labels and the tiles of
+                the openings compactly.
+copy:           A python library used to copy the game.
+random:         A python library used to randomly distribute the mines.
+re:             A python library used to find the runs of empty tiles.
+collections:    A python library, its deque is used as the queue of tiles
+                that still need to be opened when an empty region is revealed.
 """
 
+import copy
 import random
+import re
+from array import array
+from collections import deque
+
+# bits of the border table that tell which sides of a tile are on the edge of
+# the board
+TOP = 1
+BOTTOM = 2
+LEFT = 4
+RIGHT = 8
+
+# the status of a game, and the statuses in which it has ended
+PRISTINE = 'pristine'
+PLAYING = 'playing'
+WON = 'won'
+LOST = 'lost'
+ENDED = (WON, LOST)
+
+# the actions of a move, in the order of their codes in a move code
+# (row * n_cols + col) * 4 + action
+ACTIONS = ('reveal', 'flag', 'chord')
+
+# a run of empty tiles in the counts of a board, and the translation table
+# that marks the empty tiles with 1
+ZERO_RUN = re.compile(b'\x00+')
+EMPTY_BITS = bytes([1]) + bytes(255)
 
 
 ###########################################
@@ -26,9 +65,15 @@ class MineSweeper:
     n_mines (int):      The amount of mines to be distributed on the board.
     safe_radius(int):   The square radius around the first revealed tile where
                         there will be no mines.
+    seed:               Optional; an int seed, a random.Random object or a
+                        NumPy Generator that decides where the mines are laid.
+                        Games with the same seed get the same mines.
+    pool:               Optional; a BoardPool (see pool.py) from which a
+                        pre-generated layout is taken at the first reveal.
 
     LIMITATIONS:
-    1.  The randomly generated games can not always be solved without guessing.
+    1.  The randomly generated games can not always be solved without guessing,
+        unless a NoGuessGenerator (see noguess.py) is given as the pool.
     2.  Tiles that are flagged are not revealed when the reveal method will
         recurse around empty tiles.
     3.  Width of the board changes when an entire column is revealed.
@@ -40,14 +85,59 @@ class MineSweeper:
                                 the board.
     self.adjacent(row, col, radius): Returns a set of adjacent tiles in a square
                                 radius.
+    self.offsets(radius):       Returns the row/column offsets of a square
+                                radius.
     self.create_board():        Creates a board of tiles in a list of lists.
-    self.reveal(row, col):      Reveals a tile on the board, will recurse when
-                                it reveals an empty tile.
+    self.clone():               Returns a copy of the game to try moves on.
+    self.copy_board(original):  Lets a clone share the tiles of the original.
+    self.own_tiles():           Copies the lists of tiles shared with a clone.
+    self.own_tile(index):       Returns a tile that can be changed without
+                                changing a clone.
+    self.own_board():           Gives the game its own copy of every tile.
+    self.reveal(row, col):      Reveals a tile on the board, will open the whole
+                                surrounding region when it reveals an empty
+                                tile.
+    self.chord(row, col):       Reveals all unflagged neighbours of a revealed
+                                number when enough flags surround it.
+    self.apply_moves(moves):    Makes a sequence of moves as one move.
+    self.prepare_board(row, col): Lays the mines at the first reveal.
+    self.chord_neighbours(index): Returns the neighbours that a chord opens.
+    self.open_tiles(indices):   Opens tiles and the empty regions around them.
+    self.finish_move(changes, flagged): Triggers the change event handlers
+                                and checks for game over after a move.
+    self.notify_move(action, row, col): Triggers the move event handlers after
+                                a call of reveal, chord or flag.
     self.lay_mines(start_row, start_col): Places mines on the board.
+    self.place_layout(mines, counts): Places a pre-generated layout on the
+                                board.
     self.assign_numbers():      Counts the amount of adjacent mines for each tile.
     self.flag(row, col):        Places or removes flag on tile.
+    self.toggle_flag(index):    Places or removes a flag without triggering
+                                the event handlers.
+    reveal, chord and flag return the list of tiles that were changed by the
+    move, which is also given to the on_change event handlers.
     self.game_over():           Checks if the game has been won or lost and
                                 triggers corresponding event handlers.
+    self.update_status():       Sets the status from the counters, after they
+                                were changed directly.
+    self.pristine:              Property that is True before the first reveal.
+    self.won:                   Property that is True when all safe tiles are
+                                revealed.
+    self.lost:                  Property that is True when a mine is revealed.
+    reveal, chord, flag and apply_moves do nothing once the game has been won
+    or lost.
+    self.flags_left:            Property with the amount of mines minus the
+                                amount of placed flags.
+    self.whole_openings(indices): Finds the openings of the given tiles that
+                                are still fully hidden.
+    self.empty_tiles():         Returns the tiles without adjacent mines.
+    self.find_openings():       Finds the openings and the 3BV of the board.
+    self.opening_hidden(spans): Checks if no tile of an opening is revealed or
+                                flagged.
+    self.n_openings:            Property with the amount of openings.
+    self.bbbv:                  Property with the 3BV of the board.
+    self.efficiency(seconds):   Returns the 3BV per second of a game that took
+                                the given time.
     self.__iter__():            Makes MineSweeper object iterable, looping over a
                                 MineSweeper object will go through each tile on
                                 the board.
@@ -64,30 +154,91 @@ class MineSweeper:
     The MineSweeper object.
     """
 
-    def __init__(self, n_rows: int, n_cols: int, n_mines: int, safe_radius):
+    def __init__(self, n_rows: int, n_cols: int, n_mines: int, safe_radius,
+                 seed=None, pool=None):
         """
         This method initialises class attributes and creates board:
         safe_radius (int):  The square radius around the first tile where no
                             mines are placed.
-        pristine (bool):    True when the player has not revealed any tiles yet
-        on_win (list):      Event handler that should be triggered when the game
-                            ends in a win.
-        on_loss (list):     Event handler that should be triggered when the game
-                            ends in a loss.
+        seed (int):         The seed of the game when it was given as an int,
+                            otherwise None.
+        rng:                The random number generator used to lay the mines.
+        pool:               The BoardPool that provides layouts, or None.
+        status (str):       PRISTINE until the first tile is revealed, then
+                            PLAYING until the game ends, then WON or LOST.
+        pristine (bool):    Property that is True when the player has not
+                            revealed any tiles yet.
+        n_hidden (int):     The amount of tiles that are not revealed yet.
+        n_flagged (int):    The amount of tiles that are flagged.
+        n_mines_hit (int):  The amount of revealed mines.
+        border (bytearray): For each tile, the TOP/BOTTOM/LEFT/RIGHT bits of
+                            the board edges it touches.
+        deltas (list):      For each combination of border bits, a tuple with
+                            the differences between the index of a tile and the
+                            indices of its neighbours (see neighbour_table).
+        on_win (list):      Event handler that should be triggered once, when
+                            the game ends in a win.
+        on_loss (list):     Event handler that should be triggered once, when
+                            the game ends in a loss.
+        on_change (list):   Event handler that should be triggered after every
+                            move that changed tiles, with the list of changed
+                            tiles.
+        flags_changed (list): The indices of the tiles of which the last move
+                            changed the flag, also when a later move of the
+                            same apply_moves revealed them, so that they can
+                            be told apart from the opened tiles.
+        on_move (list):     Event handler that should be triggered after every
+                            call of reveal, chord or flag, also when it changed
+                            nothing, with the name of the method and the
+                            coordinates. Moves after the end of the game are
+                            rejected and do not trigger it.
         """
 
         self.n_rows = n_rows
         self.n_cols = n_cols
         self.n_mines = n_mines
         self.safe_radius = safe_radius
+        self.seed = seed if isinstance(seed, int) else None
+        self.rng = make_rng(seed)
+        self.pool = pool
+
+        # precomputed neighbours, so that no coordinates have to be checked
+        # when the neighbours of a tile are visited
+        self.border, self.deltas = neighbour_table(n_rows, n_cols)
+        self.square_offsets = {}
 
         self.create_board()
-        self.pristine = True
+        self.status = PRISTINE
+
+        # counters that are kept up to date by reveal and flag, so the state of
+        # the game never requires a scan of the whole board
+        self.n_hidden = n_rows * n_cols
+        self.n_flagged = 0
+        self.n_mines_hit = 0
+
+        # the mines and counts of the layout, and the empty tiles marked with
+        # 1; open_tiles finds the opening of an empty tile from them (see
+        # find_opening)
+        self.planes = None
+        self.empty = None
+
+        # the openings of the board and its 3BV, see label_openings; they are
+        # only found when they are read (see find_openings)
+        self.labels = None
+        self.openings = []
+        self.n_bbbv = 0
 
         # lists for event handlers that trigger when the game is over
         self.on_win = []
         self.on_loss = []
 
+        # list for event handlers that trigger when a move changed tiles
+        self.on_change = []
+        self.flags_changed = []
+
+        # list for event handlers that trigger after every move
+        self.on_move = []
+
     # checks if specified position exists on the board
     def valid_pos(self, row, col):
         """
@@ -99,15 +250,15 @@ class MineSweeper:
         col (int):  The column coordinate that needs to be verified.
 
         STRUCTURES:
-        And-statement:  used to check if both the row and the column coordinate
-                        are valid.
+        Chained comparisons:    used to check if both the row and the column
+                                coordinate are valid.
 
         OUTPUTS:
         Boolean value that is true if the specified position exists on the board,
         or false if it does not exist.
         """
 
-        return row in range(self.n_rows) and col in range(self.n_cols)
+        return 0 <= row < self.n_rows and 0 <= col < self.n_cols
 
     # returns a set of adjacent tiles (including the tile itself) in a square
     # radius
@@ -130,29 +281,60 @@ class MineSweeper:
                         when the radius is 0.
 
         STRUCTURES:
-        Embedded for-loop:  Is used to go through all row/column coordinates
-                            around the specified position.
-        If-statement:       Used to check if the row/column coordinates exist on
-                            the board.
+        If-statement:   Used to look the neighbours up in the neighbour table
+                        when the radius is 1.
+        For-loop:       Used to go through the precomputed neighbours, or the
+                        precomputed offsets of larger radii.
+        If-statement:   Used to check if the row/column coordinates exist on
+                        the board.
 
         OUTPUTS:
         A set of adjacent tiles to the specified position, including the tile at
         the specified position itself.
         """
 
-        tiles = set()
+        index = row * self.n_cols + col
+        tiles = {self.tiles[index]}
 
-        # loops all row/column indices around the tile
-        for i in range(row - radius, row + radius + 1):
-            for j in range(col - radius, col + radius + 1):
+        # radius 1 uses the neighbour table
+        if radius == 1:
+            for delta in self.deltas[self.border[index]]:
+                tiles.add(self.tiles[index + delta])
 
-                # checks if the tile exists on the board, before adding it to
-                # the output set
-                if self.valid_pos(i, j):
-                    tiles.add(self.board[i][j])
+        # larger radii check the precomputed offsets against the board size
+        else:
+            for i, j in self.offsets(radius):
+                if self.valid_pos(row + i, col + j):
+                    tiles.add(self.tiles[index + i * self.n_cols + j])
 
         return tiles
 
+    # returns the offsets of all positions in a square radius
+    def offsets(self, radius):
+        """
+        DESCRIPTION:
+        Returns the row/column offsets of all positions in a square radius.
+        The offsets are calculated once per radius and kept in
+        self.square_offsets.
+
+        PARAMETERS:
+        radius (int):   The square radius of the offsets.
+
+        STRUCTURES:
+        If-statement:   Used to check if the offsets were calculated before.
+
+        OUTPUTS:
+        A tuple of (row offset, column offset) pairs.
+        """
+
+        if radius not in self.square_offsets:
+            self.square_offsets[radius] = tuple(
+                (i, j)
+                for i in range(-radius, radius + 1)
+                for j in range(-radius, radius + 1))
+
+        return self.square_offsets[radius]
+
     # creates a board of empty tiles
     def create_board(self):
         """
@@ -168,8 +350,13 @@ class MineSweeper:
 
         OUTPUTS:
         The method has no output: the MineSweeper object is modified directly.
+        The tiles are stored in self.board as a list of rows, and in self.tiles
+        as one flat list, so that tiles can be looked up by their index. The
+        game owns all of them until it is cloned (see copy_board).
         """
 
+        self.owner = None
+        self.tiles_shared = False
         self.board = []
 
         # creates rows
@@ -183,6 +370,131 @@ class MineSweeper:
             # places finished row on board
             self.board += [row]
 
+        self.tiles = [tile for row in self.board for tile in row]
+
+    # returns a copy of the game
+    def clone(self):
+        """
+        DESCRIPTION:
+        Returns a copy of the game that moves can be made on without changing
+        this game, for instance to try a move or to look ahead. This is much
+        cheaper than copy.deepcopy: the neighbour tables, the pool and the
+        tiles are shared, and a tile is only copied when one of the games
+        changes it (see copy_board). The clone starts without event handlers.
+
+        PARAMETERS:
+        No additional parameters aside from the MineSweeper attributes itself.
+
+        OUTPUTS:
+        The cloned MineSweeper object.
+        """
+
+        clone = copy.copy(self)
+        clone.rng = copy.copy(self.rng)
+        clone.on_win = []
+        clone.on_loss = []
+        clone.on_change = []
+        clone.on_move = []
+        clone.copy_board(self)
+
+        return clone
+
+    # lets a clone share the tiles of the original game
+    def copy_board(self, original):
+        """
+        DESCRIPTION:
+        Lets a clone share the lists of tiles and the Tile objects of the
+        original game (copy on write, like PackedMineSweeper.copy_board).
+        Every Tile object holds both the mine and the state of the tile, so a
+        game may only change the tiles whose owner is its own self.owner. Both
+        games get a new owner, so neither owns a shared tile; the first change
+        of a tile copies it (see own_tile). The lists are marked as shared, so
+        the first change copies them as well.
+
+        PARAMETERS:
+        original (MineSweeper): The game that was cloned.
+
+        OUTPUTS:
+        The method has no output: both games are modified directly.
+        """
+
+        self.owner = object()
+        original.owner = object()
+        self.tiles_shared = original.tiles_shared = True
+
+    # copies the lists of tiles when they are shared with a clone
+    def own_tiles(self):
+        """
+        DESCRIPTION:
+        Copies self.tiles and the rows of self.board when they are shared with
+        a clone, so that tiles can be replaced in them. Only the references
+        are copied, not the tiles.
+
+        STRUCTURES:
+        For-loop:       Used to split the copied tiles into rows.
+
+        OUTPUTS:
+        The method has no output: the lists are replaced directly.
+        """
+
+        if self.tiles_shared:
+            self.tiles = list(self.tiles)
+            self.board = [self.tiles[start:start + self.n_cols]
+                          for start in range(0, len(self.tiles), self.n_cols)]
+            self.tiles_shared = False
+
+    # returns a tile that this game may change
+    def own_tile(self, index):
+        """
+        DESCRIPTION:
+        Returns the tile at an index so that it can be changed. A tile that is
+        shared with a clone is copied first, and the copy replaces it in
+        self.tiles and self.board. Every method that changes a tile after the
+        mines are laid gets it from here.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        OUTPUTS:
+        The Tile object at the index, owned by this game.
+        """
+
+        self.own_tiles()
+        tile = self.tiles[index]
+
+        if tile.owner is not self.owner:
+            # the attributes are copied directly, which is several times
+            # faster than copy.copy
+            copied = Tile.__new__(Tile)
+            copied.__dict__.update(tile.__dict__)
+            copied.owner = self.owner
+            self.tiles[index] = copied
+            self.board[index // self.n_cols][index % self.n_cols] = copied
+            tile = copied
+
+        return tile
+
+    # gives the game its own copy of every tile
+    def own_board(self):
+        """
+        DESCRIPTION:
+        Copies all tiles that are shared with a clone. Used before the mines
+        are laid, which changes every tile anyway.
+
+        STRUCTURES:
+        For-loop:       Used to copy the tiles that this game does not own.
+
+        OUTPUTS:
+        The method has no output: the tiles are replaced directly.
+        """
+
+        if self.owner is None:
+            return
+
+        for index, tile in enumerate(self.tiles):
+            if tile.owner is not self.owner:
+                self.own_tile(index)
+
     # reveals a specified tile
     def reveal(self, row, col):
         """
@@ -196,94 +508,524 @@ class MineSweeper:
         STRUCTURES:
         If-statement:   Used to check if this is the first time this method is
                         called.
-        If-statement:   Used to check if the tile is neither revealed nor flagged.
-        If-statement:   Used to check if the method should recurse.
-        For-loop:       Used to go through all adjacent tiles.
-        Recursion:      Used to reveal adjacent tiles.
+        If-statement:   Used to check if the pool has a layout ready, otherwise
+                        the mines are laid and counted now.
 
         OUTPUTS:
-        The method has no output: the Tile object is modified directly.
+        The list of tiles that were revealed by this move. The game over check
+        is done once, after all tiles of the move are opened.
         """
 
+        # a game that has ended does not change any more
+        if self.status in ENDED:
+            return []
+
         # lays mines after the first tile has been selected, so the first tile
         # will never be a mine
         if self.pristine:
+            self.prepare_board(row, col)
+
+        changes = self.open_tiles([row * self.n_cols + col])
+        self.finish_move(changes)
+        self.notify_move('reveal', row, col)
+
+        return changes
+
+    # lays the mines at the first reveal
+    def prepare_board(self, row, col):
+        """
+        DESCRIPTION:
+        Lays the mines when the first tile is revealed: a layout is taken from
+        the pool when it has one ready, otherwise the mines are laid and
+        counted now.
+
+        PARAMETERS:
+        row (int):      The row coordinate of the first revealed tile.
+        col (int):      The column coordinate of the first revealed tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if the pool has a layout ready.
+
+        OUTPUTS:
+        The method has no output: the board is modified directly.
+        """
+
+        layout = None
+        if self.pool is not None:
+            layout = self.pool.take(self.n_rows, self.n_cols, self.n_mines,
+                                    self.safe_radius, row, col)
+
+        if layout is None:
             self.lay_mines(row, col)
             self.assign_numbers()
-            self.pristine = False
+        else:
+            self.place_layout(*layout)
+
+        self.pristine = False
+
+    # reveals the neighbours of a number that has enough flags around it
+    def chord(self, row, col):
+        """
+        DESCRIPTION:
+        Reveals all unflagged neighbours of a revealed number, when the amount
+        of flagged neighbours equals the number. All neighbours are opened as
+        one move.
+
+        PARAMETERS:
+        row (int):      The row coordinate of the revealed number.
+        col (int):      The column coordinate of the revealed number.
+
+        STRUCTURES:
+        If-statement:   Used to check if the chord opens any neighbours.
+
+        OUTPUTS:
+        The list of tiles that were revealed by this move.
+        """
+
+        # a game that has ended does not change any more
+        if self.status in ENDED:
+            return []
+
+        changes = []
+        neighbours = self.chord_neighbours(row * self.n_cols + col)
+
+        if neighbours:
+            changes = self.open_tiles(neighbours)
+            self.finish_move(changes)
+
+        self.notify_move('chord', row, col)
+
+        return changes
+
+    # returns the neighbours that a chord on a tile opens
+    def chord_neighbours(self, index):
+        """
+        DESCRIPTION:
+        Returns the neighbours of a revealed number when the amount of flagged
+        neighbours equals the number.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if the tile is a revealed number.
+        For-loop:       Used to count the flagged neighbours.
+        If-statement:   Used to check if the amount of flags matches the number.
+
+        OUTPUTS:
+        The list of the indices of the neighbours, or an empty list when the
+        chord does nothing.
+        """
+
+        tile = self.tiles[index]
+        if not tile.revealed or tile.is_mine or tile.number == 0:
+            return []
+
+        neighbours = [index + delta
+                      for delta in self.deltas[self.border[index]]]
+        n_flags = 0
+        for neighbour in neighbours:
+            if self.tiles[neighbour].flagged:
+                n_flags += 1
+
+        if n_flags != tile.number:
+            return []
+
+        return neighbours
+
+    # makes a sequence of moves as one move
+    def apply_moves(self, moves):
+        """
+        DESCRIPTION:
+        Makes a sequence of moves in one call, for bots and replays. The moves
+        are made as one move: the on_change event handlers and the game over
+        check are triggered once, at the end, with the tiles that all moves
+        changed together. The moves after the first move that wins or loses
+        the game are not made. The on_move event handlers still get every
+        move, so a MoveLog records every move of the sequence.
+
+        PARAMETERS:
+        moves:          A sequence of (action, row, col) tuples, with action
+                        'reveal', 'flag' or 'chord', or of move codes
+                        (row * n_cols + col) * 4 + action, with action the
+                        position in ACTIONS, like an array('i') or the moves
+                        of a Replayer.
+
+        STRUCTURES:
+        For-loop:       Used to make the moves.
+        If-statement:   Used to tell a move code from a tuple.
+        If-statement:   Used to make the move of the action.
+        Dictionary:     Used to keep which flags changed an odd amount of
+                        times, so a flag that is placed and removed again is
+                        not a change.
+
+        OUTPUTS:
+        The list of changed tiles: the revealed tiles, followed by the hidden
+        tiles of which the flag changed. The flags that changed are also kept
+        in self.flags_changed, including those of tiles that a later move of
+        the sequence revealed.
+        """
+
+        # a game that has ended does not change any more
+        if self.status in ENDED:
+            return []
+
+        n_cols = self.n_cols
+        on_move = self.on_move
+        opened = []
+        toggled = {}
+
+        for move in moves:
+            if isinstance(move, int):
+                action = ACTIONS[move & 3]
+                row, col = divmod(move >> 2, n_cols)
+            else:
+                action, row, col = move
+            index = row * n_cols + col
+
+            if action == 'flag':
+                if self.toggle_flag(index):
+                    toggled[index] = not toggled.get(index, False)
+
+            elif action == 'reveal' or action == 'chord':
+                if action == 'chord':
+                    indices = self.chord_neighbours(index)
+                else:
+                    if self.pristine:
+                        self.prepare_board(row, col)
+                    indices = [index]
+                opened += self.open_tiles(indices)
+
+            else:
+                raise ValueError('unknown action %r' % (action,))
+
+            if on_move:
+                self.notify_move(action, row, col)
+
+            # the counters tell at once whether the move ended the game
+            if self.n_mines_hit or self.n_hidden == self.n_mines:
+                break
+
+        flagged = [index for index, odd in toggled.items() if odd]
+        changes = opened + [self.tiles[index] for index in flagged
+                            if not self.tiles[index].revealed]
+        self.finish_move(changes, flagged)
+
+        return changes
+
+    # opens tiles and the empty regions around them
+    def open_tiles(self, indices):
+        """
+        DESCRIPTION:
+        Opens the tiles at the given indices, and the whole empty region around
+        each opened tile without adjacent mines. Tiles that are revealed or
+        flagged are skipped.
+
+        PARAMETERS:
+        indices (list): The indices (row * n_cols + col) of the tiles.
+
+        STRUCTURES:
+        For-loop:       Used to open the given tiles.
+        While-loop:     Used to open tiles from a queue until the empty regions
+                        have been opened completely. A queue is used instead of
+                        recursion, so that large empty regions do not exceed
+                        Python's recursion limit.
+        If-statement:   Used to check if the neighbours of an opened tile should
+                        be opened as well.
+        If-statement:   Used to open the whole opening of an empty tile at
+                        once, from the tiles found by whole_openings before
+                        any tile was opened. Only when a tile of the opening
+                        is revealed or flagged, since a flag may have stopped
+                        an earlier search in it, are the neighbours searched
+                        one tile at a time.
+        For-loop:       Used to go through all adjacent tiles in the neighbour
+                        table.
+
+        OUTPUTS:
+        The list of opened tiles. The counters of hidden tiles and revealed
+        mines are modified directly.
+        """
+
+        self.own_tiles()
+        tiles, border, deltas = self.tiles, self.border, self.deltas
+        owner = self.owner
+        opened = []
+        queue = deque()
+
+        # the openings that can be opened at once; an empty tile reached
+        # later lies in the opening of one of the given tiles
+        whole = self.whole_openings(indices)
+
+        # only opens tiles that are neither revealed nor flagged
+        for index in indices:
+            tile = tiles[index]
+            if not tile.revealed and not tile.flagged:
+                if tile.owner is not owner:
+                    tile = self.own_tile(index)
+                tile.revealed = True
+                opened += [tile]
+                queue.append(index)
+
+        # opens all surrounding tiles of tiles without adjacent mines
+        while queue:
+            index = queue.popleft()
+            tile = tiles[index]
+
+            if tile.is_mine:
+                self.n_mines_hit += 1
+
+            elif tile.number == 0:
+                spans = whole.pop(index, None)
+
+                # a fully hidden opening is opened at once
+                if spans is not None:
+                    for first, stop in zip(spans[::2], spans[1::2]):
+                        for other in range(first, stop):
+                            neighbour = tiles[other]
+                            if not neighbour.revealed:
+                                if neighbour.owner is not owner:
+                                    neighbour = self.own_tile(other)
+                                neighbour.revealed = True
+                                opened.append(neighbour)
+                    continue
+
+                for delta in deltas[border[index]]:
+                    neighbour = tiles[index + delta]
+                    if not neighbour.revealed and not neighbour.flagged:
+                        if neighbour.owner is not owner:
+                            neighbour = self.own_tile(index + delta)
+                        neighbour.revealed = True
+                        opened.append(neighbour)
+                        queue.append(index + delta)
+
+        self.n_hidden -= len(opened)
+
+        return opened
+
+    # finds the openings of the given tiles that can be opened at once
+    def whole_openings(self, indices):
+        """
+        DESCRIPTION:
+        Finds the openings of the given empty tiles with find_opening, and
+        keeps those that are still fully hidden. Only the openings that are
+        reached are searched, run by run, so a reveal costs time in
+        proportion to its opening and not to the board.
+
+        PARAMETERS:
+        indices (list): The indices (row * n_cols + col) of the tiles.
+
+        STRUCTURES:
+        For-loop:       Used to find the opening of every empty tile that is
+                        not in an opening that was found already.
+
+        OUTPUTS:
+        A dictionary from the index of a given tile to the start and stop
+        indices of the rows of tiles of its opening, as made by find_opening.
+        """
+
+        empty = self.empty_tiles()
+        whole = {}
+        if empty is None:
+            return whole
+
+        found = []
+        for index in indices:
+            if empty[index] and not any(first <= index < stop
+                                        for first, stop in found):
+                spans = find_opening(empty, self.n_rows, self.n_cols, index)
+                found += zip(spans[::2], spans[1::2])
+                if self.opening_hidden(spans):
+                    whole[index] = spans
+
+        return whole
+
+    # returns the empty tiles of the layout
+    def empty_tiles(self):
+        """
+        DESCRIPTION:
+        Returns the tiles without adjacent mines, marked with 1, from the
+        counts that place_layout or assign_numbers kept in self.planes. They
+        are translated once per layout.
+
+        OUTPUTS:
+        A bytes object with one byte per tile, or None when the mines are not
+        laid.
+        """
+
+        if self.empty is None and self.planes is not None:
+            self.empty = bytes(self.planes[1]).translate(EMPTY_BITS)
+
+        return self.empty
+
+    # finds the openings of the board the first time they are read
+    def find_openings(self):
+        """
+        DESCRIPTION:
+        Finds the openings and the 3BV of the whole board with label_openings,
+        from the mines and counts in self.planes. This is done once, when the
+        3BV or the amount of openings is first read, so that laying the mines,
+        loading a game and revealing tiles do not pay for it.
+
+        OUTPUTS:
+        The method has no output: the labels, openings and 3BV are stored.
+        """
+
+        if self.labels is None and self.planes is not None:
+            mines, counts = self.planes
+            self.labels, self.openings, self.n_bbbv = label_openings(
+                mines, counts, self.n_rows, self.n_cols)
+
+    # checks if no tile of an opening is revealed or flagged
+    def opening_hidden(self, spans):
+        """
+        DESCRIPTION:
+        Checks if an opening found by find_opening is still fully hidden.
+        Only then does it hold exactly the tiles that a search from one of its
+        empty tiles would open: a flag that stopped an earlier search leaves
+        part of the opening hidden, also after the flag is removed.
+
+        PARAMETERS:
+        spans (array):  The start and stop indices of the rows of tiles of the
+                        opening.
+
+        OUTPUTS:
+        True when none of the tiles of the opening is revealed or flagged.
+        """
 
-        # selects tile
-        tile = self.board[row][col]
+        return not any(tile.revealed or tile.flagged
+                       for first, stop in zip(spans[::2], spans[1::2])
+                       for tile in self.tiles[first:stop])
 
-        # only reveals tiles that are neither revealed nor flagged
-        if not tile.revealed and not tile.flagged:
-            tile.revealed = True
+    # triggers the event handlers at the end of a move
+    def finish_move(self, changes, flagged=()):
+        """
+        DESCRIPTION:
+        Triggers the change event handlers and checks for game over, once per
+        move.
+
+        PARAMETERS:
+        changes (list): The tiles that were changed by the move.
+        flagged (list): The indices of the tiles of which the move changed the
+                        flag; default: none. Kept in self.flags_changed.
+
+        STRUCTURES:
+        If-statement:   Used to check if the move changed any tiles.
+        For-loop:       Used to trigger event handlers.
+
+        OUTPUTS:
+        The proper event handlers are triggered.
+        """
 
-            # reveals all surrounding tiles recursively if no mines are adjacent
-            if tile.number == 0:
-                for neighbour in self.adjacent(row, col):
-                    self.reveal(neighbour.row, neighbour.col)
+        self.flags_changed = list(flagged)
+        if changes:
+            for eventhandler in self.on_change:
+                eventhandler(changes)
 
-            # checks for game over after reveal
             self.game_over()
 
+    # triggers the move event handlers
+    def notify_move(self, action, row, col):
+        """
+        DESCRIPTION:
+        Triggers the move event handlers after a call of reveal, chord or flag,
+        so that every move can be recorded, also the moves that changed
+        nothing.
+
+        PARAMETERS:
+        action (str):   'reveal', 'chord' or 'flag'.
+        row (int):      The row coordinate of the move.
+        col (int):      The column coordinate of the move.
+
+        STRUCTURES:
+        For-loop:       Used to trigger event handlers.
+
+        OUTPUTS:
+        The move event handlers are triggered.
+        """
+
+        for eventhandler in self.on_move:
+            eventhandler(action, row, col)
+
     # creates mines on the board
     def lay_mines(self, start_row, start_col):
         """
         DESCRIPTION:
-        Randomly distributes mines over the board.
+        Randomly distributes mines over the board, outside of the safe square
+        around the first revealed tile. Only the positions of the mines are
+        sampled (see sample_mines), with the random number generator of the
+        game.
 
         PARAMETERS:
         start_row (int):    The row coordinate of the first revealed tile.
         start_col (int):    The column coordinate of the first revealed tile.
 
         STRUCTURES:
-        For-loop:   Used to make a set of all tiles on the board.
-        For-loop:   Used to place mines on some tiles.
+        For-loop:   Used to place mines on the sampled tiles.
 
         OUTPUTS:
         The method has no output: the Tile objects are modified directly.
         """
-        # creates set of all tiles
-        tiles = set()
-        for tile in self:
-            tiles.add(tile)
+        self.own_board()
+        for index in sample_mines(self.n_rows, self.n_cols, self.n_mines,
+                                  start_row, start_col, self.safe_radius,
+                                  self.rng):
+            self.tiles[index].is_mine = True
+
+    # places a pre-generated layout on the board
+    def place_layout(self, mines, counts):
+        """
+        DESCRIPTION:
+        Places a pre-generated layout on the board, instead of lay_mines and
+        assign_numbers.
+
+        PARAMETERS:
+        mines (bytes):  One byte per tile, row by row, that is 1 for a mine.
+        counts (bytes): One byte per tile with the amount of adjacent mines.
 
-        # removes tiles around starting position from the set of potential mines
-        tiles = tiles - self.adjacent(start_row, start_col, self.safe_radius)
+        STRUCTURES:
+        For-loop:   Used to go through all tiles.
 
-        # shuffles tiles
-        tiles = list(tiles)
-        random.shuffle(tiles)
+        OUTPUTS:
+        The method has no output: the Tile objects are modified directly.
+        """
+        self.own_board()
+        for tile, is_mine, number in zip(self.tiles, mines, counts):
+            tile.is_mine = bool(is_mine)
+            tile.number = number
 
-        # lays mines at the first list elements
-        for i in range(self.n_mines):
-            tiles[i].is_mine = True
+        self.planes = mines, counts
+        self.empty = self.labels = None
 
     # counts the amount of adjacent mines for each tile
     def assign_numbers(self):
         """
         DESCRIPTION:
-        Reveals a specified tile.
+        Counts the amount of adjacent mines for each tile. The counts of the
+        whole board are calculated at once by count_adjacent_mines, instead of
+        per tile with the adjacent method. The same counts are kept to find
+        the openings and the 3BV of the board later (see find_openings).
 
         PARAMETERS:
         No additional parameters aside from the MineSweeper attributes itself.
 
         STRUCTURES:
-        For-loop:       Used to go through all tiles.
-        For-loop:       Used to count the mines among adjacent tiles.
-        If-statement:   Used to check if a tile is a mine.
+        For-loop:       Used to go through all rows.
+        For-loop:       Used to give each tile of the row its count.
 
         OUTPUTS:
         The method has no output: the Tile objects are modified directly.
         """
-        for tile in self:
-            n_mines = 0
-            for neighbour in self.adjacent(tile.row, tile.col):
-                if neighbour.is_mine:
-                    n_mines += 1
+        self.own_board()
+        mines = bytes(tile.is_mine for row in self.board for tile in row)
+        counts = count_adjacent_mines(mines, self.n_rows, self.n_cols)
+
+        for i, row in enumerate(self.board):
+            start = i * self.n_cols
+            for tile, n_mines in zip(row, counts[start:start + self.n_cols]):
+                tile.number = n_mines
 
-            tile.number = n_mines
+        self.planes = mines, counts
+        self.empty = self.labels = None
 
     # toggles flag on specified tile
     def flag(self, row, col):
@@ -297,15 +1039,62 @@ class MineSweeper:
 
         STRUCTURES:
         If-statement:   Used to check if the tile is revealed.
+        If-statement:   Used to update the counter of flagged tiles.
 
         OUTPUTS:
-        The method has no output: the Tile object is modified directly.
+        The list of changed tiles: the flagged tile, or no tiles when it is
+        revealed. The Tile object and the counter of flagged tiles are modified
+        directly.
         """
-        tile = self.board[row][col]
+        # a game that has ended does not change any more
+        if self.status in ENDED:
+            return []
+
+        index = row * self.n_cols + col
+        changes = []
+
+        if self.toggle_flag(index):
+            changes = [self.tiles[index]]
+            self.flags_changed = [index]
+            for eventhandler in self.on_change:
+                eventhandler(changes)
+
+        self.notify_move('flag', row, col)
+
+        return changes
+
+    # toggles the flag of a tile without triggering event handlers
+    def toggle_flag(self, index):
+        """
+        DESCRIPTION:
+        Places or removes the flag of a hidden tile and updates the counter of
+        flagged tiles.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if the tile is revealed.
+
+        OUTPUTS:
+        True when the flag was changed, False when the tile is revealed.
+        """
+        tile = self.tiles[index]
+
+        # revealed tiles can not be flagged
+        if tile.revealed:
+            return False
+        tile = self.own_tile(index)
 
         # inverts flagged status of an unrevealed tile
-        if not tile.revealed:
-            tile.flagged = not tile.flagged
+        tile.flagged = not tile.flagged
+
+        if tile.flagged:
+            self.n_flagged += 1
+        else:
+            self.n_flagged -= 1
+
+        return True
 
     # checks if the game is over and triggers corresponding event handlers
     def game_over(self):
@@ -317,9 +1106,8 @@ class MineSweeper:
         No additional parameters aside from the MineSweeper attributes itself.
 
         STRUCTURES:
-        For-loop:       Used to go through all tiles.
-        If-statement:   Used to check if a tile is revealed.
-        If-statement:   Used to check if the revealed tile is a mine.
+        If-statement:   Used to check if the game has ended already, so the
+                        event handlers are triggered only once.
         If-statement:   Used to check if the player has lost. Loss is checked
                         before victory, because it can occur that both win and
                         loss are true. This happens when only one revealed tile
@@ -331,33 +1119,149 @@ class MineSweeper:
 
         OUTPUTS:
         The proper event handlers are triggered when this method determines that
-        the game is over.
+        the game is over, and the status is set to WON or LOST.
         """
-        loss = False
-        n_hidden = self.n_rows * self.n_cols
-
-        # goes through each tile
-        for tile in self:
+        if self.status in ENDED:
+            return
 
-            # checks if the tile is revealed
-            if tile.revealed:
-                n_hidden -= 1
-
-                # player loses if revealed tile is a mine
-                if tile.is_mine:
-                    loss = True
-
-        # player wins if the amount of hidden tiles equals the amount of mines
-        win = self.n_mines == n_hidden
-
-        if loss:
+        if self.n_mines_hit > 0:
+            self.status = LOST
             for eventhandler in self.on_loss:
                 eventhandler()
 
-        elif win:
+        elif self.n_hidden == self.n_mines:
+            self.status = WON
             for eventhandler in self.on_win:
                 eventhandler()
 
+    # sets the status from the counters
+    def update_status(self):
+        """
+        DESCRIPTION:
+        Sets the status from the counters of the game, without triggering
+        event handlers. Used after the counters were changed directly, for
+        instance when a game is loaded or a move is undone.
+
+        STRUCTURES:
+        If-statement:   Used to keep a game without mines PRISTINE.
+        If-statement:   Used to check for a loss before a win, like game_over.
+
+        OUTPUTS:
+        The method has no output: the status is modified directly.
+        """
+        if self.status == PRISTINE:
+            return
+
+        if self.n_mines_hit > 0:
+            self.status = LOST
+        elif self.n_hidden == self.n_mines:
+            self.status = WON
+        else:
+            self.status = PLAYING
+
+    # true before the first reveal
+    @property
+    def pristine(self):
+        """
+        DESCRIPTION:
+        Tells whether the mines still have to be laid. Setting it to False
+        when a layout was placed directly starts the game.
+
+        OUTPUTS:
+        True when the status is PRISTINE.
+        """
+        return self.status == PRISTINE
+
+    @pristine.setter
+    def pristine(self, value):
+        if value:
+            self.status = PRISTINE
+        elif self.status == PRISTINE:
+            self.status = PLAYING
+
+    # true when the game was won
+    @property
+    def won(self):
+        """
+        DESCRIPTION:
+        Tells whether the player has won, based on the status of the game.
+
+        OUTPUTS:
+        True when all safe tiles were revealed without revealing a mine.
+        """
+        return self.status == WON
+
+    # true when the game was lost
+    @property
+    def lost(self):
+        """
+        DESCRIPTION:
+        Tells whether the player has lost, based on the status of the game.
+
+        OUTPUTS:
+        True when a mine was revealed.
+        """
+        return self.status == LOST
+
+    # amount of flags the player can still place
+    @property
+    def flags_left(self):
+        """
+        DESCRIPTION:
+        Returns the amount of flags that still need to be placed, based on the
+        counter of flagged tiles.
+
+        OUTPUTS:
+        The amount of mines minus the amount of flagged tiles.
+        """
+        return self.n_mines - self.n_flagged
+
+    # amount of openings of the board
+    @property
+    def n_openings(self):
+        """
+        DESCRIPTION:
+        Returns the amount of openings: the regions of connected empty tiles
+        that are each opened by one click.
+
+        OUTPUTS:
+        The amount of openings, 0 before the mines are laid.
+        """
+        self.find_openings()
+        return len(self.openings)
+
+    # 3BV of the board
+    @property
+    def bbbv(self):
+        """
+        DESCRIPTION:
+        Returns the 3BV of the board: the least amount of clicks that solve
+        it (see label_openings).
+
+        OUTPUTS:
+        The 3BV, 0 before the mines are laid.
+        """
+        self.find_openings()
+        return self.n_bbbv
+
+    # 3BV per second
+    def efficiency(self, seconds):
+        """
+        DESCRIPTION:
+        Returns the 3BV per second of a game: the least amount of clicks that
+        solve the board, divided by the time the player needed.
+
+        PARAMETERS:
+        seconds (float):    The time the game took.
+
+        OUTPUTS:
+        The 3BV per second, or 0.0 when no time has passed.
+        """
+        if seconds <= 0:
+            return 0.0
+
+        return self.bbbv / seconds
+
     # resets n for iteration start
     def __iter__(self):
         '''
@@ -466,6 +1370,9 @@ class Tile:
         self.revealed = False
         self.flagged = False
 
+        # the game that may change the tile, see MineSweeper.copy_board
+        self.owner = None
+
     # string representation of tile
     def __repr__(self):
         """
@@ -507,3 +1414,364 @@ class Tile:
             text = '$'
 
         return text
+
+
+###########################################
+################# Functions ###############
+###########################################
+# counts the adjacent mines of all tiles at once
+def count_adjacent_mines(mines, n_rows, n_cols):
+    """
+    DESCRIPTION:
+    Counts the amount of mines in the 3 x 3 square around every tile (the
+    tile itself included, like MineSweeper.adjacent). The board is turned
+    into one large integer with one byte per tile, so that the sum of the
+    mine mask shifted one tile in each direction can be calculated with a
+    few integer operations instead of a loop over all tiles. The bytes never
+    overflow, because a count is at most 9.
+
+    PARAMETERS:
+    mines (bytes):  One byte per tile, row by row, that is 1 for a mine and
+                    0 for a tile without a mine.
+    n_rows (int):   The vertical size of the board.
+    n_cols (int):   The horizontal size of the board.
+
+    STRUCTURES:
+    Bit masks:      Used to keep tiles in the first and last column from
+                    counting the mines at the other side of the board.
+
+    OUTPUTS:
+    The bytes with the amount of adjacent mines of each tile, row by row.
+    """
+    n_tiles = n_rows * n_cols
+    board = int.from_bytes(mines, 'little')
+
+    # masks that remove the tiles that would wrap around to the next row
+    not_first = int.from_bytes((b'\x00' + b'\xff' * (n_cols - 1)) * n_rows,
+                               'little')
+    not_last = int.from_bytes((b'\xff' * (n_cols - 1) + b'\x00') * n_rows,
+                              'little')
+
+    # sums of each tile and its left and right neighbour
+    rows = board + ((board << 8) & not_first) + ((board >> 8) & not_last)
+
+    # sums of the row sums above, at and below each tile
+    row_bits = 8 * n_cols
+    counts = rows + (rows << row_bits) + (rows >> row_bits)
+    counts &= (1 << 8 * n_tiles) - 1
+
+    return counts.to_bytes(n_tiles, 'little')
+
+
+# precomputes the neighbours of the tiles of a board
+def neighbour_table(n_rows, n_cols):
+    """
+    DESCRIPTION:
+    Precomputes where the neighbours of each tile are. Tiles are numbered row
+    by row, so the neighbour of a tile is always at the same difference in
+    index, unless the tile is at the edge of the board. Each tile therefore
+    only needs to know which edges it touches, which is stored in one byte.
+
+    PARAMETERS:
+    n_rows (int):   The vertical size of the board.
+    n_cols (int):   The horizontal size of the board.
+
+    STRUCTURES:
+    For-loop:       Used to make the tuple of index differences for each
+                    combination of edges.
+
+    OUTPUTS:
+    1.  A bytearray with the TOP/BOTTOM/LEFT/RIGHT bits of each tile.
+    2.  A list of 16 tuples, one for each combination of those bits, with the
+        index differences of the neighbours (not the tile itself).
+    """
+    row = bytearray(n_cols)
+    row[0] |= LEFT
+    row[-1] |= RIGHT
+
+    border = bytearray(row * n_rows)
+    border[:n_cols] = bytes(bits | TOP for bits in border[:n_cols])
+    border[-n_cols:] = bytes(bits | BOTTOM for bits in border[-n_cols:])
+
+    deltas = []
+    for bits in range(16):
+        deltas += [tuple(
+            i * n_cols + j
+            for i in (-1, 0, 1)
+            for j in (-1, 0, 1)
+            if (i or j)
+            and not (i == -1 and bits & TOP or i == 1 and bits & BOTTOM
+                     or j == -1 and bits & LEFT or j == 1 and bits & RIGHT))]
+
+    return border, deltas
+
+
+# finds the openings of a board and its 3BV
+def label_openings(mines, counts, n_rows, n_cols):
+    """
+    DESCRIPTION:
+    Finds the openings of a board: every region of connected empty tiles
+    (tiles without adjacent mines) together with the numbered tiles around
+    it, which are all revealed by one click on any of its empty tiles. Also
+    returns the 3BV of the board, the least amount of clicks that reveal all
+    tiles without a mine: one per opening, plus one per numbered tile that is
+    not in an opening.
+
+    The empty tiles are not searched one by one: every row is split into runs
+    of empty tiles by a regular expression, and runs that touch a run in the
+    row above (also diagonally) are joined with union-find. The tiles of an
+    opening are then the three rows around each of its runs, one tile wider
+    on both sides. The numbered tiles that are not in an opening are counted
+    with count_adjacent_mines, as the tiles without an empty tile around them.
+
+    PARAMETERS:
+    mines (bytes):  One byte per tile, row by row, that is 1 for a mine.
+    counts (bytes): The counts of count_adjacent_mines, which are 0 only for
+                    empty tiles, because a mine counts itself.
+    n_rows (int):   The vertical size of the board.
+    n_cols (int):   The horizontal size of the board.
+
+    STRUCTURES:
+    For-loop:       Used to find the runs of every row and join them with the
+                    runs of the row above.
+    While-loop:     Used to skip the runs above that end before a run starts.
+    For-loop:       Used to collect the rows of tiles of the openings from
+                    their runs.
+
+    OUTPUTS:
+    1.  An array with the label of the opening of every empty tile, which is
+        its position in the list of openings, and -1 for other tiles.
+    2.  A list with an array per opening of the start and stop indices of its
+        rows of tiles: [start, stop, start, stop, ...]. A tile can be in more
+        than one row of tiles.
+    3.  The 3BV of the board.
+    """
+    counts = bytes(counts)
+    runs = []
+    parent = []
+
+    # finds the first run of a group, and shortens the path to it
+    def find(run):
+        while parent[run] != run:
+            parent[run] = parent[parent[run]]
+            run = parent[run]
+        return run
+
+    above = []
+    for i in range(n_rows):
+        offset = i * n_cols
+        current = []
+        first = 0
+        for match in ZERO_RUN.finditer(counts, offset, offset + n_cols):
+            start, stop = match.start() - offset, match.end() - offset
+            run = len(runs)
+            runs += [(i, start, stop)]
+            parent += [run]
+            current += [run]
+
+            # the runs above that end before this run starts can not touch
+            # the next runs either
+            while first < len(above) and runs[above[first]][2] < start:
+                first += 1
+
+            for other in above[first:]:
+                if runs[other][1] > stop:
+                    break
+                root, other_root = find(run), find(other)
+                if root != other_root:
+                    parent[max(root, other_root)] = min(root, other_root)
+
+        above = current
+
+    labels = array('i', [-1]) * len(counts)
+    groups = {}
+    openings = []
+    for run, (i, start, stop) in enumerate(runs):
+        root = find(run)
+        label = groups.get(root)
+        if label is None:
+            label = groups[root] = len(openings)
+            openings += [array('i')]
+
+        offset = i * n_cols
+        labels[offset + start:offset + stop] = array('i', [label]) * (stop -
+                                                                      start)
+
+        # the run one tile wider on both sides, in the row above, the row
+        # itself and the row below
+        first = offset + start - (start > 0)
+        width = offset + stop + (stop < n_cols) - first
+        top = first - n_cols if i > 0 else first
+        bottom = first + n_cols if i < n_rows - 1 else first
+        for first in range(top, bottom + 1, n_cols):
+            openings[label].extend((first, first + width))
+
+    # the numbered tiles that are in no opening have no empty neighbour, and
+    # neither have the mines
+    empty = counts.translate(EMPTY_BITS)
+    n_lonely = count_adjacent_mines(empty, n_rows, n_cols).count(0)
+    bbbv = len(openings) + n_lonely - bytes(mines).count(1)
+
+    return labels, openings, bbbv
+
+
+# finds the opening of one empty tile
+def find_opening(empty, n_rows, n_cols, index):
+    """
+    DESCRIPTION:
+    Finds the opening of one empty tile, in the same form as label_openings,
+    without going through the rest of the board. The runs of empty tiles are
+    followed from row to row: the ends of a run are found with find and rfind
+    on the bytes of the empty tiles, and the runs in the rows above and below
+    a run with find, so the time depends on the amount of runs in the opening
+    and not on its size.
+
+    PARAMETERS:
+    empty (bytes):  One byte per tile, row by row, that is 1 for a tile
+                    without adjacent mines.
+    n_rows (int):   The vertical size of the board.
+    n_cols (int):   The horizontal size of the board.
+    index (int):    The index (row * n_cols + col) of an empty tile.
+
+    STRUCTURES:
+    While-loop:     Used to visit the runs of the opening from a stack.
+    For-loop:       Used to collect the rows of tiles around a run.
+    For-loop:       Used to look for runs in the rows above and below a run.
+    While-loop:     Used to find every run that touches the run.
+
+    OUTPUTS:
+    An array with the start and stop indices of the rows of tiles of the
+    opening: [start, stop, start, stop, ...]. A tile can be in more than one
+    row of tiles.
+    """
+
+    # returns the start and stop index of the run through an empty tile
+    def run_at(position):
+        offset = position - position % n_cols
+        start = empty.rfind(0, offset, position) + 1 or offset
+        stop = empty.find(0, position, offset + n_cols)
+        return start, stop if stop >= 0 else offset + n_cols
+
+    spans = array('i')
+    stack = [run_at(index)]
+    seen = {stack[0][0]}
+
+    while stack:
+        start, stop = stack.pop()
+        row, col = divmod(start, n_cols)
+
+        # the run one tile wider on both sides, in the row above, the row
+        # itself and the row below
+        first = start - (col > 0)
+        width = stop + (stop % n_cols != 0) - first
+        for i in range(max(row - 1, 0), min(row + 2, n_rows)):
+            offset = first + (i - row) * n_cols
+            spans.extend((offset, offset + width))
+
+            if i == row:
+                continue
+
+            position = empty.find(1, offset, offset + width)
+            while position >= 0:
+                run = run_at(position)
+                if run[0] not in seen:
+                    seen.add(run[0])
+                    stack += [run]
+                position = empty.find(1, run[1], offset + width)
+
+    return spans
+
+
+# creates the random number generator of a game
+def make_rng(seed=None):
+    """
+    DESCRIPTION:
+    Turns the seed of a game into a random number generator.
+
+    PARAMETERS:
+    seed:   None for an unpredictable game, an int seed, or a random.Random
+            object or NumPy Generator that is used as it is.
+
+    STRUCTURES:
+    If-statement:   Used to check if the seed already is a generator.
+
+    OUTPUTS:
+    A random.Random object or the given generator.
+    """
+    if seed is None or isinstance(seed, int):
+        return random.Random(seed)
+
+    return seed
+
+
+# samples the positions of the mines outside of the safe square
+def sample_mines(n_rows, n_cols, n_mines, start_row, start_col, safe_radius,
+                 rng):
+    """
+    DESCRIPTION:
+    Samples the indices of the mines of a board without building a list of
+    all tiles. The tiles outside of the safe square are numbered 0 to n_free,
+    only n_mines of those numbers are sampled, and each number is then turned
+    into the index of its tile by skipping the safe square.
+
+    PARAMETERS:
+    n_rows (int):       The vertical size of the board.
+    n_cols (int):       The horizontal size of the board.
+    n_mines (int):      The amount of mines to be laid.
+    start_row (int):    The row coordinate of the first revealed tile.
+    start_col (int):    The column coordinate of the first revealed tile.
+    safe_radius (int):  The square radius around the first revealed tile where
+                        no mines are laid.
+    rng:                A random.Random object or a NumPy Generator.
+
+    STRUCTURES:
+    If-statement:   Used to check if there is room for all mines.
+    If-statement:   Used to check if the generator is a NumPy Generator.
+    For-loop:       Used to turn the sampled numbers into tile indices.
+
+    OUTPUTS:
+    A list with the indices of the mines, the index of a tile being
+    row * n_cols + col.
+    """
+    # rows and columns of the safe square, cut off at the edges of the board
+    top = max(start_row - safe_radius, 0)
+    bottom = min(start_row + safe_radius + 1, n_rows)
+    left = max(start_col - safe_radius, 0)
+    right = min(start_col + safe_radius + 1, n_cols)
+
+    width = right - left
+    n_free = n_rows * n_cols - (bottom - top) * width
+
+    if not 0 <= n_mines <= n_free:
+        raise ValueError('can not lay %d mines: only %d tiles are outside of '
+                         'the safe square' % (n_mines, n_free))
+
+    if isinstance(rng, random.Random):
+        numbers = rng.sample(range(n_free), n_mines)
+    else:
+        numbers = rng.choice(n_free, size=n_mines, replace=False).tolist()
+
+    # amount of free tiles above and beside the safe square
+    above = top * n_cols
+    free_per_row = n_cols - width
+    beside = (bottom - top) * free_per_row
+
+    mines = []
+    for number in numbers:
+
+        # tile above the safe square
+        if number < above:
+            mines += [number]
+
+        # tile to the left or right of the safe square
+        elif number < above + beside:
+            row, col = divmod(number - above, free_per_row)
+            if col >= left:
+                col += width
+            mines += [(top + row) * n_cols + col]
+
+        # tile below the safe square
+        else:
+            mines += [bottom * n_cols + number - above - beside]
+
+    return mines
@@ -0,0 +1,178 @@
+"""
+README:
+This script contains ONE class definition, History, which gives a Mine
+Sweeper game undo and redo. It does not keep copies of the board: it keeps
+the tiles that every move changed, and undoes a move by changing those tiles
+back, so undoing or redoing a move costs time in proportion to the tiles it
+changed.
+"""
+
+
+###########################################
+################ History ##################
+###########################################
+class History:
+    """
+    DESCRIPTION:
+    The History adds itself to the on_change event handlers of a game and
+    keeps the changes of every move: the indices of the tiles that it opened
+    and of the tiles of which it toggled the flag. undo closes the opened
+    tiles and toggles the flags again and puts the counters of the game back;
+    redo does the move again from the kept changes. A new move forgets the
+    moves that were undone. A sequence of moves made by apply_moves is one
+    move.
+
+    PARAMETERS:
+    game:           The MineSweeper or PackedMineSweeper object, or a clone
+                    of one.
+
+    METHODS:
+    __init__(self, game): Initialises the class.
+    record(self, changes): Keeps the changes of a move.
+    undo(self):     Undoes the last move.
+    redo(self):     Does the last undone move again.
+    apply(self, move, forward): Changes the tiles of a move.
+    can_undo, can_redo: Properties that are True when there is a move to
+                    undo or redo.
+
+    LIMITATIONS:
+    1.  The mines stay where they are when the first reveal is undone.
+    2.  undo and redo do not trigger the event handlers of the game, so other
+        objects that follow the game, like a Solver, do not see them. The
+        changed tiles are returned, so the board can be redrawn.
+
+    OUTPUT:
+    The History object.
+    """
+
+    def __init__(self, game):
+        """
+        This method initialises the attributes of the class:
+        self.done:      List of the moves that can be undone, the last move
+                        last. A move is a (flagged, opened) tuple of lists of
+                        indices.
+        self.undone:    List of the moves that can be redone.
+        """
+
+        self.game = game
+        self.done = []
+        self.undone = []
+
+        game.on_change += [self.record]
+
+    def record(self, changes):
+        """
+        DESCRIPTION:
+        Keeps the changes of a move. The revealed tiles in the changes are the
+        opened tiles. The flags are taken from the flags_changed of the game,
+        because a sequence of apply_moves may remove a flag and then reveal
+        the tile, which must be flagged again when the move is undone.
+
+        PARAMETERS:
+        changes (list): The tiles that were changed by the move.
+
+        STRUCTURES:
+        For-loop:       Used to find the opened tiles.
+
+        OUTPUT:
+        None.
+        """
+
+        n_cols = self.game.n_cols
+        flagged = list(self.game.flags_changed)
+        opened = []
+        for tile in changes:
+            if tile.revealed:
+                opened += [tile.row * n_cols + tile.col]
+
+        self.done += [(flagged, opened)]
+        self.undone.clear()
+
+    def undo(self):
+        """
+        DESCRIPTION:
+        Undoes the last move.
+
+        OUTPUT:
+        The list of tiles that were changed, empty when there was no move.
+        """
+
+        if not self.done:
+            return []
+
+        move = self.done.pop()
+        self.undone += [move]
+        return self.apply(move, False)
+
+    def redo(self):
+        """
+        DESCRIPTION:
+        Does the last undone move again.
+
+        OUTPUT:
+        The list of tiles that were changed, empty when there was no move.
+        """
+
+        if not self.undone:
+            return []
+
+        move = self.undone.pop()
+        self.done += [move]
+        return self.apply(move, True)
+
+    def apply(self, move, forward):
+        """
+        DESCRIPTION:
+        Changes the tiles of a move and the counters of the game: forward
+        opens the tiles, otherwise they are closed. The flags are toggled
+        either way. The status of the game follows the counters, so a game
+        whose last move is undone can be played on. The tiles are taken from
+        own_tile, so undoing a move of a clone does not change the game it was
+        cloned from.
+
+        PARAMETERS:
+        move (tuple):   The (flagged, opened) tuple of the move.
+        forward (bool): True to do the move, False to undo it.
+
+        STRUCTURES:
+        For-loop:       Used to toggle the flags.
+        For-loop:       Used to change the opened tiles.
+
+        OUTPUT:
+        The list of changed tiles.
+        """
+
+        game = self.game
+        flagged, opened = move
+
+        for index in flagged:
+            tile = game.own_tile(index)
+            tile.flagged = not tile.flagged
+            game.n_flagged += 1 if tile.flagged else -1
+
+        sign = -1 if forward else 1
+        for index in opened:
+            tile = game.own_tile(index)
+            tile.revealed = forward
+            if tile.is_mine:
+                game.n_mines_hit -= sign
+        game.n_hidden += sign * len(opened)
+        game.update_status()
+
+        return [game.tiles[index] for index in flagged + opened]
+
+    @property
+    def can_undo(self):
+        """
+        True when there is a move to undo.
+        """
+
+        return bool(self.done)
+
+    @property
+    def can_redo(self):
+        """
+        True when there is a move to redo.
+        """
+
+        return bool(self.undone)
@@ -0,0 +1,398 @@
+"""
+README:
+This script records the moves of a Mine Sweeper game and plays them back. It
+contains TWO class definitions, MoveLog, which appends every reveal, chord
+and flag of a game to a compact log, and Replayer, which jumps to any move of
+a log. It also contains the functions encode_varint and decode_varints.
+
+The log starts with a header: the MAGIC bytes, the VERSION and the size of
+the board, the amount of mines, the safe radius and the seed as varints.
+After the header every move is ONE varint, (row * n_cols + col) * 4 + action,
+with action 0 for reveal, 1 for flag and 2 for chord, so a move on a board of
+up to 32 x 32 tiles takes two bytes. A game without a seed, or with a pool,
+can not lay its mines again; the record LAYOUT is then written after the move
+that laid the mines, followed by the mines with one bit per tile.
+
+ADDITIONAL PACKAGES:
+engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine
+storage:    A module made to save games, used to pack the mines into bits
+"""
+
+from src.engine import ACTIONS, count_adjacent_mines
+from src.packed import PackedMineSweeper
+from src.storage import pack_bits, planes, unpack_bits
+
+MAGIC = b'MSWL'
+VERSION = 1
+
+# the code of the record that holds the mines
+LAYOUT = 3
+
+
+###########################################
+################# MoveLog #################
+###########################################
+class MoveLog:
+    """
+    DESCRIPTION:
+    The MoveLog adds itself to the on_move event handlers of a game and
+    appends every move to the log. The log is kept in memory, and is also
+    appended to a file when a path is given; the file is buffered, so call
+    flush or close to write the last moves.
+
+    PARAMETERS:
+    game:           The MineSweeper or PackedMineSweeper object that is
+                    recorded. No move may have been made yet.
+    path (str):     Optional file to append the log to.
+
+    METHODS:
+    __init__(self, game, path): Initialises the class.
+    record(self, action, row, col): Appends a move to the log.
+    write(self, data): Appends bytes to the log.
+    flush(self):    Writes the buffered moves to the file.
+    close(self):    Stops recording and closes the file.
+    __len__(self):  Returns the amount of recorded moves.
+
+    LIMITATIONS:
+    1.  Only the moves made after the MoveLog was created are recorded, so a
+        game that is already being played can not be recorded.
+    2.  The seed is only used to lay the mines again when it is an int that
+        fits in 64 bits; otherwise the mines are written to the log.
+
+    OUTPUT:
+    The MoveLog object.
+    """
+
+    def __init__(self, game, path=None):
+        """
+        This method initialises the attributes of the class:
+        self.data:      bytearray with the whole log.
+        self.file:      The file the log is appended to, or None.
+        self.n_moves:   The amount of recorded moves.
+        self.needs_layout: True when the mines must be written to the log
+                        after the move that lays them.
+        """
+
+        if not game.pristine:
+            raise ValueError('the moves of a game can only be recorded from '
+                             'the start')
+
+        self.game = game
+        self.n_moves = 0
+        has_seed = (game.seed is not None and game.pool is None
+                    and -2 ** 63 <= game.seed < 2 ** 63)
+        self.needs_layout = not has_seed
+
+        self.data = bytearray(MAGIC)
+        self.data.append(VERSION)
+        for value in (game.n_rows, game.n_cols, game.n_mines,
+                      game.safe_radius, int(has_seed)):
+            self.data += encode_varint(value)
+        if has_seed:
+            # zigzag encoding, so negative seeds stay short
+            self.data += encode_varint(game.seed << 1 ^ game.seed >> 63)
+
+        self.file = None
+        if path is not None:
+            self.file = open(path, 'wb')
+            self.file.write(self.data)
+
+        game.on_move += [self.record]
+
+    def record(self, action, row, col):
+        """
+        DESCRIPTION:
+        Appends a move to the log, and the mines after the move that laid
+        them, when they can not be laid again from the seed.
+
+        PARAMETERS:
+        action (str):   'reveal', 'flag' or 'chord'.
+        row (int):      The row coordinate of the move.
+        col (int):      The column coordinate of the move.
+
+        OUTPUT:
+        None.
+        """
+
+        game = self.game
+        data = encode_varint((row * game.n_cols + col) * 4
+                             + ACTIONS.index(action))
+
+        if self.needs_layout and not game.pristine:
+            self.needs_layout = False
+            data += encode_varint(LAYOUT) + pack_bits(planes(game)[0])
+
+        self.n_moves += 1
+        self.write(data)
+
+    def write(self, data):
+        """
+        Appends bytes to the log in memory and to the file.
+        """
+
+        self.data += data
+        if self.file is not None:
+            self.file.write(data)
+
+    def flush(self):
+        """
+        Writes the buffered moves to the file.
+        """
+
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self):
+        """
+        Stops recording the game and closes the file.
+        """
+
+        if self.record in self.game.on_move:
+            self.game.on_move.remove(self.record)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __len__(self):
+        """
+        Returns the amount of recorded moves.
+        """
+
+        return self.n_moves
+
+
+###########################################
+################ Replayer #################
+###########################################
+class Replayer:
+    """
+    DESCRIPTION:
+    The Replayer reads a log made by the MoveLog and plays its moves on a
+    PackedMineSweeper game. Every checkpoint_interval moves it keeps a copy of
+    the state of the tiles, so seek(k) only restores the nearest checkpoint
+    at or before move k and plays the moves after it. Checkpoints are made
+    the first time a seek passes them, so opening a long log is fast.
+
+    PARAMETERS:
+    source:         The log as bytes, or the path of a log file.
+    checkpoint_interval (int): The amount of moves between two checkpoints;
+                    default: 1024.
+
+    METHODS:
+    __init__(self, source, checkpoint_interval): Initialises the class.
+    seek(self, k):  Plays the game until move k and returns it.
+    checkpoint(self): Returns a copy of the state of the game.
+    restore(self, checkpoint): Puts the state of a checkpoint back.
+    __len__(self):  Returns the amount of moves in the log.
+    __getitem__(self, k): Returns move k as an (action, row, col) tuple.
+
+    LIMITATIONS:
+    1.  A checkpoint holds one byte per tile, so on large boards a smaller
+        interval costs a lot of memory.
+    2.  The moves are played without the event handlers of the recorded game,
+        so the game is only as far as the engine itself keeps track of.
+
+    OUTPUT:
+    The Replayer object.
+    """
+
+    def __init__(self, source, checkpoint_interval=1024):
+        """
+        This method initialises the attributes of the class:
+        self.game:      The PackedMineSweeper game the moves are played on.
+        self.moves:     List of the move codes, (index * 4 + action).
+        self.position:  The amount of moves that have been played.
+        self.checkpoints: List of (state, n_hidden, n_flagged, n_mines_hit)
+                        tuples, one per checkpoint_interval moves.
+        """
+
+        if isinstance(source, (bytes, bytearray)):
+            data = bytes(source)
+        else:
+            with open(source, 'rb') as file:
+                data = file.read()
+
+        if data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError('not a move log of version %d' % VERSION)
+
+        values, pos = decode_varints(data, 5, 5)
+        n_rows, n_cols, n_mines, safe_radius, has_seed = values
+        seed = None
+        if has_seed:
+            (zigzag,), pos = decode_varints(data, pos, 1)
+            seed = zigzag >> 1 ^ -(zigzag & 1)
+
+        self.n_cols = n_cols
+        self.checkpoint_interval = checkpoint_interval
+        self.game = PackedMineSweeper(n_rows, n_cols, n_mines, safe_radius)
+
+        # the moves, and the mines when they were written to the log
+        n_bytes = (n_rows * n_cols + 7) // 8
+        self.moves = []
+        mines = None
+        while pos < len(data):
+            (code,), pos = decode_varints(data, pos, 1)
+            if code == LAYOUT:
+                mines = unpack_bits(data[pos:pos + n_bytes], n_rows * n_cols)
+                pos += n_bytes
+            else:
+                self.moves += [code]
+
+        # without the mines in the log they are laid again from the seed by
+        # the first reveal; a flag or a chord before it lays no mines
+        if mines is None and seed is not None:
+            reveal = ACTIONS.index('reveal')
+            first = next((code for code in self.moves if code & 3 == reveal),
+                         None)
+            if first is not None:
+                game = PackedMineSweeper(n_rows, n_cols, n_mines, safe_radius,
+                                         seed=seed)
+                game.reveal(*divmod(first >> 2, n_cols))
+                mines = planes(game)[0]
+
+        if mines is not None:
+            self.game.place_layout(mines,
+                                   count_adjacent_mines(mines, n_rows, n_cols))
+            self.game.pristine = False
+
+        self.position = 0
+        self.checkpoints = [self.checkpoint()]
+
+    def seek(self, k):
+        """
+        DESCRIPTION:
+        Plays the game until the first k moves have been made. When the game
+        is not already between the nearest checkpoint and move k, that
+        checkpoint is restored first.
+
+        PARAMETERS:
+        k (int):        The amount of moves to play, at most len(self).
+
+        STRUCTURES:
+        For-loop:       Used to play the moves after the checkpoint and to
+                        make the checkpoints that are passed.
+
+        OUTPUT:
+        The PackedMineSweeper game after move k.
+        """
+
+        k = max(0, min(k, len(self.moves)))
+        interval = self.checkpoint_interval
+        nearest = min(k // interval, len(self.checkpoints) - 1)
+
+        if not nearest * interval <= self.position <= k:
+            self.restore(self.checkpoints[nearest])
+            self.position = nearest * interval
+
+        game = self.game
+        n_cols = self.n_cols
+        for position in range(self.position, k):
+            code = self.moves[position]
+            getattr(game, ACTIONS[code & 3])(*divmod(code >> 2, n_cols))
+
+            if (position + 1) % interval == 0 and \
+                    (position + 1) // interval == len(self.checkpoints):
+                self.checkpoints += [self.checkpoint()]
+
+        self.position = k
+        return game
+
+    def checkpoint(self):
+        """
+        Returns the (state, n_hidden, n_flagged, n_mines_hit) tuple of the
+        game.
+        """
+
+        game = self.game
+        return (bytes(game.state), game.n_hidden, game.n_flagged,
+                game.n_mines_hit)
+
+    def restore(self, checkpoint):
+        """
+        Puts the state of a checkpoint back in the game.
+        """
+
+        game = self.game
+        state, game.n_hidden, game.n_flagged, game.n_mines_hit = checkpoint
+        game.state = bytearray(state)
+        game.state_shared = False
+        game.update_status()
+
+    def __len__(self):
+        """
+        Returns the amount of moves in the log.
+        """
+
+        return len(self.moves)
+
+    def __getitem__(self, k):
+        """
+        Returns move k as an (action, row, col) tuple.
+        """
+
+        code = self.moves[k]
+        return (ACTIONS[code & 3],) + divmod(code >> 2, self.n_cols)
+
+
+###########################################
+################ Functions ################
+###########################################
+# encodes a number as a varint
+def encode_varint(value):
+    """
+    DESCRIPTION:
+    Encodes a number that is 0 or more in seven bits per byte, the lowest
+    bits first; the highest bit of a byte is set when another byte follows.
+
+    PARAMETERS:
+    value (int):    The number.
+
+    STRUCTURES:
+    While-loop:     Used to take seven bits at a time.
+
+    OUTPUT:
+    The bytes of the varint.
+    """
+
+    data = bytearray()
+    while value > 0x7F:
+        data.append(value & 0x7F | 0x80)
+        value >>= 7
+    data.append(value)
+    return bytes(data)
+
+
+# decodes a number of varints
+def decode_varints(data, pos, count):
+    """
+    DESCRIPTION:
+    Decodes varints made by encode_varint.
+
+    PARAMETERS:
+    data (bytes):   The encoded bytes.
+    pos (int):      The position of the first varint.
+    count (int):    The amount of varints to decode.
+
+    STRUCTURES:
+    For-loop:       Used to decode the varints.
+    While-loop:     Used to read the bytes of a varint.
+
+    OUTPUT:
+    A (values, pos) tuple: the list of numbers and the position after the
+    last varint.
+    """
+
+    values = []
+    for _ in range(count):
+        value = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        values += [value]
+
+    return values, pos
@@ -0,0 +1,296 @@
+"""
+README:
+This script contains ONE class definition, NoGuessGenerator, which makes
+boards that can be solved from the first revealed tile without guessing. It
+also contains the functions generate_no_guess, which makes one such board by
+moving the mines that block the Solver, and solve_layout, which plays a
+layout with the Solver.
+
+ADDITIONAL PACKAGES:
+multiprocessing:    A python library, its Event tells the workers to stop
+                    when another worker found a board.
+random:             A python library used to randomly distribute the mines.
+time:               A python library used to keep to the time budget.
+concurrent.futures: A python library used to generate boards in worker
+                    processes.
+engine:             A module made to run the minesweeper game
+solver:             A module made to derive the safe tiles and the mines
+probability:        A module made to compute the chance of a mine per tile
+"""
+
+import multiprocessing
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from src.engine import MineSweeper, count_adjacent_mines, sample_mines
+from src.probability import ProbabilityEngine
+from src.solver import MINE, SAFE, Solver, UNKNOWN
+
+# set in every worker process by set_stop_event
+stop_event = None
+
+
+###########################################
+############ NoGuessGenerator #############
+###########################################
+class NoGuessGenerator:
+    """
+    DESCRIPTION:
+    The NoGuessGenerator gives a MineSweeper object a board that can be
+    solved by deduction alone. It has the take method of the BoardPool, so it
+    is passed to the MineSweeper as its pool: at the first reveal, several
+    worker processes each make a board with another seed, and the first board
+    that is found is used. The other workers are then told to stop.
+
+    PARAMETERS:
+    workers (int):  The amount of worker processes; default: all cores.
+    time_budget (float): The maximum amount of seconds that take waits for a
+                    board; default: 2.0.
+    seed:           Optional seed of the seeds given to the workers.
+
+    METHODS:
+    __init__(self, workers, time_budget, seed): Initialises the class.
+    take(self, rows, cols, mines, safe_radius, row, col): Returns a board
+                    without guesses for the first revealed tile, or None.
+    close(self):    Stops the worker processes.
+
+    LIMITATIONS:
+    1.  The boards are not equally likely: mines that block the Solver are
+        moved away from the opened area, so the mines of a no-guess board are
+        more often in the last part of the board to be solved.
+    2.  When no board is found within the time budget, take returns None and
+        the game lays its mines as usual, so that game may need a guess.
+    3.  take waits for the workers, so the first click of a large board takes
+        longer than without this generator.
+
+    OUTPUT:
+    The NoGuessGenerator object.
+    """
+
+    def __init__(self, workers=None, time_budget=2.0, seed=None):
+        """
+        This method initialises the attributes of the class:
+        self.executor:  The pool of worker processes, started at the first
+                        take and kept for the next games.
+        self.stop:      The Event that tells the workers to stop.
+        """
+
+        self.workers = workers or multiprocessing.cpu_count()
+        self.time_budget = time_budget
+        self.rng = random.Random(seed)
+        self.executor = None
+        self.stop = None
+
+    def take(self, rows, cols, mines, safe_radius, row, col):
+        """
+        DESCRIPTION:
+        Lets every worker make a board for the first revealed tile and returns
+        the first one that is found. The other workers are stopped.
+
+        PARAMETERS:
+        rows, cols, mines, safe_radius: The configuration of the board.
+        row (int):      The row coordinate of the first revealed tile.
+        col (int):      The column coordinate of the first revealed tile.
+
+        STRUCTURES:
+        For-loop:       Used to give every worker its own seed.
+        While-loop:     Used to wait for the workers until one finds a board,
+                        all give up or the time budget is spent.
+
+        OUTPUT:
+        A (mines, counts) tuple of bytearrays as made by generate_layout of
+        pool.py, or None.
+        """
+
+        if self.executor is None:
+            self.stop = multiprocessing.Event()
+            self.executor = ProcessPoolExecutor(
+                self.workers, initializer=set_stop_event,
+                initargs=(self.stop,))
+
+        self.stop.clear()
+        deadline = time.time() + self.time_budget
+        pending = {self.executor.submit(generate_no_guess, rows, cols, mines,
+                                        safe_radius, row, col,
+                                        self.rng.getrandbits(32), deadline)
+                   for _ in range(self.workers)}
+
+        layout = None
+        while pending and layout is None:
+            done, pending = wait(pending, max(deadline - time.time(), 0),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.result() is not None:
+                    layout = future.result()
+                    break
+
+        # the workers that are still busy stop at their next check
+        self.stop.set()
+        for future in pending:
+            future.cancel()
+
+        if layout is None:
+            return None
+
+        mine_bytes = bytearray(layout)
+        return mine_bytes, bytearray(count_adjacent_mines(mine_bytes,
+                                                          rows, cols))
+
+    def close(self):
+        """
+        Stops the worker processes.
+        """
+
+        if self.executor is not None:
+            self.stop.set()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+###########################################
+################ Functions ################
+###########################################
+# stores the stop event in a worker process
+def set_stop_event(event):
+    """
+    The initializer of the worker processes: keeps the Event that tells them
+    to stop.
+    """
+
+    global stop_event
+    stop_event = event
+
+
+# makes a board that can be solved without guessing
+def generate_no_guess(rows, cols, n_mines, safe_radius, row, col, seed,
+                      deadline):
+    """
+    DESCRIPTION:
+    Lays the mines at random outside of the safe square and plays the board
+    with the Solver. While the Solver gets stuck, one mine next to the solved
+    area is moved to a random tile that the Solver knows nothing about, and
+    the board is played again. Every move opens the board further, so a
+    board that can be solved without guessing is found after at most about
+    one move per mine.
+
+    PARAMETERS:
+    rows, cols, n_mines, safe_radius: The configuration of the board.
+    row (int):      The row coordinate of the first revealed tile.
+    col (int):      The column coordinate of the first revealed tile.
+    seed (int):     The seed of the random layout and moves.
+    deadline (float): The time.time() at which the search gives up.
+
+    STRUCTURES:
+    While-loop:     Used to move mines until the Solver solves the board.
+    If-statement:   Used to stop when another worker found a board or the
+                    deadline has passed.
+
+    OUTPUT:
+    The mines as bytes with 1 for a mine, one byte per tile, or None.
+    """
+
+    rng = random.Random(seed)
+    mines = bytearray(rows * cols)
+    for index in sample_mines(rows, cols, n_mines, row, col, safe_radius, rng):
+        mines[index] = 1
+
+    while True:
+        if time.time() > deadline or (stop_event is not None
+                                      and stop_event.is_set()):
+            return None
+
+        game, solver = solve_layout(rows, cols, n_mines, safe_radius, mines,
+                                    row, col)
+        if game.won:
+            return bytes(mines)
+
+        # the mines that block the Solver: unknown mines on the frontier, or
+        # else unknown mines next to it, or else derived mines that enclose
+        # unknown tiles
+        blocking = [cell for cell in solver.containing if mines[cell]]
+        if not blocking:
+            blocking = list({cell + delta
+                             for cell in solver.containing
+                             for delta in game.deltas[game.border[cell]]
+                             if mines[cell + delta]
+                             and solver.known[cell + delta] == UNKNOWN})
+        if not blocking:
+            blocking = [cell for cell in solver.mines
+                        if any(solver.known[cell + delta] == UNKNOWN
+                               for delta in game.deltas[game.border[cell]])]
+
+        # free tiles that the Solver knows nothing about, or else any free
+        # tile outside of the safe square, which changes the solved area
+        free = [cell for cell in range(rows * cols)
+                if solver.known[cell] == UNKNOWN and not mines[cell]
+                and cell not in solver.containing]
+        if not free:
+            free = [cell for cell in range(rows * cols)
+                    if not mines[cell] and cell not in blocking
+                    and (abs(cell // cols - row) > safe_radius
+                         or abs(cell % cols - col) > safe_radius)]
+
+        if not blocking or not free:
+            return None
+
+        mines[rng.choice(blocking)] = 0
+        mines[rng.choice(free)] = 1
+
+
+# plays a layout with the solver
+def solve_layout(rows, cols, n_mines, safe_radius, mines, row, col):
+    """
+    DESCRIPTION:
+    Plays a layout from the first revealed tile by revealing the tiles that
+    the Solver derived to be safe. When there are none, the ProbabilityEngine
+    is asked for the tiles that are certainly safe when the total amount of
+    mines is taken into account as well.
+
+    PARAMETERS:
+    rows, cols, n_mines, safe_radius: The configuration of the board.
+    mines (bytes):  One byte per tile that is 1 for a mine.
+    row (int):      The row coordinate of the first revealed tile.
+    col (int):      The column coordinate of the first revealed tile.
+
+    STRUCTURES:
+    While-loop:     Used to reveal the safe tiles.
+    For-loop:       Used to mark the tiles that the ProbabilityEngine found
+                    to be certain.
+
+    OUTPUT:
+    The (game, solver) tuple; game.won tells whether the layout was solved.
+    """
+
+    game = MineSweeper(rows, cols, n_mines, safe_radius)
+    game.place_layout(mines, count_adjacent_mines(mines, rows, cols))
+    game.pristine = False
+    solver = Solver(game)
+    probabilities = ProbabilityEngine(solver)
+
+    game.reveal(row, col)
+    while not game.won:
+        if solver.safe:
+            game.reveal(*divmod(next(iter(solver.safe)), cols))
+            continue
+
+        # the counts are only exact when no group was approximated
+        probabilities.compute()
+        if probabilities.approximate:
+            break
+
+        for cell, state in probabilities.certain.items():
+            solver.mark(cell, state)
+        if probabilities.interior_certain != UNKNOWN:
+            for cell in range(rows * cols):
+                if (solver.known[cell] == UNKNOWN
+                        and cell not in solver.containing):
+                    solver.mark(cell, probabilities.interior_certain)
+
+        solver.propagate()
+        if not solver.safe:
+            break
+
+    return game, solver
@@ -0,0 +1,658 @@
+"""
+README:
+This script contains a memory efficient variant of the Mine Sweeper engine.
+It contains SIX object class definitions: PackedMineSweeper (the game),
+TileView (a lightweight view on one tile of the board), BoardView, RowView
+and TilesView (lightweight views on the whole board, one row of the board and
+the flat list of tiles), and TileList (a lightweight list of the tiles that a
+move changed).
+
+The PackedMineSweeper has the same public methods as the MineSweeper class,
+but it does not create a Tile object for every tile. The whole board is stored
+in two bytearrays with one byte per tile:
+layout:     The lowest four bits hold the amount of adjacent mines, the MINE
+            bit tells whether the tile is a mine.
+state:      The REVEALED and FLAGGED bits hold the state of the tile.
+
+A clone of a game shares both bytearrays. The layout is not changed any more
+once the mines are laid, and the state is copied by the first move that
+changes it (copy on write), so a clone costs nothing until a move is made.
+
+ADDITIONAL PACKAGES:
+itertools:      A python library, its compress function picks the hidden tiles
+                of an opening.
+operator:       A python library, its add function is used to combine the
+                bytes of the board.
+engine:         A module made to run the minesweeper game
+"""
+
+from itertools import compress
+from operator import add
+
+from src.engine import (MineSweeper, Tile, count_adjacent_mines,
+                        sample_mines)
+
+# bits of the layout bytes
+NUMBER = 0x0F
+MINE = 0x10
+
+# bits of the state bytes
+REVEALED = 0x01
+FLAGGED = 0x02
+
+# translation tables that turn layout bytes into 0/1 mine bytes and state
+# bytes into the bits used to look up the symbol of a tile
+_MINE_BITS = bytes(1 if i & MINE else 0 for i in range(256))
+_STATE_BITS = bytes((i & (REVEALED | FLAGGED)) << 5 for i in range(256))
+
+# translation table that marks the hidden tiles without a flag with 1
+_HIDDEN_BITS = bytes([1]) + bytes(255)
+
+
+# symbol of each combination of layout and state bits, the same symbols as the
+# representation of a Tile object
+def _symbol(code):
+    if not code & (REVEALED << 5):
+        return '🚩' if code & (FLAGGED << 5) else ' '
+    if code & MINE:
+        return '💥'
+    if code & NUMBER:
+        return str(code & NUMBER)
+    return '$'
+
+
+_SYMBOLS = [_symbol(code) for code in range(128)]
+
+
+###########################################
+############ PackedMineSweeper ############
+###########################################
+class PackedMineSweeper(MineSweeper):
+    """
+    DESCRIPTION of the class "PackedMineSweeper":
+    The PackedMineSweeper class contains the same game logic as the
+    MineSweeper class, but stores the board in packed bytearrays instead of a
+    list of lists of Tile objects. A tile takes two bytes of memory, which
+    makes boards of millions of tiles possible.
+
+    PARAMETERS:
+    The same parameters as the MineSweeper class.
+
+    LIMITATIONS:
+    1.  The tiles returned by self.board[row][col], self.adjacent and iteration
+        are TileView objects that are created on access. They compare equal
+        when they point to the same tile, but are not the same object.
+    2.  Setting the number or is_mine of a TileView changes the layout of all
+        clones that share it.
+    3.  The limitations of the MineSweeper class apply as well.
+
+    METHODS:
+    self.create_board():        Creates the bytearrays of the board.
+    self.copy_board(original):  Shares the bytearrays with a clone.
+    self.own_state():           Copies the state before it is changed, when
+                                it is shared with a clone.
+    self.open_tiles(indices):   Opens tiles and the empty regions around them.
+    self.lay_mines(start_row, start_col): Places mines on the board.
+    self.assign_numbers():      Counts the amount of adjacent mines for each tile.
+    self.place_layout(mines, counts): Places a pre-generated layout on the
+                                board.
+    self.chord_neighbours(index): Returns the neighbours that a chord opens.
+    self.toggle_flag(index):    Places or removes a flag without triggering
+                                the event handlers.
+    self.__str__():             Returns basic string representation of minesweeper
+                                board.
+    All other methods are inherited from the MineSweeper class.
+
+    STRUCTURES:
+    The structures used are elaborated on in the docstring of the methods
+    themselves where applicable.
+
+    OUTPUTS:
+    The PackedMineSweeper object.
+    """
+
+    # creates the bytearrays of an empty board
+    def create_board(self):
+        """
+        DESCRIPTION:
+        This method creates the bytearrays of an empty board and the views that
+        give access to the tiles by self.board[row][col] and self.tiles[index].
+
+        PARAMETERS:
+        No additional parameters aside from the MineSweeper attributes itself.
+
+        OUTPUTS:
+        The method has no output: the PackedMineSweeper object is modified
+        directly.
+        """
+        self.layout = bytearray(self.n_rows * self.n_cols)
+        self.state = bytearray(self.n_rows * self.n_cols)
+        self.state_shared = False
+        self.board = BoardView(self)
+        self.tiles = TilesView(self)
+
+    # shares the bytearrays with a clone
+    def copy_board(self, original):
+        """
+        DESCRIPTION:
+        Lets a clone share the bytearrays of the original game. The state is
+        marked as shared in both games, so the first of them that changes it
+        makes its own copy first. The layout of a game whose mines are not
+        laid yet is copied, because laying the mines writes to it.
+
+        PARAMETERS:
+        original (PackedMineSweeper): The game that was cloned.
+
+        OUTPUTS:
+        The method has no output: the clone is modified directly.
+        """
+        if self.pristine:
+            self.layout = bytearray(original.layout)
+
+        self.state_shared = original.state_shared = True
+        self.board = BoardView(self)
+        self.tiles = TilesView(self)
+
+    # copies the state when it is shared with a clone
+    def own_state(self):
+        """
+        DESCRIPTION:
+        Copies the state bytearray when it is shared with a clone, so that it
+        can be changed without changing the other game. Every method that
+        changes the state calls this first.
+
+        OUTPUTS:
+        The method has no output: the state bytearray is replaced directly.
+        """
+        if self.state_shared:
+            self.state = bytearray(self.state)
+            self.state_shared = False
+
+    # returns a tile that this game may change
+    def own_tile(self, index):
+        """
+        DESCRIPTION:
+        Returns the tile at an index so that it can be changed, like
+        MineSweeper.own_tile. The state is copied first when it is shared.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        OUTPUTS:
+        The TileView of the tile.
+        """
+        self.own_state()
+        return TileView(self, index)
+
+    # opens tiles and the empty regions around them
+    def open_tiles(self, indices):
+        """
+        DESCRIPTION:
+        Opens tiles, works the same as MineSweeper.open_tiles but on the
+        indices of the bytearrays.
+
+        PARAMETERS:
+        indices (list): The indices (row * n_cols + col) of the tiles.
+
+        STRUCTURES:
+        For-loop:       Used to open the given tiles.
+        While-loop:     Used to open tiles from a queue until the empty regions
+                        have been opened completely.
+        If-statement:   Used to open the whole opening of an empty tile at
+                        once, like MineSweeper.open_tiles.
+        For-loop:       Used to go through all adjacent tiles in the neighbour
+                        table.
+
+        OUTPUTS:
+        A TileList of the opened tiles, which only makes the TileView of a
+        tile when it is read. The bytearrays and the counters are modified
+        directly.
+        """
+        self.own_state()
+        layout, state = self.layout, self.state
+        border, deltas = self.border, self.deltas
+        opened = []
+
+        # the tiles of whole openings, which do not need to be visited again
+        bulk = []
+
+        # the openings that can be opened at once
+        whole = self.whole_openings(indices)
+
+        # only opens tiles that are neither revealed nor flagged
+        for index in indices:
+            if not state[index]:
+                state[index] = REVEALED
+                opened.append(index)
+
+        # opens all surrounding tiles of tiles without adjacent mines, the
+        # list of opened tiles is used as the queue
+        position = 0
+        while position < len(opened):
+            index = opened[position]
+            position += 1
+
+            if layout[index] & MINE:
+                self.n_mines_hit += 1
+
+            elif not layout[index]:
+                spans = whole.pop(index, None)
+
+                # a fully hidden opening is opened at once; without flags, the
+                # hidden tiles are the 0 bytes
+                if spans is not None:
+                    for first, stop in zip(spans[::2], spans[1::2]):
+                        bulk += compress(range(first, stop),
+                                         state[first:stop].translate(
+                                             _HIDDEN_BITS))
+                        state[first:stop] = bytes([REVEALED]) * (stop - first)
+                    continue
+
+                for delta in deltas[border[index]]:
+                    if not state[index + delta]:
+                        state[index + delta] = REVEALED
+                        opened.append(index + delta)
+
+        opened += bulk
+        self.n_hidden -= len(opened)
+
+        return TileList(self, opened)
+
+    # checks if no tile of an opening is revealed or flagged
+    def opening_hidden(self, spans):
+        """
+        DESCRIPTION:
+        Checks if an opening is still fully hidden, like
+        MineSweeper.opening_hidden, from the 0 bytes of the state.
+
+        PARAMETERS:
+        spans (array):  The start and stop indices of the rows of tiles of the
+                        opening.
+
+        OUTPUTS:
+        True when none of the tiles of the opening is revealed or flagged.
+        """
+
+        state = self.state
+        return all(state.count(0, first, stop) == stop - first
+                   for first, stop in zip(spans[::2], spans[1::2]))
+
+    # creates mines on the board
+    def lay_mines(self, start_row, start_col):
+        """
+        DESCRIPTION:
+        Randomly distributes mines over the board, outside of the safe square
+        around the first revealed tile.
+
+        PARAMETERS:
+        start_row (int):    The row coordinate of the first revealed tile.
+        start_col (int):    The column coordinate of the first revealed tile.
+
+        STRUCTURES:
+        For-loop:   Used to place mines on the sampled tile indices.
+
+        OUTPUTS:
+        The method has no output: the layout bytearray is modified directly.
+        """
+        for index in sample_mines(self.n_rows, self.n_cols, self.n_mines,
+                                  start_row, start_col, self.safe_radius,
+                                  self.rng):
+            self.layout[index] |= MINE
+
+    # counts the amount of adjacent mines for each tile
+    def assign_numbers(self):
+        """
+        DESCRIPTION:
+        Counts the amount of adjacent mines for each tile with
+        count_adjacent_mines and stores the counts next to the mine bits.
+
+        PARAMETERS:
+        No additional parameters aside from the MineSweeper attributes itself.
+
+        OUTPUTS:
+        The method has no output: the layout bytearray is modified directly.
+        """
+        mines = self.layout.translate(_MINE_BITS)
+        counts = count_adjacent_mines(mines, self.n_rows, self.n_cols)
+        self.place_layout(mines, counts)
+
+    # places a pre-generated layout on the board
+    def place_layout(self, mines, counts):
+        """
+        DESCRIPTION:
+        Stores the mines and counts of a layout in the layout bytearray.
+
+        PARAMETERS:
+        mines (bytes):  One byte per tile, row by row, that is 1 for a mine.
+        counts (bytes): One byte per tile with the amount of adjacent mines.
+
+        OUTPUTS:
+        The method has no output: the layout bytearray is modified directly.
+        """
+        n_tiles = self.n_rows * self.n_cols
+
+        # the mine bit is the fifth bit of the layout byte
+        layout = (int.from_bytes(counts, 'little')
+                  | int.from_bytes(mines, 'little') << 4)
+        self.layout = bytearray(layout.to_bytes(n_tiles, 'little'))
+        self.planes = mines, counts
+        self.empty = self.labels = None
+
+    # returns the neighbours that a chord on a tile opens
+    def chord_neighbours(self, index):
+        """
+        DESCRIPTION:
+        Works the same as MineSweeper.chord_neighbours, but on the bytearrays.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if the tile is a revealed number.
+        If-statement:   Used to check if the amount of flags matches the number.
+
+        OUTPUTS:
+        The list of the indices of the neighbours, or an empty list when the
+        chord does nothing.
+        """
+        layout, state = self.layout, self.state
+        number = layout[index] & NUMBER
+        if not state[index] & REVEALED or layout[index] & MINE or not number:
+            return []
+
+        neighbours = [index + delta
+                      for delta in self.deltas[self.border[index]]]
+        if sum(state[neighbour] == FLAGGED for neighbour in neighbours) \
+                != number:
+            return []
+
+        return neighbours
+
+    # toggles the flag of a tile without triggering event handlers
+    def toggle_flag(self, index):
+        """
+        DESCRIPTION:
+        Places or removes the flag of a hidden tile, works the same as
+        MineSweeper.toggle_flag but on the state bytearray.
+
+        PARAMETERS:
+        index (int):    The index (row * n_cols + col) of the tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if the tile is revealed.
+        If-statement:   Used to update the counter of flagged tiles.
+
+        OUTPUTS:
+        True when the flag was changed, False when the tile is revealed.
+        """
+        # revealed tiles can not be flagged
+        if self.state[index] & REVEALED:
+            return False
+
+        self.own_state()
+        self.state[index] ^= FLAGGED
+
+        if self.state[index]:
+            self.n_flagged += 1
+        else:
+            self.n_flagged -= 1
+
+        return True
+
+    # prints minesweeper board
+    def __str__(self):
+        """
+        DESCRIPTION:
+        Returns string representation of the board, in the same format as
+        MineSweeper.__str__.
+
+        STRUCTURES:
+        For-loop:   Used to go through all rows of the board.
+
+        OUTPUTS:
+        Each row of the board, separated by newlines.
+        """
+        n_cols = self.n_cols
+        codes = bytes(map(add, self.layout, self.state.translate(_STATE_BITS)))
+
+        text = []
+        for start in range(0, len(codes), n_cols):
+            symbols = map(_SYMBOLS.__getitem__, codes[start:start + n_cols])
+            text += ['[' + ', '.join(symbols) + ']']
+
+        return '\n'.join(text)
+
+
+###########################################
+################ BoardView ################
+###########################################
+class BoardView:
+    """
+    DESCRIPTION:
+    Gives access to the rows of a PackedMineSweeper board, so that the tiles
+    can be used as self.board[row][col], like the list of lists of the
+    MineSweeper class.
+
+    PARAMETERS:
+    game (PackedMineSweeper):   The game that holds the bytearrays.
+
+    OUTPUTS:
+    The BoardView object.
+    """
+
+    __slots__ = ('game',)
+
+    def __init__(self, game):
+        self.game = game
+
+    def __len__(self):
+        return self.game.n_rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.game.n_rows:
+            raise IndexError('row index out of range')
+        return RowView(self.game, row)
+
+    def __iter__(self):
+        for row in range(self.game.n_rows):
+            yield RowView(self.game, row)
+
+
+###########################################
+################# RowView #################
+###########################################
+class RowView:
+    """
+    DESCRIPTION:
+    Gives access to the tiles of one row of a PackedMineSweeper board.
+
+    PARAMETERS:
+    game (PackedMineSweeper):   The game that holds the bytearrays.
+    row (int):                  The row coordinate of the row.
+
+    OUTPUTS:
+    The RowView object.
+    """
+
+    __slots__ = ('game', 'row')
+
+    def __init__(self, game, row):
+        self.game = game
+        self.row = row
+
+    def __len__(self):
+        return self.game.n_cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.game.n_cols:
+            raise IndexError('column index out of range')
+        return TileView(self.game, self.row * self.game.n_cols + col)
+
+    def __iter__(self):
+        start = self.row * self.game.n_cols
+        for index in range(start, start + self.game.n_cols):
+            yield TileView(self.game, index)
+
+    # same format as the string of a list of Tile objects
+    def __repr__(self):
+        return '[' + ', '.join(repr(tile) for tile in self) + ']'
+
+
+###########################################
+################ TilesView ################
+###########################################
+class TilesView:
+    """
+    DESCRIPTION:
+    Gives access to the tiles of a PackedMineSweeper board by their index, like
+    the flat list self.tiles of the MineSweeper class.
+
+    PARAMETERS:
+    game (PackedMineSweeper):   The game that holds the bytearrays.
+
+    OUTPUTS:
+    The TilesView object.
+    """
+
+    __slots__ = ('game',)
+
+    def __init__(self, game):
+        self.game = game
+
+    def __len__(self):
+        return len(self.game.layout)
+
+    def __getitem__(self, index):
+        return TileView(self.game, index)
+
+    def __iter__(self):
+        for index in range(len(self.game.layout)):
+            yield TileView(self.game, index)
+
+
+###########################################
+################ TileList #################
+###########################################
+class TileList:
+    """
+    DESCRIPTION:
+    A lightweight list of some tiles of a PackedMineSweeper board, like the
+    list of changed tiles that the MineSweeper class returns for a move. It
+    keeps the indices of the tiles, and only makes the TileView of a tile
+    when it is read, so a move that opens a million tiles does not make a
+    million objects.
+
+    PARAMETERS:
+    game (PackedMineSweeper):   The game that holds the bytearrays.
+    indices (list):             The indices of the tiles.
+
+    OUTPUTS:
+    The TileList object.
+    """
+
+    __slots__ = ('game', 'indices')
+
+    def __init__(self, game, indices):
+        self.game = game
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return TileList(self.game, self.indices[position])
+        return TileView(self.game, self.indices[position])
+
+    def __iter__(self):
+        game = self.game
+        for index in self.indices:
+            yield TileView(game, index)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+###########################################
+################ TileView #################
+###########################################
+class TileView:
+    """
+    DESCRIPTION:
+    A lightweight view on one tile of a PackedMineSweeper board, with the same
+    attributes as a Tile object. Reading or setting an attribute reads or sets
+    the bits in the bytearrays of the game.
+
+    PARAMETERS:
+    game (PackedMineSweeper):   The game that holds the bytearrays.
+    index (int):                The position of the tile in the bytearrays.
+
+    OUTPUTS:
+    The TileView object.
+    """
+
+    __slots__ = ('game', 'index')
+
+    def __init__(self, game, index):
+        self.game = game
+        self.index = index
+
+    @property
+    def row(self):
+        return self.index // self.game.n_cols
+
+    @property
+    def col(self):
+        return self.index % self.game.n_cols
+
+    @property
+    def number(self):
+        return self.game.layout[self.index] & NUMBER
+
+    @number.setter
+    def number(self, value):
+        layout = self.game.layout
+        layout[self.index] = (layout[self.index] & ~NUMBER) | value
+
+    @property
+    def is_mine(self):
+        return bool(self.game.layout[self.index] & MINE)
+
+    @is_mine.setter
+    def is_mine(self, value):
+        self._set_bit(self.game.layout, MINE, value)
+
+    @property
+    def revealed(self):
+        return bool(self.game.state[self.index] & REVEALED)
+
+    @revealed.setter
+    def revealed(self, value):
+        self.game.own_state()
+        self._set_bit(self.game.state, REVEALED, value)
+
+    @property
+    def flagged(self):
+        return bool(self.game.state[self.index] & FLAGGED)
+
+    @flagged.setter
+    def flagged(self, value):
+        self.game.own_state()
+        self._set_bit(self.game.state, FLAGGED, value)
+
+    def _set_bit(self, array, bit, value):
+        if value:
+            array[self.index] |= bit
+        else:
+            array[self.index] &= ~bit
+
+    # views on the same tile are equal, so they can be used in sets
+    def __eq__(self, other):
+        return (isinstance(other, TileView) and other.game is self.game
+                and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.game), self.index))
+
+    # same symbols as the Tile class
+    __repr__ = Tile.__repr__
@@ -0,0 +1,291 @@
+"""
+README:
+This script contains ONE class definition, BoardPool, which generates mine
+layouts in a background thread, so that a new game does not have to lay its
+mines and count its numbers when the first tile is revealed. It also contains
+the functions generate_layout and clear_safe_square, which create a layout and
+fit it to the first revealed tile, and add_to_counts, which updates the
+numbers around a moved mine.
+
+ADDITIONAL PACKAGES:
+random:         A python library used to randomly distribute the mines.
+threading:      A python library used to run the generation in the background.
+collections:    A python library, its OrderedDict and deque hold the layouts
+                per board configuration.
+engine:         A module made to run the minesweeper game
+"""
+
+import random
+import threading
+from collections import OrderedDict, deque
+
+from src.engine import count_adjacent_mines
+
+
+###########################################
+################ BoardPool ################
+###########################################
+class BoardPool:
+    """
+    DESCRIPTION:
+    The BoardPool keeps a few pre-generated layouts for each board
+    configuration (rows, cols, mines, safe_radius) that was requested. A
+    daemon thread refills the pool whenever a layout is taken. A layout is
+    generated without knowing where the first click will be; when it is
+    taken, the mines inside the safe square around the click are moved to
+    random free tiles outside of it, which only changes the numbers around
+    the moved mines.
+
+    PARAMETERS:
+    size (int):     The amount of layouts kept per configuration; default: 2.
+    max_keys (int): The amount of configurations kept; the configuration that
+                    was requested longest ago is dropped first; default: 4.
+    seed:           Optional seed of the random number generator of the
+                    background thread.
+
+    METHODS:
+    __init__(self, size, max_keys, seed): Initialises the class.
+    request(self, rows, cols, mines, safe_radius): Asks the pool to keep
+                    layouts of a configuration ready.
+    take(self, rows, cols, mines, safe_radius, row, col): Returns a
+                    ready layout fitted to the first revealed tile, or None.
+    run(self):      The loop of the background thread.
+
+    LIMITATIONS:
+    1.  A pooled layout does not depend on the seed of the game, so games
+        that need to be reproducible should not use a pool.
+    2.  The thread shares the Python interpreter with the GUI, it generates
+        layouts while the GUI waits for the player.
+
+    OUTPUT:
+    The BoardPool object.
+    """
+
+    def __init__(self, size=2, max_keys=4, seed=None):
+        """
+        This method initialises the attributes of the class:
+        self.layouts:   OrderedDict with a deque of ready layouts per
+                        configuration.
+        self.condition: Lock and condition on which the thread waits while the
+                        pool is full.
+        self.thread:    The background thread, started by the first request.
+        """
+
+        self.size = size
+        self.max_keys = max_keys
+        self.rng = random.Random(seed)
+        self.layouts = OrderedDict()
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def request(self, rows, cols, mines, safe_radius):
+        """
+        DESCRIPTION:
+        Asks the pool to keep layouts of a configuration ready, and starts the
+        background thread if it is not running yet.
+
+        PARAMETERS:
+        rows, cols, mines, safe_radius: The configuration of the board.
+
+        OUTPUT:
+        None.
+        """
+
+        key = (rows, cols, mines, safe_radius)
+
+        with self.condition:
+            if key in self.layouts:
+                self.layouts.move_to_end(key)
+            else:
+                self.layouts[key] = deque()
+                if len(self.layouts) > self.max_keys:
+                    self.layouts.popitem(last=False)
+            self.condition.notify()
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def take(self, rows, cols, mines, safe_radius, row, col):
+        """
+        DESCRIPTION:
+        Takes a ready layout of a configuration and moves its mines out of the
+        safe square around the first revealed tile. Never waits for the
+        background thread.
+
+        PARAMETERS:
+        rows, cols, mines, safe_radius: The configuration of the board.
+        row (int):      The row coordinate of the first revealed tile.
+        col (int):      The column coordinate of the first revealed tile.
+
+        STRUCTURES:
+        If-statement:   Used to check if a layout is ready.
+
+        OUTPUT:
+        A (mines, counts) tuple as made by generate_layout, or None when no
+        layout is ready.
+        """
+
+        key = (rows, cols, mines, safe_radius)
+
+        with self.condition:
+            if not self.layouts.get(key):
+                return None
+            layout = self.layouts[key].popleft()
+            self.condition.notify()
+
+        clear_safe_square(layout, rows, cols, row, col, safe_radius, self.rng)
+        return layout
+
+    def run(self):
+        """
+        DESCRIPTION:
+        The loop of the background thread: generates a layout for a
+        configuration that has less than self.size layouts, or waits until a
+        layout is taken or requested.
+
+        PARAMETERS:
+        No additional parameters aside from the BoardPool attributes itself.
+
+        STRUCTURES:
+        While-loop:     Used to keep the pool filled.
+        For-loop:       Used to find a configuration that needs a layout.
+
+        OUTPUT:
+        None.
+        """
+
+        while True:
+            with self.condition:
+                key = None
+                while key is None:
+                    for config, layouts in reversed(self.layouts.items()):
+                        if len(layouts) < self.size:
+                            key = config
+                            break
+                    else:
+                        self.condition.wait()
+
+            rows, cols, mines, safe_radius = key
+            layout = generate_layout(rows, cols, mines, self.rng)
+
+            with self.condition:
+                if key in self.layouts:
+                    self.layouts[key].append(layout)
+
+
+###########################################
+################ Functions ################
+###########################################
+# generates the mines and numbers of a board
+def generate_layout(rows, cols, mines, rng):
+    """
+    DESCRIPTION:
+    Lays mines on random tiles of the whole board and counts the adjacent
+    mines of every tile.
+
+    PARAMETERS:
+    rows (int):     The vertical size of the board.
+    cols (int):     The horizontal size of the board.
+    mines (int):    The amount of mines.
+    rng:            A random.Random object.
+
+    OUTPUT:
+    A (mines, counts) tuple of bytearrays with one byte per tile, row by row:
+    1 for a mine, and the amount of adjacent mines (the tile itself
+    included).
+    """
+
+    mine_bytes = bytearray(rows * cols)
+    for index in rng.sample(range(rows * cols), mines):
+        mine_bytes[index] = 1
+
+    counts = bytearray(count_adjacent_mines(mine_bytes, rows, cols))
+    return mine_bytes, counts
+
+
+# moves the mines out of the safe square around the first revealed tile
+def clear_safe_square(layout, rows, cols, row, col, safe_radius, rng):
+    """
+    DESCRIPTION:
+    Moves every mine inside the safe square around the first revealed tile to
+    a random tile outside of it that has no mine yet. The counts of the tiles
+    around a moved mine are updated, so the whole board is not counted again.
+    Moving the mines this way keeps every layout equally likely.
+
+    PARAMETERS:
+    layout (tuple): The (mines, counts) bytearrays, modified directly.
+    rows (int):     The vertical size of the board.
+    cols (int):     The horizontal size of the board.
+    row (int):      The row coordinate of the first revealed tile.
+    col (int):      The column coordinate of the first revealed tile.
+    safe_radius (int): The square radius around the first revealed tile where
+                    no mines may be.
+    rng:            A random.Random object.
+
+    STRUCTURES:
+    For-loop:       Used to go through the tiles of the safe square.
+    While-loop:     Used to find a free tile outside of the safe square.
+
+    OUTPUT:
+    None. The layout is modified directly.
+    """
+
+    mines, counts = layout
+
+    top, bottom = max(row - safe_radius, 0), min(row + safe_radius, rows - 1)
+    left, right = max(col - safe_radius, 0), min(col + safe_radius, cols - 1)
+
+    n_safe = (bottom - top + 1) * (right - left + 1)
+    n_mines = mines.count(1)
+    if n_mines > rows * cols - n_safe:
+        raise ValueError('can not lay %d mines: only %d tiles are outside of '
+                         'the safe square' % (n_mines, rows * cols - n_safe))
+
+    for i in range(top, bottom + 1):
+        for j in range(left, right + 1):
+            index = i * cols + j
+            if not mines[index]:
+                continue
+
+            # removes the mine from the safe square
+            mines[index] = 0
+            add_to_counts(counts, rows, cols, i, j, -1)
+
+            # lays it on a free tile outside of the safe square
+            while True:
+                new = rng.randrange(rows * cols)
+                new_row, new_col = divmod(new, cols)
+                if not mines[new] and not (top <= new_row <= bottom
+                                           and left <= new_col <= right):
+                    break
+
+            mines[new] = 1
+            add_to_counts(counts, rows, cols, new_row, new_col, 1)
+
+
+# changes the counts of the tiles around a mine
+def add_to_counts(counts, rows, cols, row, col, step):
+    """
+    DESCRIPTION:
+    Adds step to the counts of the 3 x 3 square around a tile, when a mine is
+    laid on (step 1) or removed from (step -1) that tile.
+
+    PARAMETERS:
+    counts (bytearray): The counts of the layout, modified directly.
+    rows (int):     The vertical size of the board.
+    cols (int):     The horizontal size of the board.
+    row (int):      The row coordinate of the mine.
+    col (int):      The column coordinate of the mine.
+    step (int):     1 or -1.
+
+    STRUCTURES:
+    Embedded for-loop:  Used to go through the tiles around the mine.
+
+    OUTPUT:
+    None. The counts are modified directly.
+    """
+
+    for i in range(max(row - 1, 0), min(row + 2, rows)):
+        for j in range(max(col - 1, 0), min(col + 2, cols)):
+            counts[i * cols + j] += step
@@ -0,0 +1,475 @@
+"""
+README:
+This script contains ONE class definition, ProbabilityEngine, which computes
+the exact chance that a hidden tile is a mine, for the tiles that the Solver
+can not decide. It also contains the function enumerate_component, which
+counts the mine layouts of one group of tiles that share constraints.
+
+ADDITIONAL PACKAGES:
+math:           A python library, its comb counts the ways to place the
+                remaining mines on the tiles that touch no number.
+collections:    A python library, its OrderedDict is the cache of counted
+                groups and its deque is used to find the groups.
+solver:         A module made to derive the safe tiles and the mines
+"""
+
+from collections import OrderedDict, deque
+from math import comb
+
+from src.solver import MINE, SAFE, UNKNOWN
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised by enumerate_component when a group has too many layouts to count
+    within the node budget.
+    """
+
+
+###########################################
+############ ProbabilityEngine ############
+###########################################
+class ProbabilityEngine:
+    """
+    DESCRIPTION:
+    The ProbabilityEngine reads the constraints of a Solver: the unknown
+    tiles around each revealed number and the amount of mines among them. The
+    tiles of the frontier are split into groups that share no constraint, and
+    the layouts of every group are counted separately, per amount of mines in
+    the group. The groups are then combined with the tiles that touch no
+    number (the interior): a combination of groups with m mines in total can
+    be completed in comb(interior, remaining mines - m) ways. All counts are
+    exact Python integers, so the probabilities are exact up to the final
+    division.
+
+    The counts of a group only depend on its constraints, so they are kept in
+    a cache with the constraints as key; after a move only the groups that
+    changed are counted again.
+
+    PARAMETERS:
+    solver:         The Solver that follows the game.
+    max_nodes (int): The node budget of counting one group; a group that needs
+                    more is approximated instead; default: 200000.
+    cache_size (int): The amount of groups kept in the cache; default: 1024.
+
+    METHODS:
+    __init__(self, solver, max_nodes, cache_size): Initialises the class.
+    compute(self):  Returns the chance of a mine for every frontier tile.
+    probability(self, row, col): Returns the chance of a mine for one tile.
+    components(self): Splits the frontier into groups.
+    count(self, cells, constraints): Counts a group, using the cache.
+
+    LIMITATIONS:
+    1.  A group whose layouts can not be counted within the budget gets an
+        approximation: every tile gets the average of mines / tiles of its
+        constraints, and the group is assumed to hold the rounded sum of
+        those chances. self.approximate tells whether this happened.
+
+    OUTPUT:
+    The ProbabilityEngine object.
+    """
+
+    def __init__(self, solver, max_nodes=200000, cache_size=1024):
+        """
+        This method initialises the attributes of the class:
+        self.cache:         OrderedDict from the constraints of a group to its
+                            counts; the group used longest ago is dropped
+                            first.
+        self.interior:      The chance of a mine for a tile that touches no
+                            number, set by compute.
+        self.approximate:   True when compute had to approximate a group.
+        self.last:          The result of the latest compute.
+        self.certain:       Dictionary from the index of a frontier tile to
+                            SAFE or MINE, for the tiles that are certain in
+                            the latest compute, decided on the exact counts.
+        self.interior_certain: SAFE or MINE when the interior tiles are
+                            certain in the latest compute, otherwise UNKNOWN.
+        """
+
+        self.solver = solver
+        self.game = solver.game
+        self.max_nodes = max_nodes
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.interior = 0.0
+        self.approximate = False
+        self.last = {}
+        self.certain = {}
+        self.interior_certain = UNKNOWN
+
+    def compute(self):
+        """
+        DESCRIPTION:
+        Computes the chance of a mine for every unknown tile of the frontier,
+        and for the interior tiles, using the amount of mines of the game as
+        the total.
+
+        PARAMETERS:
+        No additional parameters aside from the ProbabilityEngine attributes
+        itself.
+
+        STRUCTURES:
+        For-loop:       Used to count the layouts of every group.
+        For-loop:       Used to combine the counts of all other groups with
+                        each group, with the combinations of the groups before
+                        and after it.
+        Embedded for-loop: Used to add up the layouts per amount of mines.
+
+        OUTPUT:
+        A dictionary from (row, col) to the chance that the tile is a mine.
+        The chance for interior tiles is stored in self.interior. The tiles
+        whose count of layouts with a mine is zero or all layouts are stored
+        in self.certain and self.interior_certain, as the division to a
+        chance can round a near certain tile to 0.0 or 1.0.
+        """
+
+        known = self.solver.known
+        n_cols = self.game.n_cols
+        remaining = self.game.n_mines - known.count(MINE)
+        n_unknown = known.count(UNKNOWN)
+
+        groups = []
+        self.approximate = False
+        self.certain = {}
+        self.interior_certain = UNKNOWN
+        for cells, constraints in self.components():
+            counts = self.count(cells, constraints)
+            if counts is None:
+                # approximated group: assumed to hold its expected mines
+                chances = self.estimate(cells)
+                layouts = {round(sum(chances.values())): 1}
+            else:
+                chances = None
+                layouts = {mines: solutions
+                           for mines, (solutions, _) in counts.items()}
+            groups += [(cells, counts, chances, layouts)]
+
+        n_interior = n_unknown - sum(len(group[0]) for group in groups)
+
+        # distributions of the amount of mines of the groups before and after
+        # each group
+        before = [{0: 1}]
+        for group in groups:
+            before += [convolve(before[-1], group[3])]
+        after = [{0: 1}]
+        for group in reversed(groups):
+            after += [convolve(after[-1], group[3])]
+        after.reverse()
+
+        def ways(mines):
+            # the ways to place the rest of the mines on the interior
+            rest = remaining - mines
+            return comb(n_interior, rest) if 0 <= rest <= n_interior else 0
+
+        total = sum(weight * ways(mines)
+                    for mines, weight in before[-1].items())
+        if total == 0:
+            # the revealed numbers do not fit the amount of mines
+            self.interior = 0.0
+            self.last = {}
+            return {}
+
+        result = {}
+        for i, (cells, counts, chances, _) in enumerate(groups):
+            if counts is None:
+                for cell, chance in chances.items():
+                    result[divmod(cell, n_cols)] = chance
+                continue
+
+            others = convolve(before[i], after[i + 1])
+
+            per_cell = [0] * len(cells)
+            for mines, (solutions, cell_counts) in counts.items():
+                weight = sum(other * ways(mines + other_mines)
+                             for other_mines, other in others.items())
+                if weight:
+                    for j, cell_count in enumerate(cell_counts):
+                        per_cell[j] += cell_count * weight
+
+            for cell, mine_weight in zip(cells, per_cell):
+                result[divmod(cell, n_cols)] = mine_weight / total
+                if mine_weight == 0:
+                    self.certain[cell] = SAFE
+                elif mine_weight == total:
+                    self.certain[cell] = MINE
+
+        if n_interior:
+            interior = sum(weight * ways(mines) * (remaining - mines)
+                           for mines, weight in before[-1].items())
+            self.interior = interior / (total * n_interior)
+            if interior == 0:
+                self.interior_certain = SAFE
+            elif interior == total * n_interior:
+                self.interior_certain = MINE
+        else:
+            self.interior = 0.0
+
+        self.last = result
+        return result
+
+    def probability(self, row, col):
+        """
+        DESCRIPTION:
+        Returns the chance that a tile is a mine, from the latest compute.
+
+        PARAMETERS:
+        row (int):      The row coordinate of the tile.
+        col (int):      The column coordinate of the tile.
+
+        OUTPUT:
+        1.0 for known mines, 0.0 for known safe and revealed tiles, otherwise
+        the computed chance.
+        """
+
+        state = self.solver.known[row * self.game.n_cols + col]
+        if state != UNKNOWN:
+            return 1.0 if state == MINE else 0.0
+        return self.last.get((row, col), self.interior)
+
+    def components(self):
+        """
+        DESCRIPTION:
+        Splits the unknown frontier tiles of the Solver into groups of tiles
+        that are connected by shared constraints. The tiles of a group are
+        listed in the order in which they were found, so that neighbouring
+        tiles are close together, which lets enumerate_component reject
+        wrong layouts early.
+
+        PARAMETERS:
+        No additional parameters aside from the ProbabilityEngine attributes
+        itself.
+
+        STRUCTURES:
+        For-loop:       Used to start a group at every tile that is not in a
+                        group yet.
+        While-loop:     Used to visit the tiles of a group breadth first.
+
+        OUTPUT:
+        A list of (cells, constraints) tuples: the list of tile indices of a
+        group, and the list of its (set of tiles, mines) constraints.
+        """
+
+        containing = self.solver.containing
+        constraints = self.solver.constraints
+        seen = set()
+        groups = []
+
+        for start in containing:
+            if start in seen:
+                continue
+
+            seen.add(start)
+            cells = []
+            owners = set()
+            queue = deque([start])
+            while queue:
+                cell = queue.popleft()
+                cells += [cell]
+                for owner in containing[cell]:
+                    if owner in owners:
+                        continue
+                    owners.add(owner)
+                    for other in constraints[owner][0]:
+                        if other not in seen:
+                            seen.add(other)
+                            queue.append(other)
+
+            groups += [(cells, [tuple(constraints[owner])
+                                for owner in owners])]
+
+        return groups
+
+    def count(self, cells, constraints):
+        """
+        DESCRIPTION:
+        Returns the counts of a group from the cache, or counts them with
+        enumerate_component, trying the tiles in the order in which components
+        found them. The key of the cache is the set of constraints, which does
+        not depend on that order, so the counts are kept with the order they
+        were made in and put in the order of cells when they are returned.
+
+        PARAMETERS:
+        cells (list):       The tile indices of the group.
+        constraints (list): The (set of tiles, mines) constraints of the group.
+
+        STRUCTURES:
+        If-statement:   Used to check the cache.
+
+        OUTPUT:
+        The counts as made by enumerate_component, in the order of cells, or
+        None when the group was approximated.
+        """
+
+        key = frozenset((frozenset(group), mines)
+                        for group, mines in constraints)
+
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            order, counts = self.cache[key]
+        else:
+            order = list(cells)
+            try:
+                counts = enumerate_component(order, constraints,
+                                             self.max_nodes)
+            except BudgetExceeded:
+                counts = None
+
+            self.cache[key] = order, counts
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+        if counts is None:
+            self.approximate = True
+            return None
+
+        # puts the counts per tile in the order of cells
+        position = {cell: j for j, cell in enumerate(order)}
+        return {mines: (solutions, [cell_counts[position[cell]]
+                                    for cell in cells])
+                for mines, (solutions, cell_counts) in counts.items()}
+
+    def estimate(self, cells):
+        """
+        DESCRIPTION:
+        Approximates the chance of a mine for the tiles of a group that was
+        too large to count: the average of mines / tiles over the constraints
+        of each tile.
+
+        PARAMETERS:
+        cells (list):   The tile indices of the group.
+
+        OUTPUT:
+        A dictionary from tile index to chance.
+        """
+
+        constraints = self.solver.constraints
+        chances = {}
+        for cell in cells:
+            owners = self.solver.containing[cell]
+            chances[cell] = sum(constraints[owner][1]
+                                / len(constraints[owner][0])
+                                for owner in owners) / len(owners)
+        return chances
+
+
+###########################################
+################ Functions ################
+###########################################
+# counts the layouts of a group of tiles
+def enumerate_component(cells, constraints, max_nodes):
+    """
+    DESCRIPTION:
+    Counts all mine layouts of a group of tiles that fit its constraints, by
+    trying 'no mine' and 'mine' for every tile in turn and going back as soon
+    as a constraint has too many mines or can not get enough mines anymore.
+
+    PARAMETERS:
+    cells (list):       The tile indices of the group, in the order in which
+                        they are tried.
+    constraints (list): The (set of tiles, mines) constraints of the group.
+    max_nodes (int):    The maximum amount of tried values.
+
+    STRUCTURES:
+    While-loop:     Used to go forward and back through the tiles without
+                    recursion, so large groups do not hit the recursion limit.
+    For-loop:       Used to update the constraints of a tile.
+
+    OUTPUT:
+    A dictionary from the amount of mines in the group to a (solutions,
+    cell_counts) tuple: the amount of layouts with that many mines and, per
+    tile in the order of cells, the amount of those layouts in which the tile
+    is a mine. Raises BudgetExceeded when max_nodes is reached.
+    """
+
+    n = len(cells)
+    position = {cell: j for j, cell in enumerate(cells)}
+    targets = [mines for _, mines in constraints]
+    left = [len(group) for group, _ in constraints]
+    placed = [0] * len(constraints)
+
+    # the constraints of every tile
+    of_cell = [[] for _ in cells]
+    for c, (group, _) in enumerate(constraints):
+        for cell in group:
+            of_cell[position[cell]] += [c]
+
+    counts = {}
+    values = [-1] * n
+    pos = 0
+    mines = 0
+    nodes = 0
+
+    while pos >= 0:
+        old = values[pos]
+
+        # takes back the value that was tried before
+        if old >= 0:
+            for c in of_cell[pos]:
+                left[c] += 1
+                placed[c] -= old
+            mines -= old
+
+        value = old + 1
+        if value > 1:
+            values[pos] = -1
+            pos -= 1
+            continue
+
+        nodes += 1
+        if nodes > max_nodes:
+            raise BudgetExceeded()
+
+        values[pos] = value
+        mines += value
+        fits = True
+        for c in of_cell[pos]:
+            left[c] -= 1
+            placed[c] += value
+            if placed[c] > targets[c] or placed[c] + left[c] < targets[c]:
+                fits = False
+
+        if not fits:
+            continue
+
+        if pos < n - 1:
+            pos += 1
+            continue
+
+        # all tiles have a value: the layout fits
+        if mines not in counts:
+            counts[mines] = [0, [0] * n]
+        entry = counts[mines]
+        entry[0] += 1
+        cell_counts = entry[1]
+        for j in range(n):
+            if values[j]:
+                cell_counts[j] += 1
+
+    return {mines: (solutions, cell_counts)
+            for mines, (solutions, cell_counts) in counts.items()}
+
+
+# combines two distributions of the amount of mines
+def convolve(first, second):
+    """
+    DESCRIPTION:
+    Combines the distributions of two independent groups: the amount of
+    layouts of both groups together with m mines.
+
+    PARAMETERS:
+    first (dict):   {mines: layouts} of the first group.
+    second (dict):  {mines: layouts} of the second group.
+
+    STRUCTURES:
+    Embedded for-loop:  Used to combine every pair of amounts.
+
+    OUTPUT:
+    The combined {mines: layouts} dictionary.
+    """
+
+    result = {}
+    for first_mines, first_ways in first.items():
+        for second_mines, second_ways in second.items():
+            mines = first_mines + second_mines
+            result[mines] = result.get(mines, 0) + first_ways * second_ways
+    return result
@@ -0,0 +1,301 @@
+"""
+README:
+This script contains opt-in instrumentation of the Mine Sweeper game. When it
+is enabled, it counts the calls and adds up the time of the methods that
+decide how fast the game reacts, and measures the time from every click until
+the canvas is redrawn. When it is disabled, the original methods are used, so
+it costs nothing.
+
+Enable it before the Session is created, because the canvas binds the click
+handlers of the App when it is created. From the command line:
+    python main.py --profile stats.json     (or stats.prof for pstats)
+
+ADDITIONAL PACKAGES:
+json:           A python library used to write the counters as JSON.
+marshal:        A python library used to write the counters in the format
+                of cProfile, which can be read with pstats.
+time:           A python library used to time the methods.
+functools:      A python library, its wraps keeps the names of the methods.
+collections:    A python library, its deque keeps the latest click latencies.
+engine:         A module made to run the minesweeper game
+packed:         A module with the memory efficient engine
+app:            A module made to create the GUI for the minesweeper game,
+                only imported when tkinter is available.
+"""
+
+import json
+import marshal
+import time
+from collections import deque
+from functools import wraps
+
+from src.engine import MineSweeper
+from src.packed import PackedMineSweeper
+
+# methods that are timed, per class that defines them
+METHODS = {MineSweeper: ('reveal', 'adjacent', 'assign_numbers', 'game_over'),
+           PackedMineSweeper: ('assign_numbers',)}
+APP_METHODS = ('update_button_grid',)
+CLICK_METHODS = ('on_left_click', 'on_right_click', 'on_middle_click')
+
+# amount of click latencies that are kept
+MAX_CLICKS = 10000
+
+# (class, name) -> original method, while enabled
+originals = {}
+
+# qualified name -> [calls, seconds, code object]
+counters = {}
+
+# the latencies of the latest clicks in seconds
+clicks = deque(maxlen=MAX_CLICKS)
+
+
+###########################################
+################ Switching ################
+###########################################
+# replaces the methods by timed versions
+def enable():
+    """
+    DESCRIPTION:
+    Replaces the methods of METHODS, APP_METHODS and CLICK_METHODS by versions
+    that update the counters. Objects that already exist keep the handlers
+    they were given, so enable this before the game is created. Enabling
+    twice does nothing.
+
+    PARAMETERS:
+    No parameters.
+
+    STRUCTURES:
+    Embedded for-loop:  Used to replace the method of each class.
+
+    OUTPUT:
+    None.
+    """
+
+    if originals:
+        return
+
+    for cls, names in METHODS.items():
+        for name in names:
+            patch(cls, name, timed)
+
+    try:
+        from src.app import App
+    except ImportError:
+        # tkinter is not installed: only the engine is instrumented
+        return
+
+    for name in APP_METHODS:
+        patch(App, name, timed)
+    for name in CLICK_METHODS:
+        patch(App, name, timed_click)
+
+
+# restores the original methods
+def disable():
+    """
+    DESCRIPTION:
+    Puts the original methods back. The counters are kept.
+
+    PARAMETERS:
+    No parameters.
+
+    OUTPUT:
+    None.
+    """
+
+    for (cls, name), method in originals.items():
+        setattr(cls, name, method)
+    originals.clear()
+
+
+def is_enabled():
+    """
+    Returns True when the methods are instrumented.
+    """
+
+    return bool(originals)
+
+
+# sets all counters to zero
+def reset():
+    """
+    DESCRIPTION:
+    Forgets all counted calls and click latencies.
+
+    PARAMETERS:
+    No parameters.
+
+    OUTPUT:
+    None.
+    """
+
+    counters.clear()
+    clicks.clear()
+
+
+# replaces one method
+def patch(cls, name, wrapper):
+    """
+    DESCRIPTION:
+    Replaces the method name of cls by wrapper(method, qualified name) and
+    remembers the original.
+
+    PARAMETERS:
+    cls:            The class that defines the method.
+    name (str):     The name of the method.
+    wrapper:        timed or timed_click.
+
+    OUTPUT:
+    None.
+    """
+
+    method = cls.__dict__[name]
+    originals[(cls, name)] = method
+    setattr(cls, name, wrapper(method, '%s.%s' % (cls.__name__, name)))
+
+
+###########################################
+################ Wrappers #################
+###########################################
+# times the calls of a method
+def timed(method, qualname):
+    """
+    DESCRIPTION:
+    Returns a version of method that counts its calls and adds up its time.
+    A call inside another timed call is counted in both.
+
+    PARAMETERS:
+    method:             The original method.
+    qualname (str):     The name under which it is counted.
+
+    OUTPUT:
+    The timed method.
+    """
+
+    counter = counters.setdefault(qualname, [0, 0.0, method.__code__])
+
+    @wraps(method)
+    def timed_method(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            counter[0] += 1
+            counter[1] += time.perf_counter() - start
+
+    return timed_method
+
+
+# times a click until the canvas is redrawn
+def timed_click(method, qualname):
+    """
+    DESCRIPTION:
+    Returns a version of a click handler of the App that also measures the
+    latency of the click: the time from the start of the handler until the
+    pending drawing of the canvas is done.
+
+    PARAMETERS:
+    method:             The original click handler.
+    qualname (str):     The name under which it is counted.
+
+    OUTPUT:
+    The timed click handler.
+    """
+
+    counter = counters.setdefault(qualname, [0, 0.0, method.__code__])
+
+    @wraps(method)
+    def timed_handler(self, *args):
+        start = time.perf_counter()
+        try:
+            return method(self, *args)
+        finally:
+            # draws the canvas now instead of when Tk is idle
+            self.update_idletasks()
+            latency = time.perf_counter() - start
+            counter[0] += 1
+            counter[1] += latency
+            clicks.append(latency)
+
+    return timed_handler
+
+
+###########################################
+################# Output ##################
+###########################################
+# returns the counters
+def stats():
+    """
+    DESCRIPTION:
+    Returns the counters as a dictionary that can be written as JSON.
+
+    PARAMETERS:
+    No parameters.
+
+    STRUCTURES:
+    Dictionary comprehension: Used to convert the counters.
+
+    OUTPUT:
+    A dictionary with:
+    'methods':  The calls, total seconds and mean seconds per method.
+    'clicks':   The amount, mean and maximum latency of the latest clicks and
+                the latencies themselves, in seconds.
+    """
+
+    methods = {name: {'calls': calls, 'seconds': seconds,
+                      'mean': seconds / calls if calls else 0.0}
+               for name, (calls, seconds, _) in counters.items()}
+
+    latencies = list(clicks)
+    return {'methods': methods,
+            'clicks': {'count': len(latencies),
+                       'mean': sum(latencies) / len(latencies)
+                       if latencies else 0.0,
+                       'max': max(latencies, default=0.0),
+                       'latencies': latencies}}
+
+
+# writes the counters as JSON
+def dump_json(path):
+    """
+    DESCRIPTION:
+    Writes the result of stats to a JSON file.
+
+    PARAMETERS:
+    path (str):     The name of the file.
+
+    OUTPUT:
+    None.
+    """
+
+    with open(path, 'w') as file:
+        json.dump(stats(), file, indent=2)
+
+
+# writes the counters in the format of cProfile
+def dump_stats(path):
+    """
+    DESCRIPTION:
+    Writes the counters in the marshal format of cProfile, so that they can
+    be read with pstats.Stats(path) and tools that read .prof files. Only the
+    total time of each method is known, which is used as both its own time
+    and its cumulative time; there are no callers.
+
+    PARAMETERS:
+    path (str):     The name of the file.
+
+    STRUCTURES:
+    Dictionary comprehension: Used to convert the counters.
+
+    OUTPUT:
+    None.
+    """
+
+    entries = {(code.co_filename, code.co_firstlineno, name):
+               (calls, calls, seconds, seconds, {})
+               for name, (calls, seconds, code) in counters.items()}
+
+    with open(path, 'wb') as file:
+        marshal.dump(entries, file)
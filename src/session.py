@@ -0,0 +1,163 @@
+"""
+README:
+This script contains ONE class, the Session, which is the single window of the
+Mine Sweeper game. The start screen and the game are frames that the Session
+swaps inside this window, so that no window is destroyed or created when a
+new game starts.
+
+ADDITIONAL PACKAGES:
+tkinter:    A python library used to create the GUI.
+config:     A module made to create a GUI that allows the user to choose
+            game options
+app:        A module made to create the GUI for the minesweeper game.
+pool:       A module made to generate boards in the background.
+noguess:    A module made to generate boards that can be solved without
+            guessing.
+"""
+
+import tkinter as tk
+
+from src.app import App
+from src.config import StartScreen
+from src.noguess import NoGuessGenerator
+from src.pool import BoardPool
+
+
+###########################################
+################# Session #################
+###########################################
+class Session(tk.Tk):
+    """
+    DESCRIPTION:
+    The Session is the window of the game. It holds one StartScreen and at
+    most one App, and shows one of them at a time. When a new game has the
+    same board size as the previous one, the existing App is reset instead of
+    building a new one, so playing many games costs no extra time or memory.
+    The Session also owns the BoardPool, which prepares the layouts of the
+    chosen configuration in the background, and the NoGuessGenerator, which
+    makes the boards of games that have to be solvable without guessing.
+
+    PARAMETERS:
+    The class does not have parameters.
+
+    METHODS:
+    __init__(self):             Initialises the class.
+    show_start_screen(self):    Shows the StartScreen instead of the game.
+    start_game(self, rows, cols, mines, safe_radius, right_click, no_guess):
+                                Shows a new game instead of the StartScreen.
+    destroy(self):              Stops the workers of the NoGuessGenerator and
+                                closes the window.
+
+    LIMITATIONS:
+    1.  A game with a different board size or OS setting still creates a new
+        App, because the canvas and its bindings depend on them.
+
+    OUTPUT:
+    The window in which the minesweeper game is played.
+    """
+
+    def __init__(self):
+        """
+        This method initialises the attributes of the class:
+        self.title:         Gives the GUI a title.
+        self.start_screen:  The StartScreen frame.
+        self.app:           The App frame, None until the first game starts.
+        self.pool:          The BoardPool shared by all games.
+        self.no_guess_generator: The NoGuessGenerator shared by all games that
+                            have to be solvable without guessing.
+        """
+
+        tk.Tk.__init__(self)
+        self.title('Minesweeper')
+        self.start_screen = StartScreen(self)
+        self.app = None
+        self.pool = BoardPool()
+        self.no_guess_generator = NoGuessGenerator()
+        self.show_start_screen()
+
+    def show_start_screen(self):
+        """
+        DESCRIPTION:
+        Hides the game and shows the StartScreen, with the fixed size of the
+        start screen.
+
+        PARAMETERS:
+        No additional parameters aside from the Session attributes itself.
+
+        OUTPUT:
+        The StartScreen is shown in the window.
+        """
+
+        if self.app is not None:
+            self.app.pack_forget()
+
+        self.resizable(False, False)
+        self.geometry('300x255')
+        self.start_screen.pack(fill=tk.BOTH, expand=True)
+
+    def start_game(self, rows, cols, mines, safe_radius, right_click,
+                   no_guess=False):
+        """
+        DESCRIPTION:
+        Hides the StartScreen and shows a new game. The existing App is reset
+        when it has the same board size and OS setting, otherwise it is
+        replaced by a new App.
+
+        PARAMETERS:
+        rows:           The number of rows of the minesweeper board.
+        cols:           The number of columns of the minesweeper board.
+        mines:          The number of mines of the minesweeper board.
+        safe_radius:    The square radius around the first click where no
+                        mines are placed.
+        right_click:    The number of the right mouse button.
+        no_guess:       True when the board has to be solvable without
+                        guessing; its layout is then made by the
+                        NoGuessGenerator instead of the BoardPool.
+
+        STRUCTURES:
+        If-statement:   Used to choose the source of the layouts.
+        If-statement:   Used to check if the existing App can be reused.
+
+        OUTPUT:
+        The game is shown in the window.
+        """
+
+        self.start_screen.pack_forget()
+
+        if no_guess:
+            pool = self.no_guess_generator
+        else:
+            pool = self.pool
+            self.pool.request(rows, cols, mines, safe_radius)
+
+        if (self.app is not None and (self.app.rows, self.app.cols, self.app.OS)
+                == (rows, cols, right_click)):
+            self.app.pool = pool
+            self.app.reset(mines, safe_radius)
+
+        else:
+            if self.app is not None:
+                self.app.destroy()
+            self.app = App(self, rows, cols, mines, safe_radius, right_click,
+                           pool)
+
+        # the window takes the size of the game and may be resized
+        self.geometry('')
+        self.resizable(True, True)
+        self.app.pack(fill=tk.BOTH, expand=True)
+
+    def destroy(self):
+        """
+        DESCRIPTION:
+        Stops the worker processes of the NoGuessGenerator and closes the
+        window.
+
+        PARAMETERS:
+        No additional parameters aside from the Session attributes itself.
+
+        OUTPUT:
+        None.
+        """
+
+        self.no_guess_generator.close()
+        tk.Tk.destroy(self)
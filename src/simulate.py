@@ -0,0 +1,407 @@
+"""
+README:
+This script plays Mine Sweeper games without the GUI, to measure how fast the
+engine is and how well a bot plays. The games are spread over a pool of
+worker processes.
+
+Run it from the Minesweeper folder, for example:
+    python -m src.simulate --config 16,16,40,1 --games 1000 --policy random
+
+ADDITIONAL PACKAGES:
+argparse:           A python library used to read the command line options.
+concurrent.futures: A python library used to play games in worker processes.
+importlib:          A python library used to load bot policies by name.
+json:               A python library used to write the results.
+os:                 A python library used to count the processor cores.
+random:             A python library used by the bot policies.
+time:               A python library used to time the phases of the games.
+engine:             A module made to run the minesweeper game
+packed:             A module with the memory efficient engine
+solver:             A module made to derive the safe tiles and the mines
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.engine import MineSweeper
+from src.packed import PackedMineSweeper
+from src.solver import Solver
+
+# phases of a game that are timed
+PHASES = ('lay_mines', 'assign_numbers', 'reveal', 'game_over')
+
+
+###########################################
+################# Timing ##################
+###########################################
+# adds timers around the phases of an engine class
+def timed(engine_class):
+    """
+    DESCRIPTION:
+    Creates a subclass of an engine class that adds up the time spent in each
+    phase of PHASES in its times attribute. The reveal phase is the time spent
+    opening tiles, without laying mines and counting numbers.
+
+    PARAMETERS:
+    engine_class:   MineSweeper or PackedMineSweeper.
+
+    STRUCTURES:
+    For-loop:       Used to wrap the method of each phase.
+
+    OUTPUTS:
+    The timed subclass.
+    """
+
+    methods = {'lay_mines': 'lay_mines',
+               'assign_numbers': 'assign_numbers',
+               'reveal': 'open_tiles',
+               'game_over': 'game_over'}
+
+    def wrap(phase, method):
+        def timed_method(self, *args):
+            start = time.perf_counter()
+            result = method(self, *args)
+            self.times[phase] += time.perf_counter() - start
+            return result
+        return timed_method
+
+    attributes = {}
+    for phase, name in methods.items():
+        attributes[name] = wrap(phase, getattr(engine_class, name))
+
+    def __init__(self, *args, **kwargs):
+        self.times = dict.fromkeys(PHASES, 0.0)
+        engine_class.__init__(self, *args, **kwargs)
+
+    attributes['__init__'] = __init__
+    return type('Timed' + engine_class.__name__, (engine_class,), attributes)
+
+
+ENGINES = {'tile': timed(MineSweeper), 'packed': timed(PackedMineSweeper)}
+
+
+###########################################
+################ Policies #################
+###########################################
+# reveals the hidden tiles in a random order
+def random_policy(game, rng):
+    """
+    DESCRIPTION:
+    A bot policy that reveals hidden tiles in a random order, without looking
+    at the numbers. A policy is a generator that receives the game and a
+    random.Random object, and yields (action, row, col) moves, where action is
+    the name of an engine method ('reveal', 'flag' or 'chord'). The runner
+    stops asking for moves when the game is over.
+
+    PARAMETERS:
+    game:       The MineSweeper object that is played.
+    rng:        A random.Random object.
+
+    STRUCTURES:
+    For-loop:   Used to go through all tiles in a random order.
+
+    OUTPUTS:
+    Yields reveal moves.
+    """
+
+    order = list(range(game.n_rows * game.n_cols))
+    rng.shuffle(order)
+
+    for index in order:
+        if not game.tiles[index].revealed:
+            row, col = divmod(index, game.n_cols)
+            yield 'reveal', row, col
+
+
+# reveals the tiles that the solver knows are safe
+def solver_policy(game, rng):
+    """
+    DESCRIPTION:
+    A bot policy that reveals the tiles that the Solver derived to be safe,
+    and only reveals a random hidden tile that is not a known mine when there
+    are none.
+
+    PARAMETERS:
+    game:       The MineSweeper object that is played.
+    rng:        A random.Random object.
+
+    STRUCTURES:
+    While-loop: Used to keep making moves; the runner stops asking for moves
+                when the game is over.
+    If-statement: Used to choose between a safe tile and a guess.
+
+    OUTPUTS:
+    Yields reveal moves.
+    """
+
+    solver = Solver(game)
+    order = list(range(game.n_rows * game.n_cols))
+    rng.shuffle(order)
+    guesses = iter(order)
+
+    while True:
+        if solver.safe:
+            index = next(iter(solver.safe))
+        else:
+            index = next(guesses)
+            if solver.known[index] or game.tiles[index].revealed:
+                continue
+
+        row, col = divmod(index, game.n_cols)
+        yield 'reveal', row, col
+
+
+POLICIES = {'random': random_policy, 'solver': solver_policy}
+
+
+# finds a policy by its name
+def get_policy(name):
+    """
+    DESCRIPTION:
+    Returns a policy from POLICIES, or loads it from a module when the name
+    has the form 'module:function'.
+
+    PARAMETERS:
+    name (str):     The name of the policy.
+
+    OUTPUTS:
+    The policy function.
+    """
+
+    if name in POLICIES:
+        return POLICIES[name]
+
+    module, _, function = name.partition(':')
+    return getattr(importlib.import_module(module), function)
+
+
+###########################################
+################# Runner ##################
+###########################################
+# plays a range of seeds of one configuration
+def play_games(config, seeds, policy_name, engine_name):
+    """
+    DESCRIPTION:
+    Plays one game per seed, with the first move at a tile chosen by the
+    policy. This function runs in a worker process.
+
+    PARAMETERS:
+    config (tuple): The (rows, cols, mines, safe_radius) of the board.
+    seeds (range):  The seeds of the games; the seed decides both the mines
+                    and the random choices of the policy.
+    policy_name:    The name of the policy (see get_policy).
+    engine_name:    'tile' or 'packed'.
+
+    STRUCTURES:
+    For-loop:       Used to play each game.
+    For-loop:       Used to make the moves of the policy.
+    If-statement:   Used to stop when the game is over.
+
+    OUTPUTS:
+    A dictionary with the amount of games, wins and moves, the summed 3BV of
+    the boards, the time per phase and the total time spent.
+    """
+
+    policy = get_policy(policy_name)
+    engine_class = ENGINES[engine_name]
+    result = {'games': 0, 'wins': 0, 'moves': 0, 'bbbv': 0,
+              'times': dict.fromkeys(PHASES, 0.0), 'time': 0.0}
+
+    start = time.perf_counter()
+    for seed in seeds:
+        game = engine_class(*config, seed=seed)
+
+        for action, row, col in policy(game, random.Random(seed)):
+            getattr(game, action)(row, col)
+            result['moves'] += 1
+            if game.won or game.lost:
+                break
+
+        result['games'] += 1
+        result['wins'] += game.won and not game.lost
+        result['bbbv'] += game.bbbv
+        for phase in PHASES:
+            result['times'][phase] += game.times[phase]
+
+    result['time'] = time.perf_counter() - start
+    return result
+
+
+# spreads the games of each configuration over worker processes
+def simulate(configs, n_games, seed_start=0, policy='random',
+             engine='packed', workers=None):
+    """
+    DESCRIPTION:
+    Plays n_games games of each configuration on a pool of worker processes
+    and combines the results of the workers.
+
+    PARAMETERS:
+    configs (list): The (rows, cols, mines, safe_radius) tuples of the boards.
+    n_games (int):  The amount of games per configuration, at least 1.
+    seed_start (int): The seed of the first game; the games use the seeds
+                    seed_start to seed_start + n_games.
+    policy (str):   The name of the policy (see get_policy).
+    engine (str):   'tile' or 'packed'.
+    workers (int):  The amount of worker processes; default: all cores.
+
+    STRUCTURES:
+    For-loop:       Used to split the seeds of each configuration in chunks,
+                    so that every worker gets several chunks.
+    For-loop:       Used to combine the results of the chunks.
+
+    OUTPUTS:
+    A list with a dictionary of results per configuration. The keys workers,
+    wall_seconds and games_per_second hold the amount of worker processes,
+    the elapsed time and the throughput of the whole run, which are the same
+    for every configuration.
+    """
+
+    if n_games < 1:
+        raise ValueError('can not simulate %d games: play at least 1'
+                         % n_games)
+
+    workers = workers or os.cpu_count() or 1
+    chunk = max(1, n_games // (workers * 4))
+
+    with ProcessPoolExecutor(workers) as executor:
+        start = time.perf_counter()
+        futures = []
+        for config in configs:
+            for first in range(seed_start, seed_start + n_games, chunk):
+                seeds = range(first, min(first + chunk, seed_start + n_games))
+                futures += [(config, executor.submit(play_games, config, seeds,
+                                                     policy, engine))]
+
+        totals = {config: {'games': 0, 'wins': 0, 'moves': 0, 'bbbv': 0,
+                           'times': dict.fromkeys(PHASES, 0.0), 'time': 0.0}
+                  for config in configs}
+        for config, future in futures:
+            result = future.result()
+            total = totals[config]
+            for key in ('games', 'wins', 'moves', 'bbbv', 'time'):
+                total[key] += result[key]
+            for phase in PHASES:
+                total['times'][phase] += result['times'][phase]
+
+        elapsed = time.perf_counter() - start
+
+    report = []
+    for config in configs:
+        total = totals[config]
+        report += [{
+            'rows': config[0], 'cols': config[1],
+            'mines': config[2], 'safe_radius': config[3],
+            'games': total['games'],
+            'win_rate': total['wins'] / total['games'],
+            'moves_per_game': total['moves'] / total['games'],
+            'bbbv_per_game': total['bbbv'] / total['games'],
+            'games_per_second_per_core': total['games'] / total['time'],
+            'phase_seconds': total['times'],
+            'worker_seconds': total['time'],
+            'workers': workers,
+            'wall_seconds': elapsed,
+            'games_per_second': n_games * len(configs) / elapsed,
+        }]
+
+    return report
+
+
+# reads a configuration from the command line
+def parse_config(text):
+    """
+    DESCRIPTION:
+    Turns a 'rows,cols,mines,safe_radius' option into a tuple of ints.
+
+    PARAMETERS:
+    text (str):     The option.
+
+    OUTPUTS:
+    The (rows, cols, mines, safe_radius) tuple.
+    """
+
+    values = tuple(int(value) for value in text.split(','))
+    if len(values) != 4:
+        raise argparse.ArgumentTypeError(
+            'expected rows,cols,mines,safe_radius, got %r' % text)
+    return values
+
+
+# reads the amount of games from the command line
+def parse_games(text):
+    """
+    DESCRIPTION:
+    Turns the --games option into an int of at least 1, as the averages of
+    the results are taken over the games.
+
+    PARAMETERS:
+    text (str):     The option.
+
+    OUTPUTS:
+    The amount of games.
+    """
+
+    n_games = int(text)
+    if n_games < 1:
+        raise argparse.ArgumentTypeError(
+            'expected at least 1 game, got %r' % text)
+    return n_games
+
+
+def main(args=None):
+    """
+    DESCRIPTION:
+    The command line entry point: plays the games and prints the results as
+    a table, or writes them to a JSON file.
+
+    PARAMETERS:
+    args (list):    The command line arguments; default: sys.argv.
+
+    OUTPUTS:
+    None.
+    """
+
+    parser = argparse.ArgumentParser(
+        description='Play Mine Sweeper games without the GUI.')
+    parser.add_argument('--config', type=parse_config, action='append',
+                        help='rows,cols,mines,safe_radius; may be repeated '
+                             '(default: the Hard 16 x 16 board)')
+    parser.add_argument('--games', type=parse_games, default=1000,
+                        help='games per configuration')
+    parser.add_argument('--seed-start', type=int, default=0)
+    parser.add_argument('--policy', default='random',
+                        help='%s or module:function' % ', '.join(POLICIES))
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='packed')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--json', help='file to write the results to')
+    options = parser.parse_args(args)
+
+    report = simulate(options.config or [(16, 16, 128, 1)], options.games,
+                      options.seed_start, options.policy, options.engine,
+                      options.workers)
+
+    if options.json:
+        with open(options.json, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if report:
+        print('%d games on %d workers in %.2f s: %.1f games/s'
+              % (sum(result['games'] for result in report),
+                 report[0]['workers'], report[0]['wall_seconds'],
+                 report[0]['games_per_second']))
+
+    for result in report:
+        print('%(rows)dx%(cols)d, %(mines)d mines, radius %(safe_radius)d: '
+              'win rate %(win_rate).3f, %(moves_per_game).1f moves/game, '
+              '3BV %(bbbv_per_game).1f, '
+              '%(games_per_second_per_core).1f games/s/core' % result)
+        print('    ' + ', '.join('%s %.3f s' % item
+                                 for item in result['phase_seconds'].items()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+"""
+README:
+This script contains ONE class definition, Solver, which follows a Mine
+Sweeper game and derives which hidden tiles are certainly safe and which are
+certainly mines from the revealed numbers. It is updated with the tiles that
+every move changed, so it never has to look at the whole board again.
+
+ADDITIONAL PACKAGES:
+collections:    A python library, its deque is the queue of constraints that
+                still need to be checked.
+"""
+
+from collections import deque
+
+# what the solver knows about a tile
+UNKNOWN = 0
+SAFE = 1
+MINE = 2
+
+
+###########################################
+################# Solver ##################
+###########################################
+class Solver:
+    """
+    DESCRIPTION:
+    The Solver keeps one constraint per revealed number that still has hidden
+    neighbours: the set of those neighbours and the amount of mines among
+    them. A constraint with no mines left makes all its tiles safe, and a
+    constraint with as many mines as tiles makes all its tiles mines. Two
+    constraints that share tiles are compared: when the mines that one has
+    more than the other fill up the tiles that only it has, those tiles are
+    mines and the tiles that only the other has are safe. This also covers a
+    constraint whose tiles are a subset of the other.
+
+    Every tile that becomes known is removed from the constraints around it,
+    and only the constraints that changed are checked again, so a move costs
+    time in proportion to the tiles it changed, not to the size of the
+    frontier.
+
+    PARAMETERS:
+    game:           The MineSweeper or PackedMineSweeper object that is
+                    followed. The solver adds itself to its on_change event
+                    handlers.
+
+    METHODS:
+    __init__(self, game): Initialises the class.
+    update(self, changes): Adds the tiles changed by a move.
+    safe_cells(self):   Returns the hidden tiles that are certainly safe.
+    mine_cells(self):   Returns the hidden tiles that are certainly mines.
+    add_constraint(self, index, number): Adds the constraint of a revealed
+                    number.
+    remove_cell(self, index, is_mine): Removes a known tile from the
+                    constraints around it.
+    mark(self, index, state): Marks a tile as safe or as a mine.
+    propagate(self):    Checks the changed constraints until nothing more can
+                    be derived.
+    compare(self, first, second): Derives tiles from two constraints that
+                    share tiles.
+
+    LIMITATIONS:
+    1.  Flags are not used, because the player may have placed them wrongly.
+    2.  The solver does not use the total amount of mines, and does not
+        combine more than two constraints, so some tiles that are certain are
+        not found.
+
+    OUTPUT:
+    The Solver object.
+    """
+
+    def __init__(self, game):
+        """
+        This method initialises the attributes of the class:
+        self.known:         bytearray with UNKNOWN, SAFE or MINE per tile.
+        self.constraints:   Dictionary from the index of a revealed number to a
+                            [set of unknown neighbours, amount of mines among
+                            them] list.
+        self.containing:    Dictionary from the index of an unknown tile to the
+                            set of constraints that contain it.
+        self.safe:          Set of the hidden tiles that are certainly safe.
+        self.mines:         Set of the tiles that are certainly mines.
+        self.queue:         deque of constraints that need to be checked, and
+                            self.queued, the set of the same constraints.
+        """
+
+        self.game = game
+        self.known = bytearray(game.n_rows * game.n_cols)
+        self.constraints = {}
+        self.containing = {}
+        self.safe = set()
+        self.mines = set()
+        self.queue = deque()
+        self.queued = set()
+
+        # a game that is already being played is read once
+        if not game.pristine:
+            self.update([tile for tile in game if tile.revealed])
+
+        game.on_change += [self.update]
+
+    def update(self, changes):
+        """
+        DESCRIPTION:
+        Adds the tiles that were revealed by a move: they are removed from the
+        constraints around them, the revealed numbers become new constraints,
+        and the changed constraints are checked.
+
+        PARAMETERS:
+        changes (list): The tiles that were changed by the move, as given by
+                        the engine. Flagged tiles are ignored.
+
+        STRUCTURES:
+        For-loop:       Used to mark all revealed tiles before the new
+                        constraints are made, so that tiles revealed by the
+                        same move are not counted as unknown.
+        For-loop:       Used to add the new constraints.
+
+        OUTPUT:
+        None.
+        """
+
+        n_cols = self.game.n_cols
+        numbers = []
+
+        for tile in changes:
+            if not tile.revealed:
+                continue
+
+            index = tile.row * n_cols + tile.col
+            state = self.known[index]
+            if state == MINE:
+                continue
+
+            self.known[index] = MINE if tile.is_mine else SAFE
+            if state == UNKNOWN:
+                self.remove_cell(index, tile.is_mine)
+            self.safe.discard(index)
+
+            if not tile.is_mine:
+                numbers += [(index, tile.number)]
+
+        for index, number in numbers:
+            self.add_constraint(index, number)
+
+        self.propagate()
+
+    def safe_cells(self):
+        """
+        DESCRIPTION:
+        Returns the hidden tiles that are certainly safe.
+
+        OUTPUT:
+        A set of (row, col) tuples.
+        """
+
+        return {divmod(index, self.game.n_cols) for index in self.safe}
+
+    def mine_cells(self):
+        """
+        DESCRIPTION:
+        Returns the tiles that are certainly mines, as far as they were not
+        revealed.
+
+        OUTPUT:
+        A set of (row, col) tuples.
+        """
+
+        return {divmod(index, self.game.n_cols) for index in self.mines}
+
+    def add_constraint(self, index, number):
+        """
+        DESCRIPTION:
+        Adds the constraint of a revealed number: its unknown neighbours and
+        the amount of mines among them, which is the number minus the known
+        mines around it.
+
+        PARAMETERS:
+        index (int):    The index of the revealed tile.
+        number (int):   The number of the revealed tile.
+
+        STRUCTURES:
+        For-loop:       Used to go through the neighbours of the tile.
+
+        OUTPUT:
+        None.
+        """
+
+        game = self.game
+        cells = set()
+
+        for delta in game.deltas[game.border[index]]:
+            neighbour = index + delta
+            state = self.known[neighbour]
+            if state == UNKNOWN:
+                cells.add(neighbour)
+            elif state == MINE:
+                number -= 1
+
+        if not cells:
+            return
+
+        self.constraints[index] = [cells, number]
+        for cell in cells:
+            self.containing.setdefault(cell, set()).add(index)
+        self.enqueue(index)
+
+    def remove_cell(self, index, is_mine):
+        """
+        DESCRIPTION:
+        Removes a tile that became known from the constraints that contain
+        it. A constraint without tiles is dropped, the others are checked
+        again.
+
+        PARAMETERS:
+        index (int):    The index of the tile.
+        is_mine (bool): True when the tile is a mine.
+
+        STRUCTURES:
+        For-loop:       Used to go through the constraints of the tile.
+
+        OUTPUT:
+        None.
+        """
+
+        for owner in self.containing.pop(index, ()):
+            constraint = self.constraints[owner]
+            constraint[0].discard(index)
+            if is_mine:
+                constraint[1] -= 1
+
+            if constraint[0]:
+                self.enqueue(owner)
+            else:
+                del self.constraints[owner]
+
+    def mark(self, index, state):
+        """
+        DESCRIPTION:
+        Marks an unknown tile as SAFE or MINE.
+
+        PARAMETERS:
+        index (int):    The index of the tile.
+        state (int):    SAFE or MINE.
+
+        OUTPUT:
+        None.
+        """
+
+        if self.known[index] != UNKNOWN:
+            return
+
+        self.known[index] = state
+        if state == SAFE:
+            self.safe.add(index)
+        else:
+            self.mines.add(index)
+        self.remove_cell(index, state == MINE)
+
+    def enqueue(self, index):
+        """
+        Adds a constraint to the queue, unless it is already in it.
+        """
+
+        if index not in self.queued:
+            self.queued.add(index)
+            self.queue.append(index)
+
+    def propagate(self):
+        """
+        DESCRIPTION:
+        Checks the constraints in the queue until it is empty. Every tile that
+        is derived changes the constraints around it, which are added to the
+        queue again.
+
+        PARAMETERS:
+        No additional parameters aside from the Solver attributes itself.
+
+        STRUCTURES:
+        While-loop:     Used to empty the queue.
+        If-statement:   Used to apply the rules of a single constraint.
+        For-loop:       Used to compare the constraint with the constraints
+                        that share tiles with it.
+
+        OUTPUT:
+        None.
+        """
+
+        constraints = self.constraints
+
+        while self.queue:
+            index = self.queue.popleft()
+            self.queued.discard(index)
+            if index not in constraints:
+                continue
+
+            cells, mines = constraints[index]
+
+            # single constraint: no mines left, or only mines left
+            if mines == 0 or mines == len(cells):
+                state = SAFE if mines == 0 else MINE
+                for cell in list(cells):
+                    self.mark(cell, state)
+                continue
+
+            # pairs of constraints that share tiles
+            others = set()
+            for cell in cells:
+                others |= self.containing[cell]
+            others.discard(index)
+
+            for other in others:
+                if other in constraints and self.compare(index, other):
+                    # the constraint changed, it is checked again later
+                    self.enqueue(index)
+                    break
+
+    def compare(self, first, second):
+        """
+        DESCRIPTION:
+        Compares two constraints that share tiles. The tiles that only the
+        second has hold at least its mines minus the mines of the first. When
+        that is as many as those tiles, they are all mines, and the tiles that
+        only the first has are all safe. The same is done the other way round.
+
+        PARAMETERS:
+        first (int):    The index of the first constraint.
+        second (int):   The index of the second constraint.
+
+        STRUCTURES:
+        For-loop:       Used to mark the derived tiles.
+
+        OUTPUT:
+        True when tiles were derived, otherwise False.
+        """
+
+        first_cells, first_mines = self.constraints[first]
+        second_cells, second_mines = self.constraints[second]
+
+        only_first = first_cells - second_cells
+        only_second = second_cells - first_cells
+
+        if second_mines - first_mines == len(only_second):
+            mines, safe = only_second, only_first
+        elif first_mines - second_mines == len(only_first):
+            mines, safe = only_first, only_second
+        else:
+            return False
+
+        if not mines and not safe:
+            return False
+
+        for cell in mines:
+            self.mark(cell, MINE)
+        for cell in safe:
+            self.mark(cell, SAFE)
+        return True
@@ -0,0 +1,462 @@
+"""
+README:
+This script saves and loads Mine Sweeper games in a compact binary file. It
+contains the functions save and load, and ONE class definition, BoardFile,
+which reads the tiles of a saved game directly from the memory-mapped file.
+
+The file starts with a header (see HEADER) with the size of the board, the
+amount of mines, the safe radius, the seed, the elapsed time and whether the
+mines were laid yet. After the header follow three planes with one bit per
+tile, row by row, eight tiles per byte: the mines, the revealed tiles and the
+flagged tiles. Then follow the numbers of the tiles as nibbles, two tiles per
+byte, unless the game was saved without them; they are then counted again
+from the mines when the game is loaded, which makes the file smaller but
+loading slower.
+
+ADDITIONAL PACKAGES:
+itertools:  A python library, its compress function picks the flagged tiles
+            of a game whose mines were not laid yet.
+mmap:       A python library used to read the planes without reading the
+            whole file.
+struct:     A python library used to write and read the header.
+engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine
+"""
+
+import mmap
+import struct
+from itertools import compress
+
+from src.engine import count_adjacent_mines
+from src.packed import (FLAGGED, NUMBER, REVEALED, PackedMineSweeper,
+                        _MINE_BITS)
+
+MAGIC = b'MSWP'
+VERSION = 1
+
+# magic, version, rows, cols, mines, safe_radius, seed, elapsed seconds, flags
+HEADER = struct.Struct('<4sBIIIIqdB')
+
+# bits of the flags of the header
+PRISTINE = 1
+HAS_SEED = 2
+HAS_NUMBERS = 4
+
+# translation tables that turn state and layout bytes into 0/1 bytes and
+# numbers
+_REVEALED_BITS = bytes(1 if i & REVEALED else 0 for i in range(256))
+_FLAGGED_BITS = bytes(1 if i & FLAGGED else 0 for i in range(256))
+_NUMBER_BITS = bytes(i & NUMBER for i in range(256))
+
+# translation tables that take one bit out of every byte of a plane
+_BIT_TABLES = [bytes((i >> bit) & 1 for i in range(256)) for bit in range(8)]
+
+# translation tables that move a number to the high nibble and back
+_TO_HIGH_NIBBLE = bytes((i & 0x0F) << 4 for i in range(256))
+_LOW_NIBBLE = bytes(i & 0x0F for i in range(256))
+_HIGH_NIBBLE = bytes(i >> 4 for i in range(256))
+
+
+###########################################
+################ Functions ################
+###########################################
+# saves a game
+def save(game, path, elapsed=0.0, numbers=True):
+    """
+    DESCRIPTION:
+    Saves a MineSweeper or PackedMineSweeper game to a binary file.
+
+    PARAMETERS:
+    game:               The game that is saved.
+    path (str):         The name of the file.
+    elapsed (float):    The seconds the player has played; default: 0.0.
+    numbers (bool):     Whether the numbers are stored; default: True.
+
+    STRUCTURES:
+    If-statement:   Used to store the seed only when it fits in the header.
+    For-loop:       Used to write the planes.
+
+    OUTPUT:
+    None. The file is written.
+    """
+
+    mines, revealed, flagged, counts = planes(game)
+
+    flags = PRISTINE if game.pristine else 0
+    if numbers:
+        flags |= HAS_NUMBERS
+
+    seed = -1
+    if game.seed is not None and -2 ** 63 <= game.seed < 2 ** 63:
+        flags |= HAS_SEED
+        seed = game.seed
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, game.n_rows, game.n_cols,
+                               game.n_mines, game.safe_radius, seed, elapsed,
+                               flags))
+        for plane in (mines, revealed, flagged):
+            file.write(pack_bits(plane))
+        if numbers:
+            file.write(pack_nibbles(counts))
+
+
+# loads a game
+def load(path, engine_class=PackedMineSweeper):
+    """
+    DESCRIPTION:
+    Loads a game that was saved with save. The planes are read from the
+    memory-mapped file. The numbers are counted again from the mines when
+    they were not saved.
+
+    PARAMETERS:
+    path (str):         The name of the file.
+    engine_class:       The class of the loaded game; default:
+                        PackedMineSweeper, which loads large boards fastest.
+
+    STRUCTURES:
+    If-statement:   Used to check if the mines were laid yet. Flags can be
+                    placed before that, so they are restored either way.
+    If-statement:   Used to choose how the state is restored.
+
+    OUTPUT:
+    A (game, elapsed) tuple: the game, and the seconds the player had played.
+    The event handlers of the game are empty.
+    """
+
+    with BoardFile(path) as board_file:
+        n_rows, n_cols = board_file.n_rows, board_file.n_cols
+        game = engine_class(n_rows, n_cols, board_file.n_mines,
+                            board_file.safe_radius, seed=board_file.seed)
+        elapsed = board_file.elapsed
+
+        if board_file.pristine:
+            flagged = board_file.plane(2)
+            for index in compress(range(len(flagged)), flagged):
+                game.toggle_flag(index)
+            return game, elapsed
+
+        mines = board_file.plane(0)
+        revealed = board_file.plane(1)
+        flagged = board_file.plane(2)
+        if board_file.has_numbers:
+            counts = board_file.numbers()
+        else:
+            counts = count_adjacent_mines(mines, n_rows, n_cols)
+
+        # the mines that were hit are counted on the packed planes, which are
+        # eight times smaller
+        mines_hit = (int.from_bytes(board_file.packed_plane(0), 'little')
+                     & int.from_bytes(board_file.packed_plane(1), 'little'))
+        has_flags = any(board_file.packed_plane(2))
+
+    game.place_layout(mines, counts)
+    game.pristine = False
+
+    if not isinstance(game, PackedMineSweeper):
+        for tile, is_revealed, is_flagged in zip(game.tiles, revealed,
+                                                 flagged):
+            tile.revealed = bool(is_revealed)
+            tile.flagged = bool(is_flagged)
+
+    elif has_flags:
+        # the FLAGGED bit is the second bit of the state byte
+        state = (int.from_bytes(revealed, 'little')
+                 | int.from_bytes(flagged, 'little') << 1)
+        game.state[:] = state.to_bytes(len(game.state), 'little')
+
+    else:
+        game.state[:] = revealed
+
+    game.n_hidden = n_rows * n_cols - revealed.count(1)
+    game.n_flagged = flagged.count(1)
+    game.n_mines_hit = bin(mines_hit).count('1')
+    game.update_status()
+
+    return game, elapsed
+
+
+# returns the mines, revealed and flagged tiles and the numbers of a game
+def planes(game):
+    """
+    DESCRIPTION:
+    Returns the planes of a game as bytes with one byte per tile that is 1 or
+    0, and the numbers of the tiles.
+
+    PARAMETERS:
+    game:           A MineSweeper or PackedMineSweeper game.
+
+    STRUCTURES:
+    If-statement:   Used to translate the bytearrays of a PackedMineSweeper
+                    at once instead of going through its tiles.
+
+    OUTPUT:
+    A (mines, revealed, flagged, numbers) tuple of bytes.
+    """
+
+    if isinstance(game, PackedMineSweeper):
+        return (game.layout.translate(_MINE_BITS),
+                game.state.translate(_REVEALED_BITS),
+                game.state.translate(_FLAGGED_BITS),
+                game.layout.translate(_NUMBER_BITS))
+
+    return (bytes(tile.is_mine for tile in game.tiles),
+            bytes(tile.revealed for tile in game.tiles),
+            bytes(tile.flagged for tile in game.tiles),
+            bytes(tile.number for tile in game.tiles))
+
+
+# packs one byte per tile into one bit per tile
+def pack_bits(plane):
+    """
+    DESCRIPTION:
+    Packs bytes that are 0 or 1 into bits, eight per byte, the first tile in
+    the lowest bit. Every eighth byte of the plane, starting at byte i, is
+    taken at once with a slice and shifted to bit i, so no Python loop over
+    the tiles is needed.
+
+    PARAMETERS:
+    plane (bytes):  One byte per tile that is 0 or 1.
+
+    STRUCTURES:
+    For-loop:       Used to go through the eight bits of a byte.
+
+    OUTPUT:
+    The packed bytes, (len(plane) + 7) // 8 long.
+    """
+
+    n_bytes = (len(plane) + 7) // 8
+    if len(plane) % 8:
+        plane = bytes(plane) + bytes(n_bytes * 8 - len(plane))
+
+    packed = 0
+    for bit in range(8):
+        packed |= int.from_bytes(plane[bit::8], 'little') << bit
+
+    return packed.to_bytes(n_bytes, 'little')
+
+
+# unpacks one bit per tile into one byte per tile
+def unpack_bits(packed, n_tiles):
+    """
+    DESCRIPTION:
+    The opposite of pack_bits: every bit i of the packed bytes is translated
+    to a 0/1 byte at once, and placed at every eighth byte starting at byte i.
+
+    PARAMETERS:
+    packed (bytes): The packed bytes.
+    n_tiles (int):  The amount of tiles.
+
+    STRUCTURES:
+    For-loop:       Used to go through the eight bits of a byte.
+
+    OUTPUT:
+    A bytearray with one byte per tile that is 0 or 1.
+    """
+
+    plane = bytearray(len(packed) * 8)
+    for bit in range(8):
+        plane[bit::8] = packed.translate(_BIT_TABLES[bit])
+
+    del plane[n_tiles:]
+    return plane
+
+
+# packs one number per tile into two numbers per byte
+def pack_nibbles(counts):
+    """
+    DESCRIPTION:
+    Packs numbers from 0 to 15 into nibbles: the number of an even tile in the
+    low nibble and the number of the next tile in the high nibble.
+
+    PARAMETERS:
+    counts (bytes): One number per tile.
+
+    OUTPUT:
+    The packed bytes, (len(counts) + 1) // 2 long.
+    """
+
+    n_bytes = (len(counts) + 1) // 2
+    if len(counts) % 2:
+        counts = bytes(counts) + b'\0'
+
+    packed = (int.from_bytes(counts[0::2], 'little')
+              | int.from_bytes(counts[1::2].translate(_TO_HIGH_NIBBLE),
+                               'little'))
+    return packed.to_bytes(n_bytes, 'little')
+
+
+# unpacks two numbers per byte into one number per tile
+def unpack_nibbles(packed, n_tiles):
+    """
+    The opposite of pack_nibbles: returns a bytearray with one number per
+    tile.
+    """
+
+    counts = bytearray(len(packed) * 2)
+    counts[0::2] = packed.translate(_LOW_NIBBLE)
+    counts[1::2] = packed.translate(_HIGH_NIBBLE)
+
+    del counts[n_tiles:]
+    return counts
+
+
+###########################################
+################ BoardFile ################
+###########################################
+class BoardFile:
+    """
+    DESCRIPTION:
+    The BoardFile gives access to a saved game without loading it. The file
+    is memory-mapped, so only the parts of the planes that are used are read
+    from the disk, which makes single tiles of a huge board available at
+    once.
+
+    PARAMETERS:
+    path (str):     The name of the file.
+
+    METHODS:
+    __init__(self, path): Opens the file and reads the header.
+    plane(self, number): Returns a whole plane as one byte per tile.
+    packed_plane(self, number): Returns a whole plane as it is stored.
+    numbers(self):  Returns the stored numbers as one byte per tile.
+    is_mine(self, row, col), is_revealed(self, row, col),
+    is_flagged(self, row, col): Read the bit of one tile of a plane.
+    number(self, row, col): Returns the number of one tile.
+    close(self):    Closes the file. The BoardFile can also be used in a
+                    with-statement.
+
+    LIMITATIONS:
+    1.  The file is read-only: a game that has to be played is loaded with
+        load.
+
+    OUTPUT:
+    The BoardFile object.
+    """
+
+    def __init__(self, path):
+        """
+        This method opens the file and reads the header into the attributes
+        n_rows, n_cols, n_mines, safe_radius, seed (None when the game had
+        no int seed), elapsed, pristine and has_numbers. A file that is not a
+        saved game raises a ValueError.
+        """
+
+        self.file = open(path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.n_rows, self.n_cols, self.n_mines,
+         self.safe_radius, seed, self.elapsed, flags) = \
+            HEADER.unpack_from(self.map)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError('%s is not a saved Mine Sweeper game' % path)
+
+        self.seed = seed if flags & HAS_SEED else None
+        self.pristine = bool(flags & PRISTINE)
+        self.has_numbers = bool(flags & HAS_NUMBERS)
+        self.n_tiles = self.n_rows * self.n_cols
+        self.plane_size = (self.n_tiles + 7) // 8
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def close(self):
+        """
+        Closes the memory map and the file.
+        """
+
+        self.map.close()
+        self.file.close()
+
+    def plane(self, number):
+        """
+        DESCRIPTION:
+        Returns a whole plane: 0 for the mines, 1 for the revealed tiles and
+        2 for the flagged tiles.
+
+        PARAMETERS:
+        number (int):   The number of the plane.
+
+        OUTPUT:
+        A bytearray with one byte per tile that is 0 or 1.
+        """
+
+        return unpack_bits(self.packed_plane(number), self.n_tiles)
+
+    def packed_plane(self, number):
+        """
+        Returns a whole plane as it is stored, one bit per tile.
+        """
+
+        start = HEADER.size + number * self.plane_size
+        return self.map[start:start + self.plane_size]
+
+    def numbers(self):
+        """
+        Returns the stored numbers as a bytearray with one byte per tile.
+        """
+
+        start = HEADER.size + 3 * self.plane_size
+        return unpack_nibbles(self.map[start:start + (self.n_tiles + 1) // 2],
+                              self.n_tiles)
+
+    def index(self, row, col):
+        """
+        Returns the index of a tile, or raises an IndexError when the tile is
+        not on the board.
+        """
+
+        if not (0 <= row < self.n_rows and 0 <= col < self.n_cols):
+            raise IndexError('tile (%d, %d) is not on the board' % (row, col))
+        return row * self.n_cols + col
+
+    def bit(self, number, row, col):
+        """
+        Returns the bit of a tile in a plane as a bool.
+        """
+
+        index = self.index(row, col)
+        byte = self.map[HEADER.size + number * self.plane_size + index // 8]
+        return bool(byte >> (index % 8) & 1)
+
+    def is_mine(self, row, col):
+        return self.bit(0, row, col)
+
+    def is_revealed(self, row, col):
+        return self.bit(1, row, col)
+
+    def is_flagged(self, row, col):
+        return self.bit(2, row, col)
+
+    def number(self, row, col):
+        """
+        DESCRIPTION:
+        Returns the number of a tile: the stored nibble, or else the mines
+        around the tile counted on the mine plane, the tile itself included.
+
+        PARAMETERS:
+        row (int):      The row coordinate of the tile.
+        col (int):      The column coordinate of the tile.
+
+        STRUCTURES:
+        If-statement:       Used to check if the numbers were stored.
+        Embedded for-loop:  Used to go through the tiles around the tile.
+
+        OUTPUT:
+        The amount of mines.
+        """
+
+        index = self.index(row, col)
+
+        if self.has_numbers:
+            byte = self.map[HEADER.size + 3 * self.plane_size + index // 2]
+            return byte >> 4 if index % 2 else byte & 0x0F
+
+        return sum(self.is_mine(i, j)
+                   for i in range(max(row - 1, 0), min(row + 2, self.n_rows))
+                   for j in range(max(col - 1, 0), min(col + 2, self.n_cols)))
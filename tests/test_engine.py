@@ -0,0 +1,318 @@
+"""
+README:
+This script tests the engines of the Mine Sweeper game. Every test is run on
+both the MineSweeper and the PackedMineSweeper engine.
+
+ADDITIONAL PACKAGES:
+unittest:   A module made to write and run tests
+engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine
+"""
+
+import random
+import unittest
+
+from src.engine import (EMPTY_BITS, MineSweeper, count_adjacent_mines,
+                        find_opening, label_openings)
+from src.history import History
+from src.packed import PackedMineSweeper
+
+ENGINES = (MineSweeper, PackedMineSweeper)
+
+
+# returns the set of tiles in the rows of tiles of an opening
+def tile_set(spans):
+    return {index for first, stop in zip(spans[::2], spans[1::2])
+            for index in range(first, stop)}
+
+
+###########################################
+############### TestOpenings ##############
+###########################################
+class TestOpenings(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that revealing a tile opens the same tiles as the search one tile
+    at a time, also when the precomputed openings are used.
+    """
+
+    # a flag that stopped an earlier search keeps part of the opening hidden
+    def test_removed_flags(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(1, 5, 0, 0)
+                game.flag(0, 1)
+                game.flag(0, 3)
+                game.reveal(0, 2)
+                game.flag(0, 1)
+                game.flag(0, 3)
+                game.reveal(0, 0)
+
+                revealed = [game.board[0][col].revealed for col in range(5)]
+                self.assertEqual(revealed, [True, True, True, False, False])
+                self.assertEqual(game.n_hidden, 2)
+
+    # the opening of one tile is the opening that label_openings finds
+    def test_find_opening(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            n_rows, n_cols = rng.randrange(1, 20), rng.randrange(1, 20)
+            density = rng.random() * 0.3
+            mines = bytes(rng.random() < density
+                          for _ in range(n_rows * n_cols))
+            counts = count_adjacent_mines(mines, n_rows, n_cols)
+            labels, openings, _ = label_openings(mines, counts, n_rows,
+                                                 n_cols)
+            empty = counts.translate(EMPTY_BITS)
+
+            for index, label in enumerate(labels):
+                if label >= 0:
+                    self.assertEqual(
+                        tile_set(find_opening(empty, n_rows, n_cols, index)),
+                        tile_set(openings[label]))
+
+    # random moves give the same board as a game without openings
+    def test_random_moves(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(3)
+                for _ in range(20):
+                    game = engine(12, 16, 20, 1, seed=rng.randrange(10 ** 6))
+                    game.reveal(6, 8)
+                    searched = game.clone()
+                    searched.planes = searched.empty = None
+
+                    for _ in range(60):
+                        action = rng.choice(('reveal', 'flag', 'flag'))
+                        row, col = rng.randrange(12), rng.randrange(16)
+                        getattr(game, action)(row, col)
+                        getattr(searched, action)(row, col)
+
+                    self.assertEqual(
+                        [tile.revealed for tile in game.tiles],
+                        [tile.revealed for tile in searched.tiles])
+                    self.assertEqual(game.n_hidden, searched.n_hidden)
+
+
+
+###########################################
+################ TestClones ###############
+###########################################
+class TestClones(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that a clone and the game it was cloned from do not change each
+    other, while they share their tiles.
+    """
+
+    # returns the revealed and flagged tiles of a game
+    @staticmethod
+    def tile_states(game):
+        return [(tile.revealed, tile.flagged) for tile in game.tiles]
+
+    # moves on either game do not change the other one
+    def test_moves(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(10, 10, 10, 1, seed=7)
+                game.reveal(5, 5)
+                before = self.tile_states(game)
+
+                clone = game.clone()
+                clone.flag(0, 0)
+                clone.reveal(9, 9)
+                self.assertEqual(self.tile_states(game), before)
+                self.assertEqual(clone.board[0][0].flagged, True)
+
+                clone_before = self.tile_states(clone)
+                game.flag(0, 9)
+                self.assertEqual(self.tile_states(clone), clone_before)
+                self.assertEqual(game.board[0][9].flagged,
+                                 not game.board[0][9].revealed)
+
+    # a clone only copies the tiles that a move changes
+    def test_shared_tiles(self):
+        game = MineSweeper(10, 10, 10, 1, seed=7)
+        game.reveal(5, 5)
+        clone = game.clone()
+        self.assertIs(clone.tiles, game.tiles)
+
+        changed = clone.flag(*next((tile.row, tile.col) for tile in clone.tiles
+                                   if not tile.revealed))
+        shared = sum(a is b for a, b in zip(clone.tiles, game.tiles))
+        self.assertEqual(shared, 99)
+        self.assertIs(clone.board[changed[0].row][changed[0].col], changed[0])
+
+    # a clone of a game without mines lays its own mines
+    def test_pristine(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(8, 8, 10, 1, seed=1)
+                clone = game.clone()
+                clone.reveal(4, 4)
+                self.assertTrue(game.pristine)
+                self.assertEqual(sum(tile.is_mine for tile in game.tiles), 0)
+                self.assertEqual(sum(tile.is_mine for tile in clone.tiles), 10)
+
+    # undoing a move of a clone does not change the game it was cloned from
+    def test_undo(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(10, 10, 10, 1, seed=3)
+                game.reveal(5, 5)
+                index = next(index for index, tile in enumerate(game.tiles)
+                             if not tile.revealed)
+                row, col = divmod(index, 10)
+
+                clone = game.clone()
+                history = History(clone)
+                clone.flag(row, col)
+                second = clone.clone()
+                history.undo()
+                self.assertEqual(clone.board[row][col].flagged, False)
+                self.assertEqual(second.board[row][col].flagged, True)
+                self.assertEqual(game.board[row][col].flagged, False)
+
+
+
+###########################################
+############### TestHistory ###############
+###########################################
+class TestHistory(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that undo puts back the tiles and the counters of a move, also of a
+    sequence of moves made by apply_moves.
+    """
+
+    # a flag that is removed before its tile is revealed comes back
+    def test_flag_then_reveal(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(1, 5, 0, 0)
+                game.flag(0, 3)
+                history = History(game)
+                game.apply_moves([('flag', 0, 3), ('reveal', 0, 0)])
+                self.assertTrue(game.board[0][3].revealed)
+
+                history.undo()
+                self.assertEqual(game.n_flagged, 1)
+                self.assertEqual(game.n_hidden, 5)
+                self.assertEqual(game.board[0][3].flagged, True)
+                self.assertEqual(game.board[0][3].revealed, False)
+
+                history.redo()
+                self.assertEqual(game.n_flagged, 0)
+                self.assertEqual(game.n_hidden, 0)
+
+    # undoing every batch of random moves gives the board back
+    def test_random_batches(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(11)
+                for _ in range(30):
+                    game = engine(8, 8, 8, 1, seed=rng.randrange(10 ** 6))
+                    game.reveal(4, 4)
+                    for _ in range(10):
+                        game.flag(rng.randrange(8), rng.randrange(8))
+                    before = ([(tile.revealed, tile.flagged)
+                               for tile in game.tiles], game.n_flagged,
+                              game.n_hidden, game.status)
+
+                    history = History(game)
+                    while game.status not in ('won', 'lost'):
+                        game.apply_moves([(rng.choice(('flag', 'reveal')),
+                                           rng.randrange(8), rng.randrange(8))
+                                          for _ in range(4)])
+                    while history.can_undo:
+                        history.undo()
+
+                    self.assertEqual(([(tile.revealed, tile.flagged)
+                                       for tile in game.tiles], game.n_flagged,
+                                      game.n_hidden, game.status), before)
+
+
+
+###########################################
+############### TestGameOver ##############
+###########################################
+class TestGameOver(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that the on_win and on_loss event handlers are triggered exactly
+    once, and that moves after the end of a game change nothing.
+    """
+
+    # returns a game after its first move, with counters of its events
+    @staticmethod
+    def start(engine):
+        game = engine(8, 8, 10, 1, seed=5)
+        events = {'win': 0, 'loss': 0}
+        game.on_win += [lambda: events.update(win=events['win'] + 1)]
+        game.on_loss += [lambda: events.update(loss=events['loss'] + 1)]
+        game.reveal(4, 4)
+        return game, events
+
+    # checks that no kind of move changes a game that has ended
+    def check_ended(self, game):
+        states = [(tile.revealed, tile.flagged) for tile in game.tiles]
+        mine = next(index for index, tile in enumerate(game.tiles)
+                    if tile.is_mine and not tile.revealed)
+        row, col = divmod(mine, 8)
+
+        self.assertEqual(game.reveal(row, col), [])
+        self.assertEqual(game.flag(row, col), [])
+        self.assertEqual(game.chord(4, 4), [])
+        self.assertEqual(game.apply_moves([('reveal', row, col),
+                                           ('flag', 0, 0)]), [])
+        self.assertEqual([(tile.revealed, tile.flagged)
+                          for tile in game.tiles], states)
+
+    # revealing the last safe tile wins once
+    def test_win(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game, events = self.start(engine)
+                for index, tile in enumerate(game.tiles):
+                    if not tile.is_mine and not tile.revealed:
+                        game.reveal(*divmod(index, 8))
+
+                self.assertEqual(events, {'win': 1, 'loss': 0})
+                self.check_ended(game)
+                self.assertEqual(events, {'win': 1, 'loss': 0})
+
+    # revealing a mine loses once, also when a later mine is revealed
+    def test_loss(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game, events = self.start(engine)
+                mines = [index for index, tile in enumerate(game.tiles)
+                         if tile.is_mine]
+                game.reveal(*divmod(mines[0], 8))
+
+                self.assertEqual(events, {'win': 0, 'loss': 1})
+                self.check_ended(game)
+                self.assertEqual(events, {'win': 0, 'loss': 1})
+
+    # a sequence of moves stops at the move that ends the game
+    def test_apply_moves(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game, events = self.start(engine)
+                safe = [('reveal',) + divmod(index, 8)
+                        for index, tile in enumerate(game.tiles)
+                        if not tile.is_mine and not tile.revealed]
+                mine = next(('reveal',) + divmod(index, 8)
+                            for index, tile in enumerate(game.tiles)
+                            if tile.is_mine)
+
+                changes = game.apply_moves(safe + [mine])
+                self.assertTrue(changes)
+                self.assertEqual(events, {'win': 1, 'loss': 0})
+                self.assertFalse(game.board[mine[1]][mine[2]].revealed)
+                self.check_ended(game)
+                self.assertEqual(events, {'win': 1, 'loss': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
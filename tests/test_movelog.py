@@ -0,0 +1,112 @@
+"""
+README:
+This script tests recording games with the MoveLog and playing them back
+with the Replayer.
+
+ADDITIONAL PACKAGES:
+os:         A python library used to build the path of the log file
+random:     A python library used to choose the moves
+tempfile:   A python library used to write the log in a temporary folder
+unittest:   A module made to write and run tests
+engine:     A module made to run the minesweeper game
+movelog:    A module made to record and replay the moves of a game
+packed:     A module with the memory efficient engine
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from src.engine import MineSweeper
+from src.movelog import MoveLog, Replayer
+from src.packed import PackedMineSweeper
+
+ENGINES = (MineSweeper, PackedMineSweeper)
+
+
+# returns the revealed and flagged tiles and the counters of a game
+def snapshot(game):
+    return ([(tile.revealed, tile.flagged) for tile in game.tiles],
+            game.n_hidden, game.n_flagged, game.n_mines_hit)
+
+
+###########################################
+############### TestMoveLog ###############
+###########################################
+class TestMoveLog(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that a replayed log gives the same game after every move, for
+    games whose mines are laid again from the seed and for games whose mines
+    are written to the log.
+    """
+
+    # plays random moves, with a flag and a chord before the first reveal,
+    # and returns the log and the game after every move
+    def play(self, game, rng, path=None):
+        log = MoveLog(game, path)
+        snapshots = [snapshot(game)]
+        moves = [('flag', 0, 0), ('chord', 7, 7), ('chord', 0, 0)]
+        while game.status not in ('won', 'lost') and len(snapshots) < 80:
+            if len(moves) < len(snapshots):
+                moves += [(rng.choice(('reveal', 'flag', 'chord')),
+                           rng.randrange(8), rng.randrange(10))]
+            action, row, col = moves[len(snapshots) - 1]
+            getattr(game, action)(row, col)
+            snapshots += [snapshot(game)]
+        log.close()
+        return log, snapshots
+
+    # every move of the log gives the recorded game
+    def check(self, replayer, snapshots):
+        self.assertEqual(len(replayer) + 1, len(snapshots))
+        positions = list(range(len(snapshots)))
+        random.Random(0).shuffle(positions)
+        for k in list(range(len(snapshots))) + positions:
+            self.assertEqual(snapshot(replayer.seek(k)), snapshots[k], k)
+
+    # the mines are laid again from the seed
+    def test_seed(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(4)
+                for _ in range(10):
+                    game = engine(8, 10, 12, 1, seed=rng.randrange(10 ** 6))
+                    log, snapshots = self.play(game, rng)
+                    self.check(Replayer(bytes(log.data), 16), snapshots)
+
+    # the mines are written to the log when there is no int seed
+    def test_layout(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(5)
+                for _ in range(10):
+                    game = engine(8, 10, 12, 1,
+                                  seed=random.Random(rng.randrange(10 ** 6)))
+                    log, snapshots = self.play(game, rng)
+                    self.check(Replayer(bytes(log.data), 16), snapshots)
+
+    # a log that is written to a file gives the same moves
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'game.mswl')
+            game = PackedMineSweeper(8, 10, 12, 1, seed=9)
+            log, snapshots = self.play(game, random.Random(9), path)
+
+            replayer = Replayer(path)
+            self.assertEqual([replayer[k] for k in range(3)],
+                             [('flag', 0, 0), ('chord', 7, 7),
+                              ('chord', 0, 0)])
+            self.check(replayer, snapshots)
+
+    # a game that is being played can not be recorded
+    def test_not_pristine(self):
+        game = PackedMineSweeper(8, 10, 12, 1, seed=9)
+        game.reveal(4, 4)
+        with self.assertRaises(ValueError):
+            MoveLog(game)
+
+
+if __name__ == '__main__':
+    unittest.main()
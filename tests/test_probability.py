@@ -0,0 +1,117 @@
+"""
+README:
+This script tests the chances of the ProbabilityEngine against a count of all
+mine layouts of small boards, on both the MineSweeper and the
+PackedMineSweeper engine.
+
+ADDITIONAL PACKAGES:
+itertools:      A python library, its combinations lists the mine layouts
+unittest:       A module made to write and run tests
+engine:         A module made to run the minesweeper game
+packed:         A module with the memory efficient engine
+probability:    A module made to compute the chance of a mine per tile
+solver:         A module made to derive the safe tiles and the mines
+"""
+
+import itertools
+import unittest
+
+from src.engine import MineSweeper
+from src.packed import PackedMineSweeper
+from src.probability import ProbabilityEngine
+from src.solver import MINE, SAFE, Solver, UNKNOWN
+
+ENGINES = (MineSweeper, PackedMineSweeper)
+
+
+# counts the layouts of a game that fit the revealed numbers and the mines
+def count_layouts(game, solver):
+    """
+    DESCRIPTION:
+    Goes through every way to place the remaining mines on the unknown tiles
+    and keeps the layouts that give every revealed tile its number.
+
+    OUTPUT:
+    The amount of layouts, and a dictionary from the index of every unknown
+    tile to the amount of those layouts in which it is a mine.
+    """
+
+    n_cols = game.n_cols
+    known = solver.known
+    unknown = [index for index, state in enumerate(known) if state == UNKNOWN]
+    mines = {index for index, state in enumerate(known) if state == MINE}
+    numbers = [([row * n_cols + col
+                 for row in range(index // n_cols - 1, index // n_cols + 2)
+                 for col in range(index % n_cols - 1, index % n_cols + 2)
+                 if 0 <= row < game.n_rows and 0 <= col < n_cols],
+                tile.number)
+               for index, tile in enumerate(game.tiles)
+               if tile.revealed and not tile.is_mine]
+
+    total = 0
+    hits = dict.fromkeys(unknown, 0)
+    for layout in itertools.combinations(unknown, game.n_mines - len(mines)):
+        layout_mines = mines.union(layout)
+        if all(sum(index in layout_mines for index in neighbours) == number
+               for neighbours, number in numbers):
+            total += 1
+            for index in layout:
+                hits[index] += 1
+
+    return total, hits
+
+
+###########################################
+########## TestProbabilityEngine ##########
+###########################################
+class TestProbabilityEngine(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that the chances and the certain tiles of the ProbabilityEngine are
+    the ones that follow from counting all layouts of the board.
+    """
+
+    # plays small games and checks every computed chance
+    def test_count_layouts(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                for seed in range(20):
+                    game = engine(4, 5, 5, 0, seed=seed)
+                    solver = Solver(game)
+                    probabilities = ProbabilityEngine(solver)
+                    game.reveal(2, 2)
+                    self.play(game, solver, probabilities)
+
+    # checks the chances and reveals the safest tile until the game ends
+    def play(self, game, solver, probabilities):
+        while not (game.won or game.lost):
+            probabilities.compute()
+            self.assertFalse(probabilities.approximate)
+            total, hits = count_layouts(game, solver)
+
+            for index, count in hits.items():
+                row, col = divmod(index, game.n_cols)
+                self.assertAlmostEqual(probabilities.probability(row, col),
+                                       count / total)
+                if index in solver.containing:
+                    certain = {0: SAFE, total: MINE}.get(count)
+                    self.assertEqual(probabilities.certain.get(index),
+                                     certain)
+
+            interior = [hits[index] for index in hits
+                        if index not in solver.containing]
+            if interior and all(count == 0 for count in interior):
+                self.assertEqual(probabilities.interior_certain, SAFE)
+            elif interior and all(count == total for count in interior):
+                self.assertEqual(probabilities.interior_certain, MINE)
+            else:
+                self.assertEqual(probabilities.interior_certain, UNKNOWN)
+
+            # the known safe tiles first, so an unknown tile is always left
+            index = min(solver.safe or hits, key=lambda index:
+                        hits.get(index, 0))
+            game.reveal(*divmod(index, game.n_cols))
+
+
+if __name__ == '__main__':
+    unittest.main()
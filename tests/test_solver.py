@@ -0,0 +1,129 @@
+"""
+README:
+This script tests that the tiles that the Solver derives are certain, by
+going through all mine layouts around the revealed numbers of small boards,
+on both the MineSweeper and the PackedMineSweeper engine.
+
+ADDITIONAL PACKAGES:
+itertools:  A python library, its product lists the mine layouts
+random:     A python library used to pick the tiles that are guessed
+unittest:   A module made to write and run tests
+engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine
+solver:     A module made to derive the safe tiles and the mines
+"""
+
+import itertools
+import random
+import unittest
+
+from src.engine import MineSweeper
+from src.packed import PackedMineSweeper
+from src.solver import MINE, SAFE, Solver, UNKNOWN
+
+ENGINES = (MineSweeper, PackedMineSweeper)
+
+
+# finds the hidden tiles that the revealed numbers decide
+def certain_tiles(game):
+    """
+    DESCRIPTION:
+    Goes through every way to place mines on the hidden tiles next to a
+    revealed number and keeps the layouts that give every revealed tile its
+    number. The amount of mines of the game is not used, like the Solver.
+
+    OUTPUT:
+    A dictionary from the index of every hidden tile next to a number that is
+    the same in all those layouts to SAFE or MINE.
+    """
+
+    tiles = game.tiles
+    numbers = [([index + delta for delta in game.deltas[game.border[index]]],
+                tile.number)
+               for index, tile in enumerate(tiles)
+               if tile.revealed and not tile.is_mine]
+    frontier = sorted({neighbour for neighbours, _ in numbers
+                       for neighbour in neighbours
+                       if not tiles[neighbour].revealed})
+    mines = {index for index, tile in enumerate(tiles)
+             if tile.revealed and tile.is_mine}
+
+    seen = [set() for _ in frontier]
+    for layout in itertools.product((False, True), repeat=len(frontier)):
+        layout_mines = mines.union(index for index, is_mine
+                                   in zip(frontier, layout) if is_mine)
+        if all(sum(index in layout_mines for index in neighbours) == number
+               for neighbours, number in numbers):
+            for states, is_mine in zip(seen, layout):
+                states.add(is_mine)
+
+    return {index: MINE if True in states else SAFE
+            for index, states in zip(frontier, seen) if len(states) == 1}
+
+
+###########################################
+############### TestSolver ################
+###########################################
+class TestSolver(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that every tile that the Solver marks is certain, and that it
+    leaves no constraint that decides its tiles on its own.
+    """
+
+    # the marked tiles of small games are decided by all layouts
+    def test_certain_tiles(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(2)
+                for seed in range(20):
+                    game = engine(4, 5, 5, 0, seed=seed)
+                    solver = Solver(game)
+                    game.reveal(2, 2)
+
+                    while not (game.won or game.lost):
+                        certain = certain_tiles(game)
+                        for index, state in enumerate(solver.known):
+                            if (state != UNKNOWN
+                                    and not game.tiles[index].revealed):
+                                self.assertEqual(certain.get(index), state)
+                        self.check_constraints(solver)
+                        self.move(game, solver, rng)
+
+    # the marked tiles of larger games match their layout
+    def test_layout(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                rng = random.Random(5)
+                for seed in range(10):
+                    game = engine(16, 16, 40, 1, seed=seed)
+                    solver = Solver(game)
+                    game.reveal(8, 8)
+
+                    while not (game.won or game.lost):
+                        for index, state in enumerate(solver.known):
+                            if state != UNKNOWN:
+                                self.assertEqual(game.tiles[index].is_mine,
+                                                 state == MINE)
+                        self.check_constraints(solver)
+                        self.move(game, solver, rng)
+
+    # every constraint that is left still has a choice
+    def check_constraints(self, solver):
+        for cells, mines in solver.constraints.values():
+            self.assertTrue(0 < mines < len(cells))
+
+    # reveals a safe tile, or guesses one when there is none
+    @staticmethod
+    def move(game, solver, rng):
+        if solver.safe:
+            index = min(solver.safe)
+        else:
+            index = rng.choice([index for index, state
+                                in enumerate(solver.known)
+                                if state == UNKNOWN])
+        game.reveal(*divmod(index, game.n_cols))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+README:
+This script tests saving and loading games with the storage module, on both
+the MineSweeper and the PackedMineSweeper engine.
+
+ADDITIONAL PACKAGES:
+os:         A python library used to build the path of the saved file
+random:     A python library used to lay the mines of a large board
+tempfile:   A python library used to save the games in a temporary folder
+time:       A python library used to time loading a large board
+unittest:   A module made to write and run tests
+engine:     A module made to run the minesweeper game
+packed:     A module with the memory efficient engine
+storage:    A module made to save games
+"""
+
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from src.engine import MineSweeper, count_adjacent_mines
+from src.packed import PackedMineSweeper
+from src.storage import load, save
+
+ENGINES = (MineSweeper, PackedMineSweeper)
+
+
+###########################################
+############### TestStorage ###############
+###########################################
+class TestStorage(unittest.TestCase):
+    """
+    DESCRIPTION:
+    Tests that a loaded game has the same tiles and counters as the game that
+    was saved.
+    """
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'game.msw')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    # saves a game and loads it with the same engine
+    def save_and_load(self, game):
+        save(game, self.path, elapsed=12.5)
+        loaded, elapsed = load(self.path, type(game))
+        self.assertEqual(elapsed, 12.5)
+        return loaded
+
+    # the flags placed before the first reveal are kept
+    def test_pristine_flags(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(9, 9, 10, 1, seed=5)
+                game.flag(0, 0)
+                game.flag(4, 7)
+                loaded = self.save_and_load(game)
+
+                self.assertTrue(loaded.pristine)
+                self.assertEqual(loaded.n_flagged, 2)
+                self.assertEqual(loaded.n_hidden, 81)
+                self.assertEqual([tile.flagged for tile in loaded.tiles],
+                                 [tile.flagged for tile in game.tiles])
+
+    # a game that is being played is loaded with its mines and state
+    def test_playing(self):
+        for engine in ENGINES:
+            with self.subTest(engine=engine.__name__):
+                game = engine(9, 9, 10, 1, seed=5)
+                game.reveal(4, 4)
+                game.flag(*next((tile.row, tile.col) for tile in game.tiles
+                                if not tile.revealed))
+                loaded = self.save_and_load(game)
+
+                for attribute in ('is_mine', 'number', 'revealed', 'flagged'):
+                    self.assertEqual(
+                        [getattr(tile, attribute) for tile in loaded.tiles],
+                        [getattr(tile, attribute) for tile in game.tiles])
+                self.assertEqual((loaded.n_hidden, loaded.n_flagged,
+                                  loaded.status),
+                                 (game.n_hidden, game.n_flagged, game.status))
+
+
+    # a large board loads without finding its openings
+    def test_load_time(self):
+        size = 2000
+        rng = random.Random(1)
+        mines = bytes(rng.random() < 0.2 for _ in range(size * size))
+        game = PackedMineSweeper(size, size, mines.count(1), 1)
+        game.place_layout(mines, count_adjacent_mines(mines, size, size))
+        game.pristine = False
+        game.reveal(size // 2, size // 2)
+        save(game, self.path)
+
+        start = time.perf_counter()
+        loaded, _ = load(self.path)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(loaded.n_hidden, game.n_hidden)
+        self.assertEqual(loaded.bbbv, game.bbbv)
+
+
+if __name__ == '__main__':
+    unittest.main()